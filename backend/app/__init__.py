@@ -1,4 +1,5 @@
 import os
+import multiprocessing
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
@@ -6,6 +7,7 @@ from flask_socketio import SocketIO
 from flask_jwt_extended import JWTManager
 from flask_apscheduler import APScheduler
 from werkzeug.security import generate_password_hash
+from .database import database_url, engine_options, init_database
 
 # Initialize extensions
 db = SQLAlchemy()
@@ -13,14 +15,14 @@ socketio = SocketIO(cors_allowed_origins="*")
 jwt = JWTManager()
 scheduler = APScheduler()
 
-def create_app():
+def create_app(worker=False):
     app = Flask(__name__)
+    # Spawned pipeline workers re-import the launching script (run.py), which calls create_app() again
+    worker = worker or multiprocessing.parent_process() is not None
 
-    # Configuration
-    base_dir = os.path.abspath(os.path.dirname(__file__))
-    db_path = os.path.join(base_dir, '..', 'pipelines.db')
-    
-    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
+    # Configuration (database URL, pool and SQLite pragmas: see database.py)
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_url()
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config['SQLALCHEMY_DATABASE_URI'])
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     app.config['SECRET_KEY'] = 'dev-secret-key' 
     app.config['JWT_SECRET_KEY'] = 'jwt-secret-key'
@@ -28,7 +30,13 @@ def create_app():
 
     # Initialize Plugins
     db.init_app(app)
-    CORS(app)
+
+    # Pipeline worker processes only need the database; sockets, schedules and routes stay in the server
+    if worker:
+        return app
+
+    # The catalog search sends the cursor of its next page in a header
+    CORS(app, expose_headers=['X-Next-Cursor'])
     socketio.init_app(app)
     jwt.init_app(app)
     
@@ -42,8 +50,17 @@ def create_app():
 
     # Database & Startup Logic
     with app.app_context():
-        db.create_all()
+        init_database()
         create_default_admin()
+
+        from .catalog import ensure_catalog_index
+        ensure_catalog_index()
+
+        from .lineage import backfill_lineage
+        backfill_lineage()
+
+        from .workers import fail_interrupted_runs
+        fail_interrupted_runs()
         
         # Restore Schedules on Startup
         load_scheduled_jobs(app) 
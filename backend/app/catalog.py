@@ -0,0 +1,115 @@
+import json
+from sqlalchemy import text
+
+from . import db
+from .models import DataSource, ProcessedFile
+from .pagination import merged_keyset_page, merged_cursor
+
+# Results per catalog search page, unless the client asks for fewer (or more, up to the maximum)
+CATALOG_PAGE_SIZE = 50
+MAX_CATALOG_PAGE_SIZE = 200
+# Filename matches weigh more than column name matches when ranking
+FILENAME_WEIGHT = 2.0
+
+# Catalog entries of both tables share one index; an entry's key is id * 2 + kind
+CATALOG_KINDS = ((DataSource, 0), (ProcessedFile, 1))
+# When each kind of entry was added, for the newest-first listing
+CATALOG_DATES = {DataSource: DataSource.upload_date, ProcessedFile: ProcessedFile.created_at}
+
+def column_names(columns):
+    """SQL for the column names in a columns JSON value (its keys only, so dtypes like "int64" don't match)."""
+    return f"CASE WHEN json_valid({columns}) THEN (SELECT group_concat(key, ' ') FROM json_each({columns})) END"
+
+def catalog_ddl():
+    """FTS5 table over filenames and column names, kept in sync with data_source and processed_file by triggers."""
+    statements = ["CREATE VIRTUAL TABLE IF NOT EXISTS catalog_fts USING fts5(name, columns, user_id UNINDEXED, prefix='2 3')"]
+    for model, kind in CATALOG_KINDS:
+        table = model.__tablename__
+        insert = f"INSERT INTO catalog_fts(rowid, name, columns, user_id) VALUES (new.id * 2 + {kind}, new.filename, {column_names('new.columns')}, new.user_id);"
+        delete = f"DELETE FROM catalog_fts WHERE rowid = old.id * 2 + {kind};"
+        statements += [
+            f"CREATE TRIGGER IF NOT EXISTS {table}_catalog_insert AFTER INSERT ON {table} BEGIN {insert} END",
+            f"CREATE TRIGGER IF NOT EXISTS {table}_catalog_update AFTER UPDATE OF filename, columns, user_id ON {table} BEGIN {delete} {insert} END",
+            f"CREATE TRIGGER IF NOT EXISTS {table}_catalog_delete AFTER DELETE ON {table} BEGIN {delete} END",
+        ]
+    return statements
+
+def ensure_catalog_index():
+    """Creates the search index (filled from the existing rows) on SQLite builds with FTS5; elsewhere search falls back to LIKE."""
+    global _fts_ready
+    if db.engine.dialect.name != 'sqlite': return
+    try:
+        with db.engine.begin() as conn:
+            exists = conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'catalog_fts'")).first()
+            for statement in catalog_ddl():
+                conn.execute(text(statement))
+            if not exists:
+                for model, kind in CATALOG_KINDS:
+                    conn.execute(text(f"INSERT INTO catalog_fts(rowid, name, columns, user_id) SELECT id * 2 + {kind}, filename, {column_names('columns')}, user_id FROM {model.__tablename__}"))
+        _fts_ready = True
+    except Exception as e:
+        print(f"Catalog search index unavailable, using LIKE search: {e}")
+        _fts_ready = False
+
+_fts_ready = None
+
+def fts_ready():
+    global _fts_ready
+    if _fts_ready is None:
+        _fts_ready = db.engine.dialect.name == 'sqlite' and db.session.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'catalog_fts'")).first() is not None
+    return _fts_ready
+
+def match_expression(query):
+    """Every word of the query as a prefix: 'sales ord' finds entries with a token starting with 'sales' and one with 'ord'."""
+    terms = [term.replace('"', '""') for term in query.split()]
+    return ' '.join(f'"{term}"*' for term in terms)
+
+def search_catalog(user_id, query, limit=CATALOG_PAGE_SIZE, cursor=None):
+    """
+    One page of a user's catalog entries matching query, best first (newest first when there's
+    no query). Returns (DataSource/ProcessedFile records, cursor of the next page or None).
+    Raises ValueError for a malformed cursor.
+    """
+    query = query.strip()
+    if query and fts_ready() and match_expression(query).strip('"*'):
+        rank, key = (float(part) for part in cursor.split(':')) if cursor else (None, None)
+        sql = "SELECT rowid, bm25(catalog_fts, :weight, 1.0) AS score FROM catalog_fts WHERE catalog_fts MATCH :match AND user_id = :user"
+        if cursor: sql += " AND (score > :rank OR (score = :rank AND rowid > :key))"
+        rows = db.session.execute(text(sql + " ORDER BY score, rowid LIMIT :limit"), {
+            'weight': FILENAME_WEIGHT, 'match': match_expression(query), 'user': user_id, 'rank': rank, 'key': key, 'limit': limit + 1
+        }).fetchall()
+        more, rows = len(rows) > limit, rows[:limit]
+        next_cursor = f"{rows[-1].score!r}:{rows[-1].rowid}" if more else None
+        return catalog_records([row.rowid for row in rows]), next_cursor
+
+    # No index (or no query): newest entries first, each table read by primary key and the two merged
+    sources = []
+    for model, kind in CATALOG_KINDS:
+        q = model.query.filter(model.user_id == user_id)
+        if query:
+            pattern = f"%{query}%"
+            q = q.filter(db.or_(model.filename.ilike(pattern), model.columns.ilike(pattern)))
+        sources.append((q, model, CATALOG_DATES[model], kind))
+    return merged_keyset_page(sources, limit, merged_cursor(cursor) if cursor else None)
+
+def catalog_records(keys):
+    """Records for index keys, in the order given."""
+    found = {}
+    for model, kind in CATALOG_KINDS:
+        ids = [key // 2 for key in keys if key % 2 == kind]
+        if ids: found.update({record.id * 2 + kind: record for record in model.query.filter(model.id.in_(ids))})
+    return [found[key] for key in keys if key in found]
+
+def catalog_entry(record, query):
+    """Search result JSON for a record, with what the query matched in it."""
+    terms = query.lower().split()
+    cols = {}
+    try:
+        cols = json.loads(record.columns) if record.columns else {}
+    except ValueError: pass
+    matches = ["Filename"] if not terms or any(t in record.filename.lower() for t in terms) else []
+    matches += [f"Column: {c}" for c in cols if any(t in c.lower() for t in terms)]
+    return {
+        "id": record.id, "name": record.filename, "type": 'Source' if isinstance(record, DataSource) else 'Processed',
+        "rows": record.row_count, "columns": cols, "profile": json.loads(record.profile) if record.profile else None, "matches": matches[:3]
+    }
@@ -52,7 +52,7 @@ def generate_pipeline_plan(user_prompt):
            - 'trans_limit' (Data: {limit: 100})
            - 'trans_calc' (Data: {colA, colB, op: '+', newCol})
         3. Visuals: 'vis_chart' (Data: {chartType: 'bar', x_col, y_col, outputName})
-        4. Destinations: 'dest_csv', 'dest_json', 'dest_db' (Data: {outputName: 'name'})
+        4. Destinations: 'dest_csv', 'dest_json', 'dest_jsonl', 'dest_db' (Data: {outputName: 'name', compression: 'gzip'/'zstd'/'bz2' (optional, not for dest_db)})
 
         ### RULES:
         1. Return ONLY raw JSON. No markdown, no explanations.
@@ -0,0 +1,150 @@
+import os
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+
+# Shrink the dtypes of loaded sources (set to 0 to keep pandas' defaults)
+COMPACT_DTYPES = os.getenv('PIPELINE_COMPACT_DTYPES', '1') != '0'
+# Text columns with at most this share of distinct values are stored as categories
+CATEGORY_MAX_RATIO = 0.5
+# Values checked before a whole text column is tested as dates
+DATE_SAMPLE = 100
+# Date text that is parsed once at load: numpy unit -> the only layout accepted for it. Both are
+# fixed-width, so datetimes sort like the text did and format back to exactly the same text
+DATE_LAYOUTS = {
+    'D': r'\d{4}-\d{2}-\d{2}',
+    's': r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}',
+}
+
+# How a column was compacted: its compact dtype, the dtype it was loaded with and, for parsed
+# dates, the numpy unit its text is written back with
+Compacted = namedtuple('Compacted', 'dtype original unit')
+
+def is_categorical(series):
+    return isinstance(series.dtype, pd.CategoricalDtype)
+
+def plain(series):
+    """Categories back to plain values, for operations that need real values (ordering, numeric parsing)."""
+    return series.astype(object) if is_categorical(series) else series
+
+def parse_dates(series):
+    """(datetimes, unit) for a text column that holds nothing but one DATE_LAYOUTS layout, else None."""
+    values = series.dropna()
+    if values.empty: return None
+    sample = values.head(DATE_SAMPLE)
+    if not all(isinstance(v, str) for v in sample): return None
+    for unit, layout in DATE_LAYOUTS.items():
+        if not sample.str.fullmatch(layout).all(): continue
+        try:
+            if not values.str.fullmatch(layout).all(): return None
+        except AttributeError: # non-text values past the sample
+            return None
+        parsed = pd.to_datetime(series, format='%Y-%m-%d' if unit == 'D' else '%Y-%m-%d %H:%M:%S', errors='coerce')
+        # Impossible dates (2021-02-30) or years out of range: keep the text rather than lose values
+        return (parsed, unit) if parsed.notna().sum() == len(values) else None
+    return None
+
+def compact_frame(df):
+    """
+    Smallest lossless dtypes for a freshly loaded frame: integers downcast, floats to float32
+    when every value survives the round trip, date text parsed to datetimes and repetitive
+    text as categories. Returns the frame, a summary of what changed and {column: Compacted},
+    which restore() needs to give the columns back exactly as they were loaded.
+    """
+    changes = {'integers': 0, 'floats': 0, 'dates': 0, 'categories': 0}
+    compacted = {}
+    if df.columns.has_duplicates:
+        return df, changes, compacted
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_bool_dtype(series):
+            continue
+        if pd.api.types.is_integer_dtype(series):
+            small = pd.to_numeric(series, downcast='integer')
+            if small.dtype.itemsize < series.dtype.itemsize:
+                columns[col] = small
+                changes['integers'] += 1
+        elif pd.api.types.is_float_dtype(series) and series.dtype.itemsize > 4:
+            small = series.astype('float32')
+            if ((small.astype(series.dtype) == series) | series.isna()).all():
+                columns[col] = small
+                changes['floats'] += 1
+        elif series.dtype == object:
+            # None would come back as NaN
+            if any(v is None for v in series[series.isna()]): continue
+            dates = parse_dates(series)
+            if dates is not None:
+                columns[col], unit = dates
+                compacted[col] = Compacted(columns[col].dtype, series.dtype, unit)
+                changes['dates'] += 1
+                continue
+            try:
+                count = series.count()
+                if count and series.nunique() <= count * CATEGORY_MAX_RATIO:
+                    columns[col] = series.astype('category')
+                    changes['categories'] += 1
+            except TypeError: # unhashable values such as lists from JSON
+                pass
+        if col in columns and col not in compacted:
+            compacted[col] = Compacted(columns[col].dtype, series.dtype, None)
+    if columns:
+        df = df.copy(deep=False)
+        for col, series in columns.items():
+            df[col] = series
+    return df, changes, compacted
+
+def restore_series(series, spec):
+    if spec.unit is None:
+        return series.astype(spec.original)
+    values = series.to_numpy()
+    text = np.datetime_as_string(values, unit=spec.unit)
+    if spec.unit == 's': text = np.char.replace(text, 'T', ' ')
+    text = text.astype(object)
+    text[np.isnat(values)] = np.nan
+    return pd.Series(text, index=series.index, name=series.name)
+
+def restore(df, compacted, columns=None):
+    """
+    The frame with its compacted columns (all of them, or those named in columns) back to the
+    values and dtypes they were loaded with. Columns an operator has replaced since, and so no
+    longer have their compact dtype, are left as they are.
+    """
+    if not compacted: return df
+    wanted = set(compacted if columns is None else columns) & set(compacted)
+    restored = []
+    for i, col in enumerate(df.columns):
+        if col not in wanted: continue
+        series = df.iloc[:, i]
+        spec = compacted[col]
+        if series.dtype == spec.dtype: restored.append((i, restore_series(series, spec)))
+    if not restored: return df
+    df = df.copy(deep=False)
+    for i, series in restored:
+        df.isetitem(i, series)
+    return df
+
+def dates_as_text(df):
+    """
+    Date-only datetime columns as ISO text, for every text and database destination: to_csv would
+    write them that way but formats value by value, to_json would add a midnight time and
+    to_sql/to_excel would store timestamps, so the text is what makes those outputs (and streamed
+    chunks) agree.
+    """
+    if df.columns.has_duplicates:
+        return df
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if not pd.api.types.is_datetime64_dtype(series): continue
+        values = series.to_numpy()
+        present = ~np.isnat(values)
+        if not (values[present].astype('datetime64[D]') == values[present]).all(): continue
+        text = np.datetime_as_string(values, unit='D').astype(object)
+        text[~present] = np.nan
+        columns[col] = pd.Series(text, index=series.index, name=col)
+    if columns:
+        df = df.copy(deep=False)
+        for col, series in columns.items():
+            df[col] = series
+    return df
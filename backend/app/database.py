@@ -0,0 +1,53 @@
+import os
+import sqlite3
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+
+# Any SQLAlchemy URL (postgresql://..., mysql+pymysql://...); unset, the SQLite file next to the app
+DATABASE_URL = os.getenv('DATABASE_URL')
+# Seconds a SQLite connection waits for another writer instead of failing with "database is locked"
+SQLITE_BUSY_TIMEOUT = float(os.getenv('SQLITE_BUSY_TIMEOUT', 30))
+# Connections each process keeps open, and how many more it may open under load
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 20))
+# Server databases drop idle connections; recycle them before that (seconds)
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))
+
+# Applied to every SQLite connection: WAL lets readers run while one writer commits, and NORMAL
+# sync is safe with WAL (a power loss can drop the last commits, never corrupt the file)
+SQLITE_PRAGMAS = (
+    'journal_mode=WAL',
+    'synchronous=NORMAL',
+    f'busy_timeout={int(SQLITE_BUSY_TIMEOUT * 1000)}',
+    'cache_size=-32000', # KiB
+    'temp_store=MEMORY',
+)
+
+def database_url():
+    if DATABASE_URL: return DATABASE_URL
+    return f"sqlite:///{os.path.join(os.path.abspath(os.path.dirname(__file__)), '..', 'pipelines.db')}"
+
+def engine_options(url):
+    """Pool and driver settings for SQLALCHEMY_ENGINE_OPTIONS."""
+    url = make_url(url)
+    if url.get_backend_name() == 'sqlite':
+        # In-memory databases live in one connection; SQLAlchemy pins it, so there's nothing to tune
+        if url.database in (None, '', ':memory:'): return {}
+        # Connections move between request, scheduler and worker threads through the pool
+        return {'pool_size': DB_POOL_SIZE, 'max_overflow': DB_MAX_OVERFLOW, 'connect_args': {'timeout': SQLITE_BUSY_TIMEOUT, 'check_same_thread': False}}
+    return {'pool_size': DB_POOL_SIZE, 'max_overflow': DB_MAX_OVERFLOW, 'pool_recycle': DB_POOL_RECYCLE, 'pool_pre_ping': True}
+
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    if not isinstance(dbapi_connection, sqlite3.Connection): return
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(f'PRAGMA {pragma}')
+    cursor.close()
+
+def init_database():
+    """Creates missing tables and brings existing ones up to date (see migrations.py). Returns the migrations applied."""
+    from . import db, models # the models register their tables
+    from .migrations import upgrade
+    db.create_all()
+    return upgrade(db.engine)
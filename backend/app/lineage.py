@@ -0,0 +1,119 @@
+import json
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from . import db
+from .models import LineageEdge, Pipeline, ProcessedFile
+
+def flow_nodes(structure):
+    """Nodes of a saved flow, stored either as a node list or as {nodes, edges}."""
+    try:
+        flow = json.loads(structure) if isinstance(structure, str) else structure
+    except ValueError:
+        return []
+    nodes = flow if isinstance(flow, list) else (flow or {}).get('nodes', [])
+    return [n for n in nodes if isinstance(n, dict) and isinstance(n.get('data'), dict)]
+
+def flow_datasets(structure):
+    """(datasets the flow reads, datasets its destinations write), by filename as the engine resolves them."""
+    from .pipeline_engine import PipelineEngine
+    inputs, outputs = set(), set()
+    for node in flow_nodes(structure):
+        node_type, data = node.get('type', ''), node['data']
+        if node_type == 'sourceNode' or node_type.startswith('source_'):
+            filename = data.get('filename') or data.get('label')
+            if filename and '.' in filename: inputs.add(filename)
+        elif node_type in PipelineEngine.DEST_EXTENSIONS:
+            outputs.add(PipelineEngine.destination_name(node_type, data))
+    return inputs, outputs
+
+def record_pipeline_lineage(pipeline):
+    """
+    Replaces the edges read off a saved pipeline's flow with what it now reads and writes. Outputs
+    its runs recorded (charts, renamed files, destinations since removed) stay. The caller commits.
+    """
+    inputs, outputs = flow_datasets(pipeline.structure)
+    LineageEdge.query.filter_by(pipeline_id=pipeline.id, origin='flow').delete()
+    insert_edges(db.session, [
+        {'user_id': pipeline.user_id, 'pipeline_id': pipeline.id, 'dataset': dataset, 'role': role, 'origin': 'flow'}
+        for role, datasets in (('input', inputs), ('output', outputs)) for dataset in sorted(datasets)
+    ])
+
+def insert_edges(session, rows):
+    """
+    Inserts edges in one statement, skipping those already there: two runs of a pipeline can write
+    the same output at once, and a read-then-insert would let both insert it (see ix_lineage_pipeline).
+    """
+    if not rows: return
+    dialect = session.get_bind().dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        insert = (sqlite_insert if dialect == 'sqlite' else postgresql_insert)(LineageEdge.__table__).on_conflict_do_nothing()
+    elif dialect in ('mysql', 'mariadb'):
+        insert = LineageEdge.__table__.insert().prefix_with('IGNORE')
+    else:
+        known = {(e.role, e.dataset) for e in session.query(LineageEdge).filter_by(pipeline_id=rows[0]['pipeline_id'])}
+        rows = [r for r in rows if (r['role'], r['dataset']) not in known]
+        insert = LineageEdge.__table__.insert()
+    if rows: session.execute(insert, rows)
+
+def record_outputs(session, pipeline_id, user_id, datasets):
+    """Output edges for files a run of the pipeline wrote (charts and renamed outputs included). The caller commits."""
+    datasets = sorted(set(datasets))
+    insert_edges(session, [{'user_id': user_id, 'pipeline_id': pipeline_id, 'dataset': d, 'role': 'output', 'origin': 'run'} for d in datasets])
+    # Outputs the flow already named are now known to be written, so a later save keeps them
+    edges = LineageEdge.__table__
+    session.execute(edges.update().where(edges.c.pipeline_id == pipeline_id, edges.c.role == 'output', edges.c.dataset.in_(datasets), edges.c.origin != 'run').values(origin='run'))
+
+def backfill_lineage():
+    """Edges of pipelines and outputs saved before the lineage table existed (no-op once it has rows)."""
+    if LineageEdge.query.first() is not None: return
+    for pipeline in Pipeline.query.all():
+        record_pipeline_lineage(pipeline)
+    db.session.flush()
+    outputs = {}
+    for f in ProcessedFile.query.filter(ProcessedFile.source_pipeline_id.isnot(None)):
+        outputs.setdefault((f.source_pipeline_id, f.user_id), set()).add(f.filename)
+    for (pipeline_id, user_id), datasets in outputs.items():
+        if Pipeline.query.get(pipeline_id): record_outputs(db.session, pipeline_id, user_id, datasets)
+    db.session.commit()
+
+# One hop goes from a dataset to a pipeline on one side of it (near) and on to that pipeline's datasets
+# on the other side (far). Rows carry no depth, so UNION drops every repeated hop and cycles end by themselves
+WALK_SQL = """
+WITH RECURSIVE walk(dataset, pipeline_id, previous) AS (
+    SELECT :dataset, NULL, NULL
+    UNION
+    SELECT far.dataset, near.pipeline_id, walk.dataset
+    FROM walk
+    JOIN lineage_edge AS near ON near.user_id = :user AND near.dataset = walk.dataset AND near.role = :near
+    JOIN lineage_edge AS far ON far.pipeline_id = near.pipeline_id AND far.role = :far
+)
+SELECT walk.dataset, walk.pipeline_id, pipeline.name, walk.previous
+FROM walk JOIN pipeline ON pipeline.id = walk.pipeline_id
+"""
+
+def lineage_walk(user_id, dataset, direction):
+    """
+    Every hop upstream (what dataset is derived from) or downstream (what is derived from it), over
+    any number of pipelines: [{source, pipeline: {id, name}, target, depth}], nearest first.
+    """
+    near, far = ('output', 'input') if direction == 'upstream' else ('input', 'output')
+    rows = db.session.execute(text(WALK_SQL), {'dataset': dataset, 'user': user_id, 'near': near, 'far': far}).fetchall()
+    # Depth of a hop = pipelines between it and dataset, by breadth-first search over the hops found
+    hops_from = {}
+    for row in rows: hops_from.setdefault(row.previous, []).append(row)
+    visited, frontier, depth = {dataset}, [dataset], 0
+    hops = []
+    while frontier:
+        depth += 1
+        reached = []
+        for previous in frontier:
+            for row in hops_from.get(previous, []):
+                source, target = (row.dataset, previous) if direction == 'upstream' else (previous, row.dataset)
+                hops.append({"source": source, "pipeline": {"id": row.pipeline_id, "name": row.name}, "target": target, "depth": depth})
+                if row.dataset not in visited:
+                    visited.add(row.dataset)
+                    reached.append(row.dataset)
+        frontier = reached
+    return hops
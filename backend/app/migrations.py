@@ -0,0 +1,100 @@
+"""
+Versioned schema changes for databases created by older releases. db.create_all() makes missing
+tables (with their current columns and indexes) but never alters existing ones; every change to an
+existing table goes here as a new numbered step. Steps check what's there first, so they are safe on
+fresh databases too, and each applied version is recorded in schema_migration.
+"""
+import json
+from datetime import datetime
+from sqlalchemy import inspect, text
+
+def add_columns(conn, table, columns):
+    present = {c['name'] for c in inspect(conn).get_columns(table)}
+    quote = conn.dialect.identifier_preparer.quote
+    for name, ddl in columns:
+        if name not in present: conn.execute(text(f"ALTER TABLE {quote(table)} ADD COLUMN {quote(name)} {ddl}"))
+
+def create_missing_indexes(conn):
+    """Indexes declared on the models (index=True, __table_args__) that an existing table lacks."""
+    from . import db
+    inspector = inspect(conn)
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name): continue
+        present = {ix['name'] for ix in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in present: index.create(conn)
+
+def catalog_metadata(conn):
+    add_columns(conn, 'data_source', [('row_count', 'INTEGER DEFAULT 0'), ('columns', 'TEXT')])
+    add_columns(conn, 'processed_file', [('row_count', 'INTEGER DEFAULT 0'), ('columns', 'TEXT'), ('source_pipeline_id', 'INTEGER REFERENCES pipeline(id)')])
+
+def notification_preferences(conn):
+    add_columns(conn, 'user', [('notify_on_success', 'BOOLEAN DEFAULT TRUE'), ('notify_on_failure', 'BOOLEAN DEFAULT TRUE')])
+
+def upload_hash_and_profiles(conn):
+    add_columns(conn, 'data_source', [('content_hash', 'VARCHAR(64)'), ('profile', 'TEXT')])
+    add_columns(conn, 'processed_file', [('profile', 'TEXT')])
+
+def run_logs_to_table(conn):
+    """Moves the JSON log of every existing run into run_log. pipeline_run.logs is emptied and no longer mapped."""
+    if 'logs' not in {c['name'] for c in inspect(conn).get_columns('pipeline_run')}: return
+    from .models import RunLog
+    from .run_logs import log_rows
+    for run_id, blob in conn.execute(text("SELECT id, logs FROM pipeline_run WHERE logs IS NOT NULL")).fetchall():
+        try:
+            lines = json.loads(blob)
+        except ValueError:
+            lines = blob.splitlines()
+        if not isinstance(lines, list): lines = [lines]
+        if lines: conn.execute(RunLog.__table__.insert(), log_rows(run_id, 0, lines))
+    conn.execute(text("UPDATE pipeline_run SET logs = NULL"))
+
+def lineage_edge_origin(conn):
+    """
+    Marks the output edges runs recorded, which saving the pipeline used to delete with the rest:
+    those still matching a processed file are restored or marked 'run'.
+    """
+    add_columns(conn, 'lineage_edge', [('origin', "VARCHAR(10) DEFAULT 'flow'")])
+    conn.execute(text("""
+        INSERT INTO lineage_edge (user_id, pipeline_id, dataset, role, origin, created_at)
+        SELECT MIN(f.user_id), f.source_pipeline_id, f.filename, 'output', 'run', MIN(f.created_at)
+        FROM processed_file AS f JOIN pipeline ON pipeline.id = f.source_pipeline_id
+        WHERE f.user_id IS NOT NULL AND NOT EXISTS (
+            SELECT 1 FROM lineage_edge AS e WHERE e.pipeline_id = f.source_pipeline_id AND e.role = 'output' AND e.dataset = f.filename
+        )
+        GROUP BY f.source_pipeline_id, f.filename
+    """))
+    conn.execute(text("""
+        UPDATE lineage_edge SET origin = 'run' WHERE role = 'output' AND EXISTS (
+            SELECT 1 FROM processed_file AS f WHERE f.source_pipeline_id = lineage_edge.pipeline_id AND f.filename = lineage_edge.dataset
+        )
+    """))
+
+def run_owner(conn):
+    add_columns(conn, 'pipeline_run', [('owner', 'VARCHAR(120)')])
+
+MIGRATIONS = [
+    (1, "Row count, columns and lineage fields on catalog tables", catalog_metadata),
+    (2, "Notification preferences", notification_preferences),
+    (3, "Upload content hash and column profiles", upload_hash_and_profiles),
+    (4, "Indexes on foreign keys and lookup columns", create_missing_indexes),
+    (5, "Run logs in their own append-only table", run_logs_to_table),
+    (6, "Indexes for listing files by date", create_missing_indexes),
+    (7, "Lineage edges recorded by runs survive saving the pipeline", lineage_edge_origin),
+    (8, "Server process that queued each run", run_owner),
+]
+
+def upgrade(engine):
+    """Applies the migrations this database hasn't had, each in its own transaction. Returns their versions."""
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE IF NOT EXISTS schema_migration (version INTEGER PRIMARY KEY, name VARCHAR(200), applied_at TIMESTAMP)"))
+        done = {row[0] for row in conn.execute(text("SELECT version FROM schema_migration"))}
+    applied = []
+    for version, name, step in MIGRATIONS:
+        if version in done: continue
+        with engine.begin() as conn:
+            step(conn)
+            conn.execute(text("INSERT INTO schema_migration (version, name, applied_at) VALUES (:v, :n, :t)"), {'v': version, 'n': name, 't': datetime.utcnow()})
+        print(f" - Applied migration {version}: {name}")
+        applied.append(version)
+    return applied
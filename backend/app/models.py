@@ -20,7 +20,7 @@ class User(db.Model):
 
 class Notification(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     message = db.Column(db.String(500))
     type = db.Column(db.String(20)) # 'success', 'error', 'info'
     read = db.Column(db.Boolean, default=False)
@@ -32,29 +32,82 @@ class Pipeline(db.Model):
     structure = db.Column(db.Text) # JSON string of nodes/edges
     status = db.Column(db.String(20), default='Ready') 
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), index=True)
     schedule = db.Column(db.String(50), nullable=True) # e.g., "0 9 * * *" or "every_10_minutes"
     next_run = db.Column(db.DateTime, nullable=True)
 
     # Relationships
     shares = db.relationship('SharedPipeline', backref='pipeline', lazy='dynamic', cascade="all, delete-orphan")
     runs = db.relationship('PipelineRun', backref='pipeline', lazy='dynamic', cascade="all, delete-orphan")
+    lineage = db.relationship('LineageEdge', backref='pipeline', lazy='dynamic', cascade="all, delete-orphan")
     
     # NEW: Lineage relationship (Files created by this pipeline)
     outputs = db.relationship('ProcessedFile', backref='source_pipeline', lazy='dynamic')
 
-class PipelineRun(db.Model):
+class LineageEdge(db.Model):
+    """
+    One hop of the lineage graph: a dataset (by filename, per user) a pipeline reads ('input') or
+    writes ('output'). Walked both ways with recursive queries (see lineage.py).
+    """
     id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     pipeline_id = db.Column(db.Integer, db.ForeignKey('pipeline.id'), nullable=False)
+    dataset = db.Column(db.String(200), nullable=False)
+    role = db.Column(db.String(10), nullable=False) # 'input' or 'output'
+    origin = db.Column(db.String(10), default='flow') # 'flow' (read off the saved flow) or 'run' (a run wrote it)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # From a dataset to the pipelines around it, and from a pipeline to its other datasets
+        db.Index('ix_lineage_dataset', 'user_id', 'dataset', 'role'),
+        db.Index('ix_lineage_pipeline', 'pipeline_id', 'role', 'dataset', unique=True),
+    )
+
+class PipelineRun(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    pipeline_id = db.Column(db.Integer, db.ForeignKey('pipeline.id'), nullable=False, index=True)
     status = db.Column(db.String(20), default='Running') # Running, Success, Failed
     start_time = db.Column(db.DateTime, default=datetime.utcnow)
     end_time = db.Column(db.DateTime)
-    logs = db.Column(db.Text) # JSON string
+    owner = db.Column(db.String(120)) # workers.SERVER_ID of the server process that queued it
+
+    node_metrics = db.relationship('NodeMetric', backref='run', lazy='dynamic', cascade="all, delete-orphan")
+
+class RunLog(db.Model):
+    """
+    One line of a PipelineRun's log. Lines are only ever appended, numbered from 0 within their run,
+    so a range or the tail of a log reads straight off (run_id, seq) (see run_logs.py).
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    run_id = db.Column(db.Integer, db.ForeignKey('pipeline_run.id'), nullable=False)
+    seq = db.Column(db.Integer, nullable=False)
+    line = db.Column(db.Text)
+    logged_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_run_log_run_seq', 'run_id', 'seq', unique=True),
+    )
+
+class NodeMetric(db.Model):
+    """Per-node performance counters recorded by the engine for one PipelineRun."""
+    id = db.Column(db.Integer, primary_key=True)
+    run_id = db.Column(db.Integer, db.ForeignKey('pipeline_run.id'), nullable=False, index=True)
+    node_id = db.Column(db.String(64))
+    node_type = db.Column(db.String(40))
+    label = db.Column(db.String(140))
+    wall_time = db.Column(db.Float, default=0) # seconds
+    cpu_time = db.Column(db.Float, default=0) # seconds of CPU on the thread(s) running the node
+    rows_in = db.Column(db.Integer, default=0)
+    rows_out = db.Column(db.Integer, default=0)
+    bytes_read = db.Column(db.Integer, default=0)
+    bytes_written = db.Column(db.Integer, default=0)
+    rss_delta = db.Column(db.Integer) # bytes; process-wide, so parallel nodes share it
+    peak_rss = db.Column(db.Integer) # process high-water mark (bytes) when the node finished
 
 class SharedPipeline(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    pipeline_id = db.Column(db.Integer, db.ForeignKey('pipeline.id'))
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
+    pipeline_id = db.Column(db.Integer, db.ForeignKey('pipeline.id'), index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), index=True)
     role = db.Column(db.String(20), default='viewer') # viewer, editor
 
 class DataSource(db.Model):
@@ -62,13 +115,41 @@ class DataSource(db.Model):
     filename = db.Column(db.String(140))
     file_type = db.Column(db.String(20))
     file_size = db.Column(db.String(20))
-    filepath = db.Column(db.String(200))
+    filepath = db.Column(db.String(200), index=True)
     upload_date = db.Column(db.DateTime, default=datetime.utcnow)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), index=True)
 
     # NEW: Metadata Fields
     row_count = db.Column(db.Integer, default=0)
     columns = db.Column(db.Text) # JSON string: {"col1": "int", "col2": "string"}
+    content_hash = db.Column(db.String(64)) # SHA-256 of the uploaded bytes
+    profile = db.Column(db.Text) # JSON string: row count, in-memory size and per-column statistics (see profiling.py)
+
+    __table_args__ = (
+        # A user's files newest first, for the paged /datasources listing and the catalog
+        db.Index('ix_data_source_user_date', 'user_id', 'upload_date', 'id'),
+    )
+
+class UploadSession(db.Model):
+    """A chunked upload in progress: chunks are appended to a partial file until the client completes it."""
+    id = db.Column(db.String(32), primary_key=True) # random token the chunks are sent against
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    filename = db.Column(db.String(140))
+    total_size = db.Column(db.BigInteger, nullable=True) # announced by the client, checked on completion
+    received_bytes = db.Column(db.BigInteger, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class DatasetSchema(db.Model):
+    """Column dtypes of a CSV file from a full scan, used to parse it without type inference."""
+    id = db.Column(db.Integer, primary_key=True)
+    path = db.Column(db.String(300), unique=True, index=True) # absolute path of the file
+    dtypes = db.Column(db.Text) # JSON string: {"col1": "int64", "col2": "object"}
+    row_count = db.Column(db.Integer, default=0)
+    # Size and mtime the schema was built from; a schema for a file that changed since is ignored
+    file_size = db.Column(db.BigInteger)
+    file_mtime_ns = db.Column(db.BigInteger)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 class ProcessedFile(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -76,11 +157,16 @@ class ProcessedFile(db.Model):
     file_type = db.Column(db.String(20))
     file_size_display = db.Column(db.String(20))
     file_size_bytes = db.Column(db.Integer)
-    filepath = db.Column(db.String(200))
+    filepath = db.Column(db.String(200), index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), index=True)
 
     # NEW: Metadata & Lineage Fields
     row_count = db.Column(db.Integer, default=0)
     columns = db.Column(db.Text) # JSON string
-    source_pipeline_id = db.Column(db.Integer, db.ForeignKey('pipeline.id'), nullable=True)
\ No newline at end of file
+    profile = db.Column(db.Text) # JSON string, as DataSource.profile
+    source_pipeline_id = db.Column(db.Integer, db.ForeignKey('pipeline.id'), nullable=True, index=True)
+
+    __table_args__ = (
+        db.Index('ix_processed_file_user_created', 'user_id', 'created_at', 'id'),
+    )
\ No newline at end of file
@@ -0,0 +1,54 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+# Memory budget for cached preview results (in MB)
+PREVIEW_CACHE_MB = int(os.getenv('PREVIEW_CACHE_MB', 256))
+
+def make_cache_key(payload):
+    """Stable content hash of a JSON-serialisable description of a node and its inputs."""
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+class NodeCache:
+    """
+    LRU cache of node output DataFrames keyed by content hash.
+    Entries are evicted least-recently-used first once the memory budget is exceeded.
+    Cached frames are shared between engines, so callers must treat them as read-only.
+    """
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            self.entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, df):
+        nbytes = int(df.memory_usage(index=True, deep=True).sum())
+        if nbytes > self.max_bytes:
+            return
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[1]
+            self.entries[key] = (df, nbytes)
+            self.total_bytes += nbytes
+            while self.total_bytes > self.max_bytes and self.entries:
+                _, (_, evicted_bytes) = self.entries.popitem(last=False)
+                self.total_bytes -= evicted_bytes
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+preview_cache = NodeCache(PREVIEW_CACHE_MB * 1024 * 1024)
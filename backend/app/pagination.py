@@ -0,0 +1,66 @@
+from datetime import datetime
+from flask import request, jsonify
+
+from . import db
+
+# Items per page of a list endpoint when the client doesn't ask for a size, and the most it may ask for
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+def page_args(default=PAGE_SIZE, parse=int):
+    """
+    (limit, cursor) from the request's ?limit= and ?cursor=, the cursor read with parse
+    (merged_cursor for merged_keyset_page). Raises ValueError for a malformed cursor.
+    """
+    limit = min(max(request.args.get('limit', default, type=int), 1), MAX_PAGE_SIZE)
+    cursor = request.args.get('cursor')
+    return limit, parse(cursor) if cursor else None
+
+def keyset_page(query, column, limit, cursor):
+    """
+    One page of query, newest first by an increasing unique column (usually the primary key): the rows
+    after cursor, plus the cursor of the next page (None on the last one). Cost doesn't grow with the page number.
+    """
+    if cursor is not None: query = query.filter(column < cursor)
+    rows = query.order_by(column.desc()).limit(limit + 1).all()
+    more, rows = len(rows) > limit, rows[:limit]
+    return rows, keyset_value(rows[-1], column) if more else None
+
+def keyset_value(row, column):
+    # Plain model rows, or (model, extra...) rows from multi-entity queries
+    entity = row[0] if hasattr(row, '_fields') else row
+    return getattr(entity, column.key)
+
+def merged_keyset_page(sources, limit, cursor):
+    """
+    One page over several tables merged into one newest-first list: sources are (query, model, time
+    column, kind) with a distinct kind per table. Rows are ordered by (time, kind, id), descending,
+    so rows created at the same moment still have a fixed place. Each table is read for at most one
+    page. cursor is a merged_cursor() key; returns ([records], next cursor as text).
+    """
+    keyed = []
+    for query, model, column, kind in sources:
+        if cursor is not None:
+            # (time, kind, id) < cursor, with this table's kind already known
+            time, last_kind, last_id = cursor
+            if kind < last_kind: query = query.filter(column <= time)
+            elif kind > last_kind: query = query.filter(column < time)
+            else: query = query.filter(db.or_(column < time, db.and_(column == time, model.id < last_id)))
+        rows = query.order_by(column.desc(), model.id.desc()).limit(limit + 1)
+        keyed += [((getattr(record, column.key), kind, record.id), record) for record in rows]
+    keyed.sort(key=lambda item: item[0], reverse=True)
+    more, keyed = len(keyed) > limit, keyed[:limit]
+    if not more: return [record for _, record in keyed], None
+    time, kind, record_id = keyed[-1][0]
+    return [record for _, record in keyed], f"{time.isoformat()}_{kind}_{record_id}"
+
+def merged_cursor(cursor):
+    """(time, kind, id) from a merged_keyset_page cursor. Raises ValueError when it isn't one."""
+    time, kind, record_id = cursor.rsplit('_', 2)
+    return datetime.fromisoformat(time), int(kind), int(record_id)
+
+def paged_response(items, next_cursor):
+    """JSON list of one page; the next page's cursor goes in the X-Next-Cursor header (absent on the last page)."""
+    response = jsonify(items)
+    if next_cursor is not None: response.headers['X-Next-Cursor'] = str(next_cursor)
+    return response
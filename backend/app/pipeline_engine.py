@@ -1,4 +1,9 @@
 import os
+import sys
+import time
+import logging
+import threading
+from collections import deque
 import pandas as pd
 import numpy as np
 import sqlite3
@@ -6,9 +11,31 @@ import json
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
-from .models import ProcessedFile
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from .models import ProcessedFile, NodeMetric
+from .node_cache import make_cache_key
+from .spill import (
+    MEMORY_BUDGET, JOIN_EXPANSION, estimate_frame_bytes, estimate_file_bytes,
+    frame_chunks, join_keys, bucket_count, hash_join, external_sort
+)
+from .compaction import COMPACT_DTYPES, compact_frame, dates_as_text, restore
+from .schemas import lookup_schema, save_schema, scan_file, CSV_DTYPES
+from .lineage import record_outputs
+from .profiling import PROFILING, Profiler, profile_frame, profile_json, lookup_profile
+from .readers import (
+    file_format, read_header, read_columnar, read_csv_file, read_json_file, iter_chunks, write_columnar,
+    fresh_sidecar, write_sidecar, sidecar_path, open_text, ARROW_FILTER_OPS, CHUNKED_FORMATS, COMPRESSION_EXTENSIONS
+)
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
+try:
+    import resource
+except ImportError: # Windows
+    resource = None
+
 def get_size_format(b, factor=1024, suffix="B"):
     for unit in ["", "K", "M", "G", "T", "P"]:
         if b < factor:
@@ -16,6 +43,62 @@ def get_size_format(b, factor=1024, suffix="B"):
         b /= factor
     return f"{b:.2f} Y{suffix}"
 
+# Node types that only look at one row at a time and can therefore run chunk-by-chunk
+STREAMABLE_NODES = {
+    'filterNode', 'trans_select', 'trans_rename', 'trans_cast', 'trans_string',
+    'trans_calc', 'trans_constant', 'trans_fillna', 'trans_limit'
+}
+STREAMING_DESTINATIONS = {'dest_csv', 'dest_json', 'dest_jsonl', 'dest_db'}
+# Nodes that can be folded into the read of the source directly above them
+PUSHDOWN_NODES = {'filterNode', 'trans_select', 'trans_limit'}
+STREAMING_CHUNK_SIZE = 100_000
+# Aggregations that can be computed per chunk and merged afterwards (mean as a sum/count pair)
+PARTIAL_GROUP_OPS = {'sum', 'count', 'min', 'max', 'mean'}
+# Nodes that pass compacted columns through untouched (see uncompact_input)
+COMPACT_PASSTHROUGH_NODES = {'trans_select', 'trans_limit', 'trans_dedupe'}
+
+# Upper bound on nodes executed at the same time by the in-memory scheduler
+MAX_PARALLEL_NODES = int(os.getenv('PIPELINE_MAX_PARALLEL_NODES', min(8, os.cpu_count() or 1)))
+
+# pyplot keeps global figure state, so charts are drawn one at a time
+chart_lock = threading.Lock()
+
+def current_rss():
+    """Resident memory of this process in bytes, or None where /proc isn't available."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def peak_rss():
+    """High-water mark of this process's resident memory in bytes."""
+    # VmHWM belongs to this address space; ru_maxrss would also count a parent's peak before exec
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+def top_k(df, column, k, ascending):
+    """df.sort_values(column).head(k) without sorting every row (n log k for numeric and date keys)."""
+    try:
+        top = df.nsmallest(k, column) if ascending else df.nlargest(k, column)
+    except TypeError:
+        # Strings and other non-numeric keys: nothing cheaper than a full sort
+        return df.sort_values(column, ascending=ascending, kind='stable').head(k)
+    if len(top) < k:
+        # nsmallest/nlargest drop null keys, which sort_values lists last
+        top = pd.concat([top, df[df[column].isna()].head(k - len(top))])
+    return top
+
 def safe_convert(val):
     try:
         return int(val)
@@ -25,19 +108,105 @@ def safe_convert(val):
         except:
             return val
 
+class StreamingDestination:
+    """
+    Incremental writer used by streaming mode.
+    Opens the output once and appends every chunk it receives.
+    """
+    def __init__(self, type_key, name, path):
+        self.type_key = type_key
+        self.name = name
+        self.path = path
+        self.rows = 0
+        self.schema = None
+        self.profile = Profiler() if PROFILING else None
+        self.handle = None
+        self.conn = None
+
+    def write(self, chunk):
+        first = self.schema is None
+        # Same date text as save_destination writes
+        chunk = dates_as_text(chunk)
+        if self.type_key == 'dest_csv':
+            if first: self.handle = open_text(self.path, 'w', newline='')
+            chunk.to_csv(self.handle, index=False, header=first)
+        elif self.type_key == 'dest_json':
+            if first:
+                self.handle = open_text(self.path, 'w')
+                self.handle.write('[')
+            if not chunk.empty:
+                if self.rows > 0: self.handle.write(',')
+                # Strip the surrounding brackets so chunks join into one records array
+                self.handle.write(chunk.to_json(orient='records', date_format='iso')[1:-1])
+        elif self.type_key == 'dest_jsonl':
+            if first: self.handle = open_text(self.path, 'w')
+            # One record per line, so every chunk is simply appended
+            if not chunk.empty: self.handle.write(chunk.to_json(orient='records', lines=True, date_format='iso'))
+        elif self.type_key == 'dest_db':
+            if first: self.conn = sqlite3.connect(self.path)
+            chunk.to_sql('export_data', self.conn, if_exists='replace' if first else 'append', index=False)
+        if self.profile and not chunk.empty: self.profile.update(chunk)
+        self.rows += len(chunk)
+        self.schema = chunk.head(0)
+
+    def close(self):
+        if self.handle:
+            if self.type_key == 'dest_json': self.handle.write(']')
+            self.handle.close()
+            self.handle = None
+        if self.conn:
+            self.conn.commit()
+            self.conn.close()
+            self.conn = None
+
 class PipelineEngine:
-    def __init__(self, nodes, edges, user, base_dir, db_session, preview_mode=False, pipeline_id=None):
+    def __init__(self, nodes, edges, user, base_dir, db_session, preview_mode=False, pipeline_id=None, streaming=True, chunk_size=STREAMING_CHUNK_SIZE, max_workers=MAX_PARALLEL_NODES, cache=None, memory_budget=MEMORY_BUDGET, log_writer=None):
         self.nodes = {n['id']: n for n in nodes}
         self.adj_list = {n['id']: [] for n in nodes}
         self.in_degree = {n['id']: 0 for n in nodes}
+        self.parents = {n['id']: [] for n in nodes}
         self.data_store = {}
-        self.logs = [f"Pipeline initialized with {len(nodes)} nodes."]
+        # node_id -> compacted columns its result still holds (see compact_source and uncompact_input)
+        self.compacted = {}
+        # Lines also go to the run's log store as they happen when there is one (see run_logs.RunLogWriter)
+        self.log_writer = log_writer
+        self.logs = []
+        self.emit([f"Pipeline initialized with {len(nodes)} nodes."])
         self.db = db_session
         self.user = user
+        # Read once here: node threads have no app context to reload an expired User
+        self.user_id = user.id
         self.base_dir = base_dir
         self.processed_bytes = 0
         self.preview_mode = preview_mode
         self.pipeline_id = pipeline_id
+        self.streaming = streaming
+        self.chunk_size = chunk_size
+        self.max_workers = max(1, max_workers)
+        self.cache = cache
+        self.memory_budget = memory_budget
+        self.pending_records = []
+        # Registered CSV/JSON Lines dtypes by absolute path (see load_schemas and chunk_dtypes), and schemas learned this run
+        self.csv_schemas = {}
+        self.pending_schemas = []
+        # Stored column profiles of the sources, by node id (see load_profiles)
+        self.source_profiles = {}
+        self.read_plans = {}
+        self.absorbed = {}
+        # Joins that partition their inputs on disk, and the sources they read themselves
+        self.spill_joins = {}
+        self.deferred_sources = {}
+        # Group nodes that aggregate their source chunk by chunk, and the nodes folded into them
+        self.partial_groups = {}
+        self.sort_plans = {}
+        self.folded_into = {}
+        # Nodes already fed chunk by chunk by an upstream operator (see stream_from)
+        self.streamed = set()
+        self.stream_state = {}
+        # node_id -> performance counters, filled in execution order (see measure)
+        self.metrics = {}
+        # Per-thread log buffer and mute flag, so concurrent nodes never interleave their lines
+        self.local = threading.local()
         
         self.uploads_dir = os.path.join(base_dir, '..', 'uploads')
         self.processed_dir = os.path.join(base_dir, '..', 'processed')
@@ -49,39 +218,350 @@ class PipelineEngine:
                 self.adj_list[edge['source']].append(edge['target'])
                 self.in_degree[edge['target']] += 1
 
+        # Reverse index built once, in node order so join inputs keep their usual left/right order
+        for nid, children in self.adj_list.items():
+            for child in children:
+                if nid not in self.parents.setdefault(child, []):
+                    self.parents[child].append(nid)
+        # Number of consumers that still need each node's result before it can be released
+        self.pending_consumers = {nid: len(set(children)) for nid, children in self.adj_list.items()}
+
+    def log(self, message):
+        if getattr(self.local, 'muted', False):
+            return
+        buffer = getattr(self.local, 'buffer', None)
+        if buffer is not None: buffer.append(message)
+        else: self.emit([message])
+
+    def emit(self, lines):
+        self.logs.extend(lines)
+        if self.log_writer: self.log_writer.write(lines)
+
+    def node_metric(self, node_id):
+        return self.metrics.setdefault(node_id, {
+            'wall_time': 0.0, 'cpu_time': 0.0, 'rows_in': 0, 'rows_out': 0,
+            'bytes_read': 0, 'bytes_written': 0, 'rss_delta': None, 'peak_rss': None
+        })
+
+    @contextmanager
+    def measure(self, node_id):
+        """
+        Adds the wall time, thread CPU time and RSS movement of the enclosed block to a node's
+        metrics. May be entered many times for the same node (once per chunk when streaming).
+        """
+        metric = self.node_metric(node_id)
+        outer = getattr(self.local, 'metric', None)
+        self.local.metric = metric
+        rss_before = current_rss()
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield metric
+        finally:
+            metric['wall_time'] += time.perf_counter() - wall
+            metric['cpu_time'] += time.thread_time() - cpu
+            rss_after = current_rss()
+            if rss_before is not None and rss_after is not None:
+                metric['rss_delta'] = (metric['rss_delta'] or 0) + rss_after - rss_before
+            metric['peak_rss'] = peak_rss()
+            self.local.metric = outer
+
+    def count_io(self, key, amount):
+        """Adds to a counter of the node currently being measured on this thread."""
+        metric = getattr(self.local, 'metric', None)
+        if metric is not None:
+            metric[key] += amount
+
+    def save_metrics(self, run_id):
+        """Persists the collected per-node metrics as NodeMetric rows of a PipelineRun."""
+        for node_id, metric in self.metrics.items():
+            node = self.nodes[node_id]
+            self.db.add(NodeMetric(run_id=run_id, node_id=node_id, node_type=node['type'], label=node['data'].get('label', node['type']), **metric))
+        self.db.commit()
+
     def run(self):
         queue = [nid for nid, count in self.in_degree.items() if count == 0]
         
         if not queue:
-            self.logs.append("Error: No starting nodes found (circular dependency or empty graph).")
+            self.log("Error: No starting nodes found (circular dependency or empty graph).")
             return self.logs
 
+        self.load_schemas()
+        self.load_profiles()
+        self.plan_source_reads()
+        self.plan_spill_joins()
+        self.plan_partial_aggregations()
+        self.plan_sorts()
+        if self.can_stream():
+            self.run_streaming(queue)
+        else:
+            self.run_in_memory(queue)
+        self.flush_records()
+        
+        if self.processed_bytes > 0 and not self.preview_mode:
+            self.user.total_processed_bytes += self.processed_bytes
+            self.db.commit()
+            
+        self.log("Pipeline execution completed successfully.")
+        return self.logs
+
+    def run_in_memory(self, queue):
+        """
+        Dispatches every ready node to a thread pool. A child is queued as soon as its
+        last parent has stored its result, so independent branches run side by side.
+        On the first failure no new nodes are started; running ones are allowed to finish
+        and the error is raised once the pool is idle.
+        """
+        ready = list(queue)
+        running = {}
+        sequence = {}
+        failure = None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='pipeline-node') as pool:
+            while ready or running:
+                while ready and failure is None:
+                    current_id = ready.pop(0)
+                    if current_id not in self.nodes: continue
+                    future = pool.submit(self.execute_node, current_id)
+                    running[future] = current_id
+                    sequence[future] = len(sequence)
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in sorted(done, key=sequence.get):
+                    current_id = running.pop(future)
+                    node_logs, error_msg = future.result()
+                    self.emit(node_logs)
+                    self.flush_records()
+                    if error_msg:
+                        failure = failure or error_msg
+                        continue
+                    self.release_inputs(current_id)
+
+                    for child in self.adj_list.get(current_id, []):
+                        self.in_degree[child] -= 1
+                        if self.in_degree[child] == 0:
+                            ready.append(child)
+
+        if failure:
+            raise Exception(failure)
+
+    def release_inputs(self, node_id):
+        """Drops parent results from data_store once their last consumer has run."""
+        for parent_id in self.parents.get(node_id, []):
+            self.pending_consumers[parent_id] -= 1
+            if self.pending_consumers[parent_id] <= 0:
+                self.data_store.pop(parent_id, None)
+                self.compacted.pop(parent_id, None)
+        if not self.pending_consumers.get(node_id):
+            self.data_store.pop(node_id, None)
+            self.compacted.pop(node_id, None)
+
+    def execute_node(self, node_id):
+        """Runs one node on a worker thread and returns (log lines, error message or None)."""
+        node = self.nodes[node_id]
+        if node_id in self.streamed:
+            return [], None
+        self.local.buffer = []
+        try:
+            self.log(f"Processing node: {node['data'].get('label', node['type'])}")
+            with self.measure(node_id) as metric:
+                metric['rows_in'] = sum(len(self.data_store[p]) for p in self.parents.get(node_id, []) if p in self.data_store)
+                self.process_node(node_id, node)
+                if node_id in self.data_store:
+                    metric['rows_out'] = len(self.data_store[node_id])
+            return self.local.buffer, None
+        except Exception as e:
+            error_msg = f"ERROR in {node['data'].get('label', 'Node')}: {str(e)}"
+            self.log(error_msg)
+            return self.local.buffer, error_msg
+        finally:
+            self.local.buffer = None
+
+    def can_stream(self):
+        """
+        Streaming is only possible when every node is row-wise, no node merges
+        several inputs and every source is a CSV/Parquet/Feather/JSON Lines file that can be read in chunks.
+        Anything else (joins, sorts, groups, charts, scripts...) needs the full frame.
+        """
+        if self.preview_mode or not self.streaming:
+            return False
+        for nid, node in self.nodes.items():
+            node_type = node['type']
+            if self.in_degree.get(nid, 0) > 1:
+                return False
+            if self.is_source(node_type):
+                path = self.resolve_read_path(node['data'])
+                if not path or file_format(path) not in CHUNKED_FORMATS:
+                    return False
+            elif node_type not in STREAMABLE_NODES and node_type not in STREAMING_DESTINATIONS:
+                return False
+        # Chunks are pushed recursively, so a cycle anywhere in the graph rules streaming out
+        return len(self.topological_order()) == len(self.nodes)
+
+    def topological_order(self):
+        in_degree = self.in_degree.copy()
+        queue = [nid for nid, count in in_degree.items() if count == 0]
+        order = []
         while queue:
             current_id = queue.pop(0)
-            if current_id not in self.nodes: continue
-            
-            node = self.nodes[current_id]
-            
+            order.append(current_id)
+            for child in self.adj_list.get(current_id, []):
+                in_degree[child] -= 1
+                if in_degree[child] == 0:
+                    queue.append(child)
+        return order
+
+    def run_streaming(self, sources):
+        self.log(f"Streaming mode: processing sources in chunks of {self.chunk_size} rows.")
+        self.stream_state = {nid: {'rows_in': 0, 'rows_out': 0, 'done': False} for nid in self.nodes}
+        try:
+            for source_id in sources:
+                if source_id not in self.nodes: continue
+                node = self.nodes[source_id]
+                self.log(f"Processing node: {node['data'].get('label', node['type'])}")
+                path = self.resolve_read_path(node['data'])
+                filename = os.path.basename(self.resolve_source_path(node['data']))
+                usecols = self.read_plans.get(source_id, {}).get('usecols')
+                reader = iter_chunks(path, self.chunk_size, usecols, self.chunk_dtypes(path))
+                self.node_metric(source_id)['bytes_read'] = os.path.getsize(path)
+                try:
+                    while True:
+                        try:
+                            with self.measure(source_id):
+                                chunk = next(reader, None)
+                        except Exception as e:
+                            error_msg = f"ERROR in {node['data'].get('label', 'Node')}: {str(e)}"
+                            self.log(error_msg)
+                            raise Exception(error_msg)
+                        if chunk is None:
+                            break
+                        self.stream_state[source_id]['rows_out'] += len(chunk)
+                        if not self.push_chunk(source_id, chunk):
+                            break
+                finally:
+                    reader.close()
+                self.log(f"Loaded {filename}: {self.stream_state[source_id]['rows_out']} rows (streamed)")
+
+            self.finish_streams(list(self.stream_state))
+        finally:
+            self.close_streams(list(self.stream_state))
+
+    def finish_streams(self, node_ids):
+        """Closes streamed destinations, records their outputs and logs a summary for every other node."""
+        for nid in node_ids:
+            node = self.nodes[nid]
+            state = self.stream_state[nid]
+            if self.is_source(node['type']): continue
+            writer = state.get('writer')
+            if writer:
+                writer.close()
+                if os.path.exists(writer.path):
+                    self.node_metric(nid)['bytes_written'] = os.path.getsize(writer.path)
+                    profile = writer.profile.result(writer.path) if writer.profile else None
+                    self.save_db_record(writer.name, self.DEST_FILE_TYPES[writer.type_key], writer.path, writer.schema, row_count=writer.rows, profile=profile)
+                    self.log(f"Saved output to {writer.name} ({writer.rows} rows streamed)")
+            else:
+                label = node['data'].get('label', node['type'])
+                self.log(f"Streamed {label}: {state['rows_in']} rows in, {state['rows_out']} rows out")
+
+    def close_streams(self, node_ids):
+        for nid in node_ids:
+            state = self.stream_state[nid]
+            if state.get('writer'): state['writer'].close()
+            if nid in self.metrics:
+                self.metrics[nid]['rows_in'] = state['rows_in']
+                self.metrics[nid]['rows_out'] = state['rows_out'] if not state.get('writer') else state['writer'].rows
+
+    def streamable_descendants(self, node_id):
+        """Every node below node_id, if all of them are single-input row-wise nodes or streaming destinations."""
+        found = []
+        to_visit = list(self.adj_list.get(node_id, []))
+        while to_visit:
+            nid = to_visit.pop()
+            if nid in found: continue
+            node_type = self.nodes[nid]['type']
+            if len(self.parents.get(nid, [])) != 1 or (node_type not in STREAMABLE_NODES and node_type not in STREAMING_DESTINATIONS):
+                return None
+            found.append(nid)
+            to_visit.extend(self.adj_list.get(nid, []))
+        return found or None
+
+    def stream_from(self, node_id, chunks, descendants, compacted=None):
+        """
+        Pushes an operator's output chunks straight through the row-wise nodes and destinations
+        below it (see push_chunk), so the full result is never assembled. The scheduler then
+        skips those nodes. compacted are the compacted columns the chunks still hold; they are
+        restored first. Returns the number of rows produced.
+        """
+        for nid in descendants:
+            self.stream_state[nid] = {'rows_in': 0, 'rows_out': 0, 'done': False}
+        rows = 0
+        try:
+            for chunk in chunks:
+                rows += len(chunk)
+                if not self.push_chunk(node_id, restore(chunk, compacted)): break
+            self.finish_streams(descendants)
+        finally:
+            chunks.close()
+            self.close_streams(descendants)
+        self.streamed.update(descendants)
+        return rows
+
+    def push_chunk(self, node_id, chunk):
+        """
+        Sends one chunk to every child of node_id.
+        Returns False once no downstream node wants more rows, so the source can stop reading.
+        """
+        wants_more = not self.adj_list.get(node_id)
+        for child_id in self.adj_list.get(node_id, []):
+            node = self.nodes[child_id]
+            state = self.stream_state[child_id]
+            if state['done']: continue
+            state['rows_in'] += len(chunk)
+
             try:
-                self.logs.append(f"Processing node: {node['data'].get('label', node['type'])}")
-                self.process_node(current_id, node)
+                # Each child gets its own shallow copy, same as get_parent_df in the in-memory path
+                with self.measure(child_id):
+                    out = self.apply_streaming_node(child_id, node, chunk.copy(deep=False), state)
             except Exception as e:
                 error_msg = f"ERROR in {node['data'].get('label', 'Node')}: {str(e)}"
-                self.logs.append(error_msg)
+                self.log(error_msg)
                 raise Exception(error_msg)
 
-            if current_id in self.adj_list:
-                for child in self.adj_list[current_id]:
-                    self.in_degree[child] -= 1
-                    if self.in_degree[child] == 0:
-                         queue.append(child)
-        
-        if self.processed_bytes > 0 and not self.preview_mode:
-            self.user.total_processed_bytes += self.processed_bytes
-            self.db.commit()
-            
-        self.logs.append("Pipeline execution completed successfully.")
-        return self.logs
+            if out is None:
+                wants_more = True
+                continue
+            state['rows_out'] += len(out)
+            child_wants_more = self.push_chunk(child_id, out)
+            if state['done']: continue
+            wants_more = wants_more or child_wants_more
+        return wants_more
+
+    def apply_streaming_node(self, node_id, node, chunk, state):
+        node_type = node['type']
+        data = node['data']
+
+        if node_type in STREAMING_DESTINATIONS:
+            if 'writer' not in state:
+                name = self.destination_name(node_type, data)
+                state['writer'] = StreamingDestination(node_type, name, os.path.join(self.processed_dir, name))
+            state['writer'].write(chunk)
+            return None
+
+        if node_type == 'trans_limit':
+            remaining = state.setdefault('remaining', int(data.get('limit', 100)))
+            chunk = chunk.head(remaining)
+            state['remaining'] -= len(chunk)
+            if state['remaining'] <= 0: state['done'] = True
+            return chunk
+
+        # Per-chunk log lines would drown the run log, so only the summary is kept
+        self.local.muted = True
+        try:
+            return self.apply_transform(node_type, chunk, data)
+        finally:
+            self.local.muted = False
 
     def run_preview(self, target_node_id):
         if target_node_id not in self.nodes:
@@ -96,29 +576,29 @@ class PipelineEngine:
             processed_visit.add(curr)
             ancestors.add(curr)
             
-            for src, targets in self.adj_list.items():
-                if curr in targets:
-                    if src not in ancestors:
-                        to_visit.append(src)
+            for src in self.parents.get(curr, []):
+                if src not in ancestors:
+                    to_visit.append(src)
 
-        local_in_degree = self.in_degree.copy()
-        queue = [nid for nid, count in local_in_degree.items() if count == 0]
-        
-        while queue:
-            current_id = queue.pop(0)
-            if current_id in ancestors:
-                if current_id in self.nodes:
-                    try:
-                        self.logs.append(f"Preview: Processing {self.nodes[current_id]['data'].get('label', current_id)}")
-                        self.process_node(current_id, self.nodes[current_id])
-                    except Exception as e:
-                        return {"error": str(e), "logs": self.logs}
-            
-            if current_id in self.adj_list:
-                for child in self.adj_list[current_id]:
-                     local_in_degree[child] -= 1
-                     if local_in_degree[child] == 0:
-                         queue.append(child)
+        self.plan_source_reads(stop_at=target_node_id)
+        order = [nid for nid in self.topological_order() if nid in ancestors]
+        to_run = set(ancestors)
+
+        if self.cache is not None:
+            keys = {}
+            for nid in order:
+                keys[nid] = self.cache_key(nid, keys)
+            to_run = self.load_cached_ancestors(target_node_id, keys)
+
+        for current_id in order:
+            if current_id not in to_run: continue
+            try:
+                self.log(f"Preview: Processing {self.nodes[current_id]['data'].get('label', current_id)}")
+                self.process_node(current_id, self.nodes[current_id])
+            except Exception as e:
+                return {"error": str(e), "logs": self.logs}
+            if self.cache is not None and current_id in self.data_store:
+                self.cache.put(keys[current_id], self.data_store[current_id])
 
         if target_node_id in self.data_store:
             df = self.data_store[target_node_id]
@@ -128,153 +608,701 @@ class PipelineEngine:
         else:
             return {"error": "Node produced no data. Check logs.", "logs": self.logs}
 
+    def cache_key(self, node_id, parent_keys):
+        """
+        Content hash of a node's output: its own config, the keys of its inputs and,
+        for sources, the file's mtime/size plus whatever the read plan folded into it.
+        """
+        node = self.nodes[node_id]
+        data = dict(node['data'])
+        payload = {'type': node['type'], 'preview': self.preview_mode, 'parents': [parent_keys.get(p) for p in self.parents.get(node_id, [])]}
+
+        if self.is_source(node['type']):
+            path = self.resolve_source_path(data)
+            if path:
+                stat = os.stat(path)
+                payload['file'] = [os.path.abspath(path), stat.st_mtime_ns, stat.st_size]
+            plan = self.read_plans.get(node_id)
+            if plan:
+                payload['pushdown'] = [[self.nodes[nid]['type'], self.nodes[nid]['data']] for nid in plan['chain']]
+        else:
+            # Labels are cosmetic everywhere except sources, where they can name the file
+            data.pop('label', None)
+        payload['data'] = data
+        return make_cache_key(payload)
+
+    def load_cached_ancestors(self, target_node_id, keys):
+        """
+        Walks up from the target and stops at every node whose output is cached.
+        Returns the set of nodes that still have to be computed.
+        """
+        to_run = set()
+        to_visit = [target_node_id]
+        while to_visit:
+            curr = to_visit.pop()
+            if curr in to_run or curr in self.data_store: continue
+            cached = self.cache.get(keys[curr])
+            if cached is not None:
+                self.data_store[curr] = cached
+                self.log(f"Preview: Using cached result for {self.nodes[curr]['data'].get('label', curr)}")
+                continue
+            to_run.add(curr)
+            to_visit.extend(self.parents.get(curr, []))
+        return to_run
+
     def get_parent_df(self, current_id):
-        for nid, neighbors in self.adj_list.items():
-            if current_id in neighbors:
-                parent_df = self.data_store.get(nid)
-                return parent_df.copy() if parent_df is not None else None
-        return None
+        """
+        A shallow copy of the first parent's result: the built-in transforms only replace whole
+        columns or build new frames, which never reaches the parent's buffers (trans_python, which
+        may write in place, takes a deep copy).
+        """
+        parents = self.parents.get(current_id)
+        if not parents:
+            return None
+        parent_df = self.data_store.get(parents[0])
+        return parent_df.copy(deep=False) if parent_df is not None else None
+
+    def input_compacted(self, node_id):
+        parents = self.parents.get(node_id)
+        return self.compacted.get(parents[0], {}) if parents else {}
+
+    def uncompact_input(self, node_id, node_type, data, df):
+        """
+        Compaction stays inside the engine: every column an operator looks at gets its loaded
+        values and dtype back first (see compaction.restore), so scripts, casts, filters and
+        destinations never see int8, float32, datetimes parsed from text or categories.
+        Returns the input and the compacted columns the operator's result still holds.
+        """
+        compacted = self.input_compacted(node_id)
+        if not compacted: return df, {}
+        if node_type in COMPACT_PASSTHROUGH_NODES:
+            return df, compacted
+        if node_type == 'trans_rename':
+            old, new = data.get('oldName'), data.get('newName')
+            if old not in df.columns: return df, compacted
+            carried = {c: spec for c, spec in compacted.items() if c not in (old, new)}
+            if old in compacted: carried[new] = compacted[old]
+            return df, carried
+        if node_type in ('filterNode', 'trans_sort'):
+            return restore(df, compacted, [data.get('column')]), compacted
+        if node_type == 'trans_group':
+            return restore(df, compacted, [data.get('groupCol'), data.get('targetCol')]), {}
+        return restore(df, compacted), {}
+
+    def joined_compacted(self, parent_ids, keys, columns):
+        """Compacted non-key columns of both join inputs, under the names pd.merge gives them."""
+        overlap = (set(columns[0]) & set(columns[1])) - set(keys)
+        carried = {}
+        for pid, cols, suffix in zip(parent_ids, columns, ('_x', '_y')):
+            for col, spec in self.compacted.get(pid, {}).items():
+                if col in keys or col not in cols: continue
+                carried[col + suffix if col in overlap else col] = spec
+        return carried
 
     def get_join_parents(self, current_id):
         parents = []
-        for nid, neighbors in self.adj_list.items():
-            if current_id in neighbors:
-                parent_df = self.data_store.get(nid)
-                if parent_df is not None:
-                    parents.append(parent_df.copy())
-                else:
-                    parents.append(None)
+        for nid in self.parents.get(current_id, []):
+            parent_df = self.data_store.get(nid)
+            parents.append(parent_df.copy(deep=False) if parent_df is not None else None)
         return parents
 
+    def plan_source_reads(self, stop_at=None):
+        """
+        Planning pass run before execution. For every CSV/Excel/Parquet/Feather source, the
+        linear run of select / filter / limit nodes directly below it is folded into the read
+        itself: the columns they need become usecols, a leading limit becomes nrows and filters
+        are applied chunk by chunk while reading (or to Parquet row groups). The folded nodes
+        then just pass the source's result through.
+        """
+        self.read_plans = {}
+        self.absorbed = {}
+        for source_id, node in self.nodes.items():
+            if not self.is_source(node['type']): continue
+            path = self.resolve_read_path(node['data'])
+            if not path or file_format(path) not in ('csv', 'excel', 'parquet', 'feather'): continue
+
+            chain = []
+            current = source_id
+            while current != stop_at:
+                children = set(self.adj_list.get(current, []))
+                if len(children) != 1: break
+                child = children.pop()
+                if self.nodes[child]['type'] not in PUSHDOWN_NODES or len(self.parents[child]) != 1: break
+                chain.append(child)
+                current = child
+            if not chain: continue
+
+            try:
+                plan = self.build_read_plan(path, chain)
+            except Exception:
+                # Unreadable header: leave it to the normal read to report the error
+                continue
+            self.read_plans[source_id] = plan
+            for nid in chain:
+                self.absorbed[nid] = source_id
+
+    def build_read_plan(self, path, chain):
+        header = read_header(path)
+
+        selected, filter_cols, nrows, filtered = None, set(), None, False
+        # Predicates a columnar reader may evaluate itself: only those ahead of any limit
+        filters, limited = [], False
+        for nid in chain:
+            data = self.nodes[nid]['data']
+            node_type = self.nodes[nid]['type']
+            if node_type == 'filterNode':
+                filtered = True
+                col, op = data.get('column'), data.get('condition', '>')
+                # Filters after the first select only ever see selected columns
+                if selected is None: filter_cols.add(col)
+                if not limited and col in header and (selected is None or col in selected) and op in ARROW_FILTER_OPS:
+                    filters.append((col, op if op != '==' else '=', safe_convert(data.get('value'))))
+            elif node_type == 'trans_select' and selected is None:
+                cols = [c.strip() for c in data.get('columns', '').split(',') if c.strip() in header]
+                if cols: selected = cols
+            elif node_type == 'trans_limit':
+                limited = True
+                if nrows is None and not filtered:
+                    nrows = int(data.get('limit', 100))
+
+        usecols = None
+        if selected is not None:
+            needed = set(selected) | filter_cols
+            usecols = [c for c in header if c in needed]
+        return {'chain': chain, 'usecols': usecols, 'nrows': nrows, 'filtered': filtered, 'filters': filters}
+
+    def read_planned_source(self, path, plan):
+        """Reads a source with its pushdown plan applied and returns the chain's final frame."""
+        nrows = plan['nrows']
+        if self.preview_mode:
+            nrows = min(nrows, 50) if nrows is not None else 50
+        kwargs = {'usecols': plan['usecols'], 'nrows': nrows}
+        fmt = file_format(path)
+        if fmt == 'csv': kwargs['dtype'] = self.csv_dtypes(path)
+
+        if fmt in ('parquet', 'feather'):
+            # Preview keeps "first rows, then filter" semantics, so filters are only pushed on full runs
+            filters = plan['filters'] if not self.preview_mode and fmt == 'parquet' else None
+            df = read_columnar(path, columns=plan['usecols'], filters=filters, nrows=nrows)
+            return self.apply_chain(df, plan, {})
+        if fmt == 'excel':
+            return self.apply_chain(pd.read_excel(path, **kwargs), plan, {})
+
+        if not plan['filtered'] or self.preview_mode:
+            return self.apply_chain(read_csv_file(path, **kwargs), plan, {})
+
+        # Filters are evaluated per chunk so rejected rows are never accumulated
+        state = {}
+        chunks = []
+        with pd.read_csv(path, chunksize=self.chunk_size, **kwargs) as reader:
+            for chunk in reader:
+                chunks.append(self.apply_chain(chunk, plan, state))
+                if state.get('exhausted'): break
+        return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0].reset_index(drop=True)
+
+    def apply_chain(self, df, plan, state):
+        self.local.muted = True
+        try:
+            for nid in plan['chain']:
+                node = self.nodes[nid]
+                if node['type'] == 'trans_limit':
+                    remaining = state.setdefault(nid, int(node['data'].get('limit', 100)))
+                    df = df.head(remaining)
+                    state[nid] = remaining - len(df)
+                    if state[nid] <= 0: state['exhausted'] = True
+                else:
+                    df = self.apply_transform(node['type'], df, node['data'])
+            return df
+        finally:
+            self.local.muted = False
+
+    def plan_spill_joins(self):
+        """
+        A source that feeds nothing but a join is left unread when its estimated in-memory
+        size would push the join over the memory budget; the join then partitions it
+        straight from disk in chunks (see process_spill_join).
+        """
+        self.spill_joins = {}
+        self.deferred_sources = {}
+        for nid, node in self.nodes.items():
+            if node['type'] != 'trans_join' or len(self.parents.get(nid, [])) != 2: continue
+            deferrable, estimate = [], 0
+            for pid in self.parents[nid]:
+                pnode = self.nodes[pid]
+                path = self.resolve_read_path(pnode['data']) if self.is_source(pnode['type']) else None
+                fmt = file_format(path) if path else None
+                if fmt in CHUNKED_FORMATS and pid not in self.read_plans and set(self.adj_list[pid]) == {nid}:
+                    deferrable.append(pid)
+                    estimate += self.source_bytes(pid, path)
+            if deferrable and estimate * JOIN_EXPANSION > self.memory_budget:
+                self.spill_joins[nid] = deferrable
+                for pid in deferrable:
+                    self.deferred_sources[pid] = nid
+
+    def plan_partial_aggregations(self):
+        """
+        A trans_group whose input is a single chain of row-wise nodes (no limit) hanging off a
+        CSV/Parquet/Feather/JSON Lines source, with nothing else consuming that chain, never needs
+        the full frame: it reads the source in chunks, runs the chain on each chunk and keeps only
+        per-group partial results. The source and chain nodes are folded into the group node.
+        """
+        self.partial_groups = {}
+        for nid, node in self.nodes.items():
+            if node['type'] != 'trans_group' or node['data'].get('operation', 'sum') not in PARTIAL_GROUP_OPS: continue
+            plan = self.chunked_input_chain(nid)
+            if plan:
+                self.partial_groups[nid] = plan
+                self.fold(nid, plan)
+
+    def chunked_input_chain(self, node_id):
+        """
+        {'source', 'chain'} when node_id's input is a chunkable source (see CHUNKED_FORMATS) followed by a
+        single chain of row-wise nodes (no limit) that nothing else consumes, else None.
+        """
+        chain, current = [], node_id
+        while len(self.parents.get(current, [])) == 1:
+            parent = self.parents[current][0]
+            if set(self.adj_list[parent]) != {current} or parent in self.folded_into: return None
+            parent_type = self.nodes[parent]['type']
+            if self.is_source(parent_type):
+                path = self.resolve_read_path(self.nodes[parent]['data'])
+                if path and file_format(path) in CHUNKED_FORMATS and parent not in self.deferred_sources:
+                    return {'source': parent, 'chain': chain[::-1]}
+                return None
+            # A limit keeps the first rows overall, which per-chunk evaluation can't reproduce
+            if parent_type not in STREAMABLE_NODES or parent_type == 'trans_limit': return None
+            chain.append(parent)
+            current = parent
+        return None
+
+    def fold_kind(self, node_id):
+        """What a node that folded its input chain does with it, for the log."""
+        if node_id in self.partial_groups: return 'chunked aggregation'
+        return 'chunked top-k sort' if self.sort_plans[node_id]['limit'] is not None else 'external sort'
+
+    def fold(self, node_id, plan):
+        for nid in [plan['source']] + plan['chain']:
+            self.folded_into[nid] = node_id
+
+    def folded_chunks(self, plan):
+        """Reads a folded source in chunks and runs the folded chain over each chunk."""
+        source = self.nodes[plan['source']]
+        path = self.resolve_read_path(source['data'])
+        if not path:
+            raise FileNotFoundError(f"File {source['data'].get('filename') or source['data'].get('label')} not found in uploads or processed directories")
+        self.count_io('bytes_read', os.path.getsize(path))
+        # Columns a select pushed into this source's read are still worth skipping
+        usecols = self.read_plans.get(plan['source'], {}).get('usecols')
+        empty = True
+        for chunk in iter_chunks(path, self.chunk_size, usecols, self.chunk_dtypes(path)):
+            empty = False
+            self.count_io('rows_in', len(chunk))
+            yield self.apply_folded_chain(plan, chunk)
+        if empty:
+            # No rows at all: one empty chunk still tells consumers the columns, as frame_chunks does
+            header = [c for c in read_header(path) if usecols is None or c in usecols]
+            yield self.apply_folded_chain(plan, pd.DataFrame(columns=header))
+
+    def apply_folded_chain(self, plan, chunk):
+        self.local.muted = True
+        try:
+            for nid in plan['chain']:
+                # Each node gets its own shallow copy, as push_chunk gives streamed nodes: a filter
+                # returns a slice that the next node's column assignments must not write through
+                chunk = self.apply_transform(self.nodes[nid]['type'], chunk.copy(deep=False), self.nodes[nid]['data'])
+            return chunk
+        finally:
+            self.local.muted = False
+
+    def process_partial_group(self, node_id, data):
+        """
+        Chunked group-by: chunks are transformed and aggregated on a thread pool (pandas releases
+        the GIL for most of the groupby work) while the next chunk is read, and the partial
+        results are merged at the end. Memory grows with the number of groups, not rows.
+        """
+        plan = self.partial_groups[node_id]
+        g_col, t_col, op = data.get('groupCol'), data.get('targetCol'), data.get('operation', 'sum')
+        # The pool transforms the chunks, so the reader only parses them
+        chunks = self.folded_chunks({'source': plan['source'], 'chain': []})
+
+        def aggregate(chunk):
+            grouped = self.apply_folded_chain(plan, chunk).groupby(g_col)[t_col]
+            if op == 'mean':
+                return pd.DataFrame({'sum': grouped.sum(), 'count': grouped.count()})
+            return getattr(grouped, op)()
+
+        first = next(chunks, None)
+        if first is None:
+            return pd.DataFrame(columns=[g_col, t_col])
+        head = self.apply_folded_chain(plan, first)
+        if g_col not in head.columns or t_col not in head.columns:
+            # Same pass-through as process_group when the columns don't exist
+            return pd.concat([head] + [self.apply_folded_chain(plan, chunk) for chunk in chunks], ignore_index=True)
+
+        partials, pending, rows = [], deque(), len(first)
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='pipeline-group') as pool:
+            pending.append(pool.submit(aggregate, first))
+            for chunk in chunks:
+                rows += len(chunk)
+                pending.append(pool.submit(aggregate, chunk))
+                # Bounded read-ahead; partials stay in chunk order so string sums concatenate correctly
+                while len(pending) > self.max_workers * 2:
+                    partials.append(pending.popleft().result())
+            while pending:
+                partials.append(pending.popleft().result())
+
+        combined = pd.concat(partials)
+        if op == 'mean':
+            totals = combined.groupby(level=0).sum()
+            result = totals['sum'] / totals['count']
+        elif op in ('sum', 'count'):
+            result = combined.groupby(level=0).sum()
+        else:
+            result = getattr(combined.groupby(level=0), op)()
+        df = result.rename(t_col).rename_axis(g_col).reset_index()
+        self.log(f"Grouped by {g_col} ({op}) over {len(partials)} chunks of {rows} rows: {len(df)} groups")
+        return df
+
+    def plan_sorts(self):
+        """
+        Sort nodes get a cheaper plan in two cases:
+        - the only consumer is a limit: keep just the top k rows instead of sorting everything
+          (chunk by chunk when the input can be folded, see chunked_input_chain);
+        - the input is a foldable source estimated over the memory budget: external merge sort.
+        """
+        self.sort_plans = {}
+        for nid, node in self.nodes.items():
+            if node['type'] != 'trans_sort': continue
+            limit = None
+            children = set(self.adj_list.get(nid, []))
+            if len(children) == 1:
+                child = children.pop()
+                if self.nodes[child]['type'] == 'trans_limit' and len(self.parents[child]) == 1:
+                    try: limit = int(self.nodes[child]['data'].get('limit', 100))
+                    except (TypeError, ValueError): pass
+
+            folded = self.chunked_input_chain(nid)
+            if folded and limit is None:
+                path = self.resolve_read_path(self.nodes[folded['source']]['data'])
+                if self.source_bytes(folded['source'], path) <= self.memory_budget: folded = None
+            if limit is None and not folded: continue
+
+            self.sort_plans[nid] = dict(folded or {'source': None, 'chain': []}, limit=limit)
+            if folded: self.fold(nid, folded)
+
+    def process_planned_sort(self, node_id, data):
+        """
+        Top-k or external sort (see plan_sorts). Returns the sorted frame, or None when an
+        external sort streamed its output directly into the nodes below it.
+        """
+        plan = self.sort_plans[node_id]
+        column, ascending = data.get('column'), data.get('order') == 'true'
+        k = plan['limit']
+
+        if plan['source'] is None:
+            df = self.get_parent_df(node_id)
+            if df is None: return None
+            top = top_k(restore(df, self.input_compacted(node_id), [column]), column, k, ascending)
+        elif k is not None:
+            top = None
+            for chunk in self.folded_chunks(plan):
+                candidate = top_k(chunk, column, k, ascending)
+                # Earlier rows first, so ties resolve the way a stable full sort would
+                top = candidate if top is None else top_k(pd.concat([top, candidate], ignore_index=True), column, k, ascending)
+        else:
+            return self.external_sort(node_id, self.folded_chunks(plan), column, ascending)
+
+        self.log(f"Sorted by {column} (top {k} rows only, for the limit below)")
+        return top
+
+    def external_sort(self, node_id, chunks, column, ascending, compacted=None):
+        sorted_chunks = external_sort(chunks, column, ascending, self.memory_budget // 4, log=self.log)
+        descendants = self.streamable_descendants(node_id)
+        if descendants:
+            rows = self.stream_from(node_id, sorted_chunks, descendants, compacted)
+            self.count_io('rows_out', rows)
+            self.log(f"Sorted by {column}: {rows} rows streamed downstream")
+            return None
+        parts = list(sorted_chunks)
+        self.log(f"Sorted by {column}")
+        return pd.concat(parts) if parts else pd.DataFrame()
+
+    def join_exceeds_budget(self, node_id):
+        inputs = [self.data_store.get(pid) for pid in self.parents.get(node_id, [])]
+        return sum(estimate_frame_bytes(df) for df in inputs if df is not None) * JOIN_EXPANSION > self.memory_budget
+
+    def join_input(self, parent_id, keys):
+        """One join input as (chunk iterator, column names, estimated in-memory bytes), with its key columns restored."""
+        if parent_id in self.deferred_sources:
+            path = self.resolve_read_path(self.nodes[parent_id]['data'])
+            self.count_io('bytes_read', os.path.getsize(path))
+            return self.counted_chunks(iter_chunks(path, self.chunk_size, dtype=self.chunk_dtypes(path))), read_header(path), self.source_bytes(parent_id, path)
+        df = self.data_store.get(parent_id)
+        if df is None:
+            raise ValueError("Join node requires 2 valid inputs.")
+        df = restore(df, self.compacted.get(parent_id), keys)
+        return frame_chunks(df, self.chunk_size), list(df.columns), estimate_frame_bytes(df)
+
+    def counted_chunks(self, chunks):
+        for chunk in chunks:
+            self.count_io('rows_in', len(chunk))
+            yield chunk
+
+    def process_spill_join(self, node_id, data):
+        """
+        Hash-partitioned join for inputs larger than the memory budget. Returns the joined frame
+        (None when the result was streamed directly into the nodes below the join) and its
+        compacted columns.
+        """
+        if len(self.parents.get(node_id, [])) < 2:
+            raise ValueError("Join node requires 2 valid inputs.")
+        keys, how = join_keys(data), data.get('how', 'inner')
+        parent_ids = self.parents[node_id][:2]
+        (left_chunks, left_cols, left_bytes), (right_chunks, right_cols, right_bytes) = [self.join_input(pid, keys) for pid in parent_ids]
+        if not keys or any(k not in left_cols or k not in right_cols for k in keys):
+            raise ValueError(f"Join key '{data.get('key')}' not found in one of the inputs. Columns available: {left_cols} | {right_cols}")
+
+        n_buckets = bucket_count(left_bytes + right_bytes, self.memory_budget)
+        self.log(f"Join inputs estimated at {(left_bytes + right_bytes) / 2**20:.0f} MB, over the {self.memory_budget / 2**20:.0f} MB budget: "
+                 f"hash-partitioning into {n_buckets} buckets on disk")
+        chunks = hash_join(left_chunks, right_chunks, keys, how, n_buckets, self.memory_budget, log=self.log)
+        compacted = self.joined_compacted(parent_ids, keys, (left_cols, right_cols))
+
+        descendants = self.streamable_descendants(node_id)
+        if descendants:
+            rows = self.stream_from(node_id, chunks, descendants, compacted)
+            self.count_io('rows_out', rows)
+            self.log(f"Joined datasets on {', '.join(keys)} ({how}): {rows} rows streamed downstream")
+            return None, None
+
+        parts = list(chunks)
+        res = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=list(dict.fromkeys(left_cols + right_cols)))
+        self.log(f"Joined datasets on {', '.join(keys)} ({how}): {len(res)} rows")
+        return res, compacted
+
+    def is_source(self, node_type):
+        return node_type == 'sourceNode' or node_type.startswith('source_')
+
+    def resolve_read_path(self, data):
+        """File actually parsed for a source: its columnar sidecar when fresh, otherwise the raw file."""
+        path = self.resolve_source_path(data)
+        return (fresh_sidecar(path) or path) if path else None
+
+    def resolve_source_path(self, data):
+        filename = data.get('filename')
+        if not filename: 
+            filename = data.get('label')
+            if not filename or '.' not in filename:
+                return None
+        
+        # Check uploads directory first
+        path = os.path.join(self.uploads_dir, filename)
+        
+        # If not found, check processed directory (for outputs used as inputs)
+        if not os.path.exists(path):
+            path = os.path.join(self.processed_dir, filename)
+
+        return path if os.path.exists(path) else None
+
     def process_node(self, node_id, node):
         node_type = node['type']
         data = node['data']
         df = None
+        compacted = {}
+
+        if node_id in self.folded_into:
+            owner = self.nodes[self.folded_into[node_id]]
+            self.log(f"{data.get('label', node_type)} folded into the {self.fold_kind(self.folded_into[node_id])} of {owner['data'].get('label', owner['type'])}")
+            return
 
-        if node_type == 'sourceNode' or node_type.startswith('source_'):
+        if self.is_source(node_type):
             filename = data.get('filename')
             if not filename: 
                 filename = data.get('label')
                 if not filename or '.' not in filename:
                     raise ValueError("No file selected")
-            
-            # Check uploads directory first
-            path = os.path.join(self.uploads_dir, filename)
-            
-            # If not found, check processed directory (for outputs used as inputs)
-            if not os.path.exists(path):
-                path = os.path.join(self.processed_dir, filename)
 
-            if not os.path.exists(path):
+            path = self.resolve_source_path(data)
+            if not path:
                 raise FileNotFoundError(f"File {filename} not found in uploads or processed directories")
             
+            if node_id in self.deferred_sources:
+                join_label = self.nodes[self.deferred_sources[node_id]]['data'].get('label', 'Join')
+                self.log(f"Deferred {filename}: {join_label} reads it in chunks from disk")
+                return
+
             nrows_arg = 50 if self.preview_mode else None
+            plan = self.read_plans.get(node_id)
+            # Uploads carry a typed Parquet sidecar; use it instead of reparsing the text/Excel file
+            read_path = fresh_sidecar(path) or path
+            fmt = file_format(read_path)
+            self.count_io('bytes_read', os.path.getsize(read_path))
             
-            if filename.lower().endswith('.csv'): 
-                df = pd.read_csv(path, nrows=nrows_arg)
-            elif filename.lower().endswith('.json'): 
-                df = pd.read_json(path)
-                if self.preview_mode: df = df.head(50)
-            elif filename.lower().endswith(('.xls', '.xlsx')): 
-                df = pd.read_excel(path, nrows=nrows_arg)
+            if plan:
+                df = self.read_planned_source(read_path, plan)
+                labels = ', '.join(self.nodes[nid]['data'].get('label', self.nodes[nid]['type']) for nid in plan['chain'])
+                self.log(f"Pushed {labels} into read of {filename}" + (f" ({len(plan['usecols'])} columns)" if plan['usecols'] else ""))
+            elif fmt == 'csv': 
+                dtype = self.csv_dtypes(read_path)
+                df = read_csv_file(read_path, nrows=nrows_arg, dtype=dtype)
+                if dtype is None and not self.preview_mode:
+                    self.pending_schemas.append((read_path, {c: str(t) if str(t) in CSV_DTYPES else 'object' for c, t in df.dtypes.items()}, len(df)))
+            elif fmt == 'json': 
+                df = read_json_file(read_path, nrows=nrows_arg)
+            elif fmt == 'jsonl':
+                # Preview reads only the first lines, however large the file
+                df = read_json_file(read_path, lines=True, nrows=nrows_arg)
+            elif fmt == 'excel': 
+                df = pd.read_excel(read_path, nrows=nrows_arg)
+            elif fmt in ('parquet', 'feather'):
+                df = read_columnar(read_path, nrows=nrows_arg)
             
             if df is not None:
-                self.logs.append(f"Loaded {filename}: {len(df)} rows {'(Preview)' if self.preview_mode else ''}")
+                notes = ' '.join(n for n in ('(Preview)' if self.preview_mode else '', '(columnar cache)' if read_path != path else '') if n)
+                self.log(f"Loaded {filename}: {len(df)} rows {notes}")
+                # A full parse of a file whose sidecar went stale refreshes the sidecar for the next run
+                if read_path == path and not plan and not self.preview_mode and os.path.exists(sidecar_path(path)):
+                    write_sidecar(path, df, self.csv_dtypes(path))
+                if COMPACT_DTYPES and not self.preview_mode:
+                    df, compacted = self.compact_source(df, filename)
+
+        elif node_id in self.absorbed:
+            df = self.get_parent_df(node_id)
+            if df is None:
+                self.log(f"Skipping {node_type}: No input data found.")
+                return
+            compacted = self.input_compacted(node_id)
+            self.log(f"{data.get('label', node_type)} applied during source read")
 
         else:
-            if node_type == 'trans_join':
+            if node_type == 'trans_join' and (node_id in self.spill_joins or self.join_exceeds_budget(node_id)):
+                df, compacted = self.process_spill_join(node_id, data)
+                if df is None: return
+            elif node_type == 'trans_group' and node_id in self.partial_groups:
+                df = self.process_partial_group(node_id, data)
+            elif node_type == 'trans_sort' and node_id in self.sort_plans:
+                df = self.process_planned_sort(node_id, data)
+                if df is None: return
+                compacted = self.input_compacted(node_id)
+            elif node_type == 'trans_join':
                 dfs = self.get_join_parents(node_id)
                 if len(dfs) < 2 or any(d is None for d in dfs): 
                      raise ValueError("Join node requires 2 valid inputs.")
+                parent_ids, keys = self.parents[node_id][:2], join_keys(data)
+                compacted = self.joined_compacted(parent_ids, keys, [d.columns for d in dfs])
+                dfs = [restore(d, self.compacted.get(pid), keys) for d, pid in zip(dfs, parent_ids)]
                 df = self.process_join(dfs[0], dfs[1], data)
             else:
                 df = self.get_parent_df(node_id)
                 if df is None: 
-                    self.logs.append(f"Skipping {node_type}: No input data found.")
+                    self.log(f"Skipping {node_type}: No input data found.")
                     return 
+                df, compacted = self.uncompact_input(node_id, node_type, data, df)
 
-                if node_type == 'filterNode':
-                    df = self.process_filter(df, data)
-                elif node_type == 'trans_sort':
-                    df = df.sort_values(by=data.get('column'), ascending=data.get('order') == 'true')
-                    self.logs.append(f"Sorted by {data.get('column')}")
-                elif node_type == 'trans_limit':
-                    limit = int(data.get('limit', 100))
-                    df = df.head(limit)
-                    self.logs.append(f"Limited to {limit} rows")
-                elif node_type == 'trans_select':
-                    cols = [c.strip() for c in data.get('columns', '').split(',') if c.strip() in df.columns]
-                    if cols: df = df[cols]
-                elif node_type == 'trans_rename':
-                    old, new = data.get('oldName'), data.get('newName')
-                    if old in df.columns: df = df.rename(columns={old: new})
-                elif node_type == 'trans_dedupe':
-                    before = len(df)
-                    df = df.drop_duplicates()
-                    self.logs.append(f"Removed {before - len(df)} duplicates")
-                elif node_type == 'trans_fillna':
-                    col = data.get('column')
-                    val = safe_convert(data.get('value'))
-                    if col and col in df.columns: df[col] = df[col].fillna(val)
-                    else: df = df.fillna(val)
-                elif node_type == 'trans_group':
-                    df = self.process_group(df, data)
-                elif node_type == 'trans_calc':
-                    df = self.process_calc(df, data)
-                elif node_type == 'trans_cast':
-                    col = data.get('column')
-                    tgt = data.get('targetType', 'string')
-                    if col in df.columns:
-                        if tgt == 'int': df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype(int)
-                        elif tgt == 'float': df[col] = pd.to_numeric(df[col], errors='coerce')
-                        elif tgt == 'string': df[col] = df[col].astype(str)
-                        elif tgt == 'date': df[col] = pd.to_datetime(df[col], errors='coerce')
-                        self.logs.append(f"Casted {col} to {tgt}")
-                elif node_type == 'trans_string':
-                    col = data.get('column')
-                    op = data.get('operation', 'upper')
-                    if col in df.columns:
-                        if op == 'upper': df[col] = df[col].astype(str).str.upper()
-                        elif op == 'lower': df[col] = df[col].astype(str).str.lower()
-                        elif op == 'strip': df[col] = df[col].astype(str).str.strip()
-                        elif op == 'title': df[col] = df[col].astype(str).str.title()
-                        self.logs.append(f"String op {op} on {col}")
-                elif node_type == 'trans_constant':
-                    col = data.get('colName')
-                    val = safe_convert(data.get('value'))
-                    if col:
-                        df[col] = val
-                        self.logs.append(f"Added constant col {col}")
-                elif node_type == 'trans_python':
-                    code = data.get('code', '')
-                    if code:
-                        try:
-                            local_scope = {
-                                'df': df, 
-                                'pd': pd, 
-                                'np': np,
-                                'math': __import__('math'),
-                                'datetime': __import__('datetime')
-                            }
-                            exec(code, {}, local_scope)
-                            if 'df' in local_scope and isinstance(local_scope['df'], pd.DataFrame):
-                                df = local_scope['df']
-                                self.logs.append(f"Executed custom Python script")
-                            else:
-                                raise ValueError("Python script must maintain a 'df' pandas DataFrame variable.")
-                        except Exception as e:
-                            raise ValueError(f"Python Script Execution Error: {str(e)}")
-
-                elif node_type == 'vis_chart':
+                if node_type == 'vis_chart':
                     if not self.preview_mode:
                         self.generate_chart(df, data)
                 elif node_type.startswith('dest_'):
                     if not self.preview_mode:
                         self.save_destination(df, node_type, data)
                     return 
+                elif node_type == 'trans_sort' and estimate_frame_bytes(df) * 2 > self.memory_budget and self.streamable_descendants(node_id):
+                    # sort_values would hold a second full copy; merge spilled runs into the nodes below instead
+                    self.external_sort(node_id, frame_chunks(df, self.chunk_size), data.get('column'), data.get('order') == 'true', compacted)
+                    return
+                else:
+                    df = self.apply_transform(node_type, df, data)
 
         if df is not None:
             self.data_store[node_id] = df
+            if compacted: self.compacted[node_id] = compacted
+
+    def compact_source(self, df, filename):
+        """The loaded frame with smaller dtypes, and its compacted columns (see uncompact_input)."""
+        before = estimate_frame_bytes(df)
+        df, changes, compacted = compact_frame(df)
+        if any(changes.values()):
+            after = estimate_frame_bytes(df)
+            details = ', '.join(f"{n} {kind}" for kind, n in changes.items() if n)
+            self.log(f"Compacted {filename}: {get_size_format(before)} -> {get_size_format(after)} in memory ({details})")
+        return df, compacted
+
+    def apply_transform(self, node_type, df, data):
+        """Applies a single-input transformation node and returns the resulting frame."""
+        if node_type == 'filterNode':
+            df = self.process_filter(df, data)
+        elif node_type == 'trans_sort':
+            # Stable, like the external and top-k sorts: equal keys keep their input order on every path
+            df = df.sort_values(by=data.get('column'), ascending=data.get('order') == 'true', kind='stable')
+            self.log(f"Sorted by {data.get('column')}")
+        elif node_type == 'trans_limit':
+            limit = int(data.get('limit', 100))
+            df = df.head(limit)
+            self.log(f"Limited to {limit} rows")
+        elif node_type == 'trans_select':
+            cols = [c.strip() for c in data.get('columns', '').split(',') if c.strip() in df.columns]
+            if cols: df = df[cols]
+        elif node_type == 'trans_rename':
+            old, new = data.get('oldName'), data.get('newName')
+            if old in df.columns: df = df.rename(columns={old: new})
+        elif node_type == 'trans_dedupe':
+            before = len(df)
+            df = df.drop_duplicates()
+            self.log(f"Removed {before - len(df)} duplicates")
+        elif node_type == 'trans_fillna':
+            col = data.get('column')
+            val = safe_convert(data.get('value'))
+            if col and col in df.columns: df[col] = df[col].fillna(val)
+            else: df = df.fillna(val)
+        elif node_type == 'trans_group':
+            df = self.process_group(df, data)
+        elif node_type == 'trans_calc':
+            df = self.process_calc(df, data)
+        elif node_type == 'trans_cast':
+            col = data.get('column')
+            tgt = data.get('targetType', 'string')
+            if col in df.columns:
+                if tgt == 'int': df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype(int)
+                elif tgt == 'float': df[col] = pd.to_numeric(df[col], errors='coerce')
+                elif tgt == 'string': df[col] = df[col].astype(str)
+                elif tgt == 'date': df[col] = pd.to_datetime(df[col], errors='coerce')
+                self.log(f"Casted {col} to {tgt}")
+        elif node_type == 'trans_string':
+            col = data.get('column')
+            op = data.get('operation', 'upper')
+            if col in df.columns:
+                if op == 'upper': df[col] = df[col].astype(str).str.upper()
+                elif op == 'lower': df[col] = df[col].astype(str).str.lower()
+                elif op == 'strip': df[col] = df[col].astype(str).str.strip()
+                elif op == 'title': df[col] = df[col].astype(str).str.title()
+                self.log(f"String op {op} on {col}")
+        elif node_type == 'trans_constant':
+            col = data.get('colName')
+            val = safe_convert(data.get('value'))
+            if col:
+                df[col] = val
+                self.log(f"Added constant col {col}")
+        elif node_type == 'trans_python':
+            code = data.get('code', '')
+            if code:
+                try:
+                    # Scripts may write in place (df.loc[...] = ...), which would reach the parent's frame
+                    local_scope = {
+                        'df': df.copy(), 
+                        'pd': pd, 
+                        'np': np,
+                        'math': __import__('math'),
+                        'datetime': __import__('datetime')
+                    }
+                    exec(code, {}, local_scope)
+                    if 'df' in local_scope and isinstance(local_scope['df'], pd.DataFrame):
+                        df = local_scope['df']
+                        self.log(f"Executed custom Python script")
+                    else:
+                        raise ValueError("Python script must maintain a 'df' pandas DataFrame variable.")
+                except Exception as e:
+                    raise ValueError(f"Python Script Execution Error: {str(e)}")
+        return df
 
     def process_filter(self, df, data):
         col, op, val = data.get('column'), data.get('condition', '>'), safe_convert(data.get('value'))
@@ -283,18 +1311,18 @@ class PipelineEngine:
             elif op == '<': df = df[df[col] < val]
             elif op == '==': df = df[df[col] == val]
             elif op == '!=': df = df[df[col] != val]
-            self.logs.append(f"Filtered {col} {op} {val}: {len(df)} rows remaining")
+            self.log(f"Filtered {col} {op} {val}: {len(df)} rows remaining")
         return df
 
     def process_join(self, df1, df2, data):
-        key = data.get('key')
+        keys = join_keys(data)
         how = data.get('how', 'inner')
-        if key in df1.columns and key in df2.columns:
-            res = pd.merge(df1, df2, on=key, how=how)
-            self.logs.append(f"Joined datasets on {key} ({how}): {len(res)} rows")
+        if keys and all(k in df1.columns and k in df2.columns for k in keys):
+            res = pd.merge(df1, df2, on=keys, how=how)
+            self.log(f"Joined datasets on {', '.join(keys)} ({how}): {len(res)} rows")
             return res
         else:
-            raise ValueError(f"Join key '{key}' not found in one of the inputs. Columns available: {list(df1.columns)} | {list(df2.columns)}")
+            raise ValueError(f"Join key '{data.get('key')}' not found in one of the inputs. Columns available: {list(df1.columns)} | {list(df2.columns)}")
 
     def process_group(self, df, data):
         g_col, t_col, op = data.get('groupCol'), data.get('targetCol'), data.get('operation', 'sum')
@@ -305,7 +1333,7 @@ class PipelineEngine:
             elif op == 'count': df = grouped.count().reset_index()
             elif op == 'max': df = grouped.max().reset_index()
             elif op == 'min': df = grouped.min().reset_index()
-            self.logs.append(f"Grouped by {g_col}")
+            self.log(f"Grouped by {g_col}")
         return df
 
     def process_calc(self, df, data):
@@ -317,7 +1345,7 @@ class PipelineEngine:
             elif op == '-': df[newC] = vA - vB
             elif op == '*': df[newC] = vA * vB
             elif op == '/': df[newC] = vA / vB
-            self.logs.append(f"Calculated {newC}")
+            self.log(f"Calculated {newC}")
         return df
 
     def generate_chart(self, df, data):
@@ -325,75 +1353,101 @@ class PipelineEngine:
         if not output_name.endswith('.png'): output_name += '.png'
         save_path = os.path.join(self.processed_dir, output_name)
         
-        plt.figure(figsize=(10, 6))
-        x, y = data.get('x_col'), data.get('y_col')
-        ctype = data.get('chartType', 'bar')
-        
-        try:
-            if x in df.columns:
-                if ctype == 'hist':
-                    df[x].hist()
-                elif y in df.columns:
-                    if ctype == 'bar': plt.bar(df[x], df[y])
-                    elif ctype == 'line': plt.plot(df[x], df[y])
-                    elif ctype == 'scatter': plt.scatter(df[x], df[y])
-                    elif ctype == 'pie': plt.pie(df[y], labels=df[x])
-                
-                plt.title(f"{ctype} chart")
-                plt.tight_layout()
-                plt.savefig(save_path)
+        with chart_lock:
+            plt.figure(figsize=(10, 6))
+            x, y = data.get('x_col'), data.get('y_col')
+            ctype = data.get('chartType', 'bar')
+            
+            try:
+                if x in df.columns:
+                    if ctype == 'hist':
+                        df[x].hist()
+                    elif y in df.columns:
+                        if ctype == 'bar': plt.bar(df[x], df[y])
+                        elif ctype == 'line': plt.plot(df[x], df[y])
+                        elif ctype == 'scatter': plt.scatter(df[x], df[y])
+                        elif ctype == 'pie': plt.pie(df[y], labels=df[x])
+                    
+                    plt.title(f"{ctype} chart")
+                    plt.tight_layout()
+                    plt.savefig(save_path)
+                    plt.close()
+                    
+                    self.save_db_record(output_name, 'Image', save_path)
+                    self.log(f"Generated chart: {output_name}")
+            except Exception as e:
                 plt.close()
-                
-                self.save_db_record(output_name, 'Image', save_path)
-                self.logs.append(f"Generated chart: {output_name}")
-        except Exception as e:
-            plt.close()
-            raise ValueError(f"Chart generation failed: {str(e)}")
+                raise ValueError(f"Chart generation failed: {str(e)}")
 
-    def save_destination(self, df, type_key, data):
+    DEST_EXTENSIONS = {
+        'dest_csv': '.csv', 'dest_json': '.json', 'dest_jsonl': '.jsonl', 'dest_excel': '.xlsx', 'dest_db': '.db',
+        'dest_parquet': '.parquet', 'dest_feather': '.feather'
+    }
+    DEST_FILE_TYPES = {
+        'dest_csv': 'CSV', 'dest_json': 'JSON', 'dest_jsonl': 'JSONL', 'dest_excel': 'Excel', 'dest_db': 'Database',
+        'dest_parquet': 'Parquet', 'dest_feather': 'Feather'
+    }
+
+    # Text destinations can be written compressed (data.compression); the codec's extension goes last
+    COMPRESSED_DESTINATIONS = ('dest_csv', 'dest_json', 'dest_jsonl')
+    COMPRESSION_SUFFIXES = {codec: ext for ext, codec in COMPRESSION_EXTENSIONS.items()}
+
+    @classmethod
+    def destination_name(cls, type_key, data):
         name = data.get('outputName', 'output')
-        ftype = 'UNKNOWN'
-        path = ""
+        ext = cls.DEST_EXTENSIONS.get(type_key)
+        suffix = cls.COMPRESSION_SUFFIXES.get(data.get('compression')) if type_key in cls.COMPRESSED_DESTINATIONS else None
+        if suffix and name.endswith(suffix): name = name[:-len(suffix)]
+        if ext and not name.endswith(ext): name += ext
+        if suffix: name += suffix
+        return name
+
+    def save_destination(self, df, type_key, data):
+        name = self.destination_name(type_key, data)
+        ftype = self.DEST_FILE_TYPES.get(type_key, 'UNKNOWN')
+        path = os.path.join(self.processed_dir, name) if type_key in self.DEST_EXTENSIONS else ""
+        # Text and database outputs get the same date text whichever path writes them (see
+        # StreamingDestination); Parquet and Feather store typed dates
+        if type_key not in ('dest_parquet', 'dest_feather'): df = dates_as_text(df)
 
         if type_key == 'dest_csv':
-            if not name.endswith('.csv'): name += '.csv'
-            path = os.path.join(self.processed_dir, name)
             df.to_csv(path, index=False)
-            ftype = 'CSV'
         elif type_key == 'dest_json':
-            if not name.endswith('.json'): name += '.json'
-            path = os.path.join(self.processed_dir, name)
-            df.to_json(path, orient='records')
-            ftype = 'JSON'
+            df.to_json(path, orient='records', date_format='iso')
+        elif type_key == 'dest_jsonl':
+            # Chunked, so the whole output never sits in memory as one JSON string
+            writer = StreamingDestination(type_key, name, path)
+            try:
+                for chunk in frame_chunks(df, self.chunk_size): writer.write(chunk)
+            finally:
+                writer.close()
         elif type_key == 'dest_excel':
-            if not name.endswith('.xlsx'): name += '.xlsx'
-            path = os.path.join(self.processed_dir, name)
             df.to_excel(path, index=False)
-            ftype = 'Excel'
         elif type_key == 'dest_db':
-            if not name.endswith('.db'): name += '.db'
-            path = os.path.join(self.processed_dir, name)
             with sqlite3.connect(path) as conn:
                 df.to_sql('export_data', conn, if_exists='replace', index=False)
-            ftype = 'Database'
+        elif type_key in ('dest_parquet', 'dest_feather'):
+            write_columnar(df, path)
         
+        self.count_io('rows_out', len(df))
         if path and os.path.exists(path):
             # Pass DataFrame to extract metadata
             self.save_db_record(name, ftype, path, df)
-            self.logs.append(f"Saved output to {name}")
+            self.log(f"Saved output to {name}")
 
-    def save_db_record(self, filename, ftype, path, df=None):
+    def save_db_record(self, filename, ftype, path, df=None, row_count=None, profile=None):
         size = os.path.getsize(path)
-        self.processed_bytes += size
+        self.count_io('bytes_written', size)
         
-        # Extract Metadata
-        row_count = 0
-        columns_json = "{}"
-        if df is not None and not df.empty:
+        # Extract Metadata (streamed outputs pass an empty schema frame plus their row count)
+        if df is not None and row_count is None:
             row_count = len(df)
+        columns_json = "{}"
+        if df is not None and row_count:
             # Create dict: {"col_name": "dtype_string"}
             col_map = {col: str(dtype) for col, dtype in df.dtypes.items()}
             columns_json = json.dumps(col_map)
+            if profile is None and row_count == len(df) and PROFILING: profile = profile_frame(df, path)
 
         new_file = ProcessedFile(
             filename=filename, 
@@ -401,11 +1455,81 @@ class PipelineEngine:
             file_size_bytes=size, 
             file_size_display=get_size_format(size),
             filepath=path, 
-            user_id=self.user.id,
+            user_id=self.user_id,
             # NEW FIELDS
-            row_count=row_count,
+            row_count=row_count or 0,
             columns=columns_json,
+            profile=profile_json(profile),
             source_pipeline_id=self.pipeline_id
         )
-        self.db.add(new_file)
+        # Nodes may run on worker threads without an app context, so the insert is
+        # deferred to flush_records on the scheduling thread
+        self.pending_records.append(new_file)
+
+    def load_schemas(self):
+        """Registered dtypes for every CSV/JSON Lines source, looked up here because node threads have no app context."""
+        for nid, node in self.nodes.items():
+            if not self.is_source(node['type']): continue
+            path = self.resolve_source_path(node['data'])
+            if not path or file_format(path) not in ('csv', 'jsonl'): continue
+            try:
+                dtypes = lookup_schema(path)
+            except Exception as e:
+                # The file is still read, with inferred types
+                logger.warning("Schema lookup failed for %s", path, exc_info=True)
+                self.log(f"Schema lookup failed for {os.path.basename(path)}, reading it with inferred types: {e}")
+                continue
+            if dtypes: self.csv_schemas[os.path.abspath(path)] = dtypes
+
+    def load_profiles(self):
+        """Stored column profiles of the sources, for the planners' size estimates (see source_bytes)."""
+        for nid, node in self.nodes.items():
+            if not self.is_source(node['type']): continue
+            path = self.resolve_source_path(node['data'])
+            if not path: continue
+            try:
+                profile = lookup_profile(path)
+            except Exception as e:
+                # Only the planners' size estimates depend on it: they fall back to the file size
+                logger.warning("Profile lookup failed for %s", path, exc_info=True)
+                self.log(f"Profile lookup failed for {os.path.basename(path)}, estimating its size from the file: {e}")
+                continue
+            if profile: self.source_profiles[nid] = profile
+
+    def source_bytes(self, node_id, path):
+        """In-memory size of a source: measured when it was profiled, otherwise estimated from the file."""
+        profile = self.source_profiles.get(node_id)
+        if profile and profile.get('memory_bytes'): return profile['memory_bytes']
+        return estimate_file_bytes(path, file_format(path))
+
+    def csv_dtypes(self, path):
+        return self.csv_schemas.get(os.path.abspath(path)) if path else None
+
+    def chunk_dtypes(self, path):
+        """
+        dtypes to read a CSV/JSON Lines file in chunks with, so each column gets the type a full read
+        gives it rather than one guessed per chunk. A file without a registered schema is scanned
+        first, and the scan is registered for the next run.
+        """
+        if file_format(path) not in ('csv', 'jsonl'): return None
+        dtypes = self.csv_dtypes(path)
+        if dtypes is None:
+            builder = scan_file(path)
+            dtypes = self.csv_schemas[os.path.abspath(path)] = builder.result()
+            self.pending_schemas.append((path, dtypes, builder.rows))
+        return dtypes
+
+    def flush_records(self):
+        if self.pending_schemas:
+            schemas, self.pending_schemas = self.pending_schemas, []
+            for path, dtypes, rows in schemas:
+                if os.path.exists(path): save_schema(self.db, path, dtypes, rows)
+            self.db.commit()
+        if not self.pending_records:
+            return
+        records, self.pending_records = self.pending_records, []
+        for record in records:
+            self.processed_bytes += record.file_size_bytes
+            self.db.add(record)
+        if self.pipeline_id: record_outputs(self.db, self.pipeline_id, self.user_id, [r.filename for r in records])
         self.db.commit()
\ No newline at end of file
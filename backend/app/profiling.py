@@ -0,0 +1,169 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+
+from .compaction import plain
+from .spill import estimate_frame_bytes
+from .models import DataSource, ProcessedFile
+
+# Profile uploads and pipeline outputs (set to 0 to store only row counts and dtypes)
+PROFILING = os.getenv('PIPELINE_PROFILING', '1') != '0'
+# HyperLogLog uses 2^HLL_PRECISION registers; the distinct count is within about 1.04 / sqrt(2^p) (1.6%)
+HLL_PRECISION = 12
+# Values kept per numeric column for quantiles: a uniform sample, exact up to this many rows
+QUANTILE_SAMPLE = 4096
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+class HyperLogLog:
+    """Approximate distinct count over 64-bit hashes, updated a whole array at a time."""
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, hashes):
+        if not len(hashes): return
+        rest_bits = 64 - self.precision
+        index = (hashes >> np.uint64(rest_bits)).astype(np.intp)
+        rest = (hashes & np.uint64((1 << rest_bits) - 1)).astype(np.float64) # exact: under 2^53
+        # Rank = position of the leftmost 1 in the remaining bits; frexp's exponent is the bit length
+        rank = (rest_bits + 1 - np.frexp(rest)[1]).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def count(self):
+        m = len(self.registers)
+        estimate = 0.7213 / (1 + 1.079 / m) * m * m / np.exp2(-self.registers.astype(np.float64)).sum()
+        zeros = np.count_nonzero(self.registers == 0)
+        # Few distinct values: linear counting over the empty registers is more accurate
+        if estimate <= 2.5 * m and zeros: estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+class QuantileSketch:
+    """
+    Uniform sample of a numeric column: every value gets a random priority and the QUANTILE_SAMPLE
+    lowest priorities are kept, so chunks can be added in any number and order.
+    """
+    def __init__(self, size=QUANTILE_SAMPLE, seed=0):
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.values = np.empty(0)
+        self.priorities = np.empty(0)
+
+    def add(self, values):
+        values = np.concatenate([self.values, values])
+        priorities = np.concatenate([self.priorities, self.rng.random(len(values) - len(self.values))])
+        if len(values) > self.size:
+            keep = np.argpartition(priorities, self.size)[:self.size]
+            values, priorities = values[keep], priorities[keep]
+        self.values, self.priorities = values, priorities
+
+    def quantiles(self, qs=QUANTILES):
+        if not len(self.values): return None
+        return {f"p{int(q * 100):02d}": finite(v) for q, v in zip(qs, np.quantile(self.values, qs))}
+
+def finite(value):
+    """Plain float for JSON; infinities (and NaN from them) become None."""
+    value = float(value)
+    return value if np.isfinite(value) else None
+
+def column_kind(series):
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_numeric_dtype(series): return 'numeric'
+    if pd.api.types.is_datetime64_any_dtype(series): return 'datetime'
+    return 'text'
+
+def value_hashes(values, kind):
+    # Numbers hash as floats so 1 and 1.0 (int and float chunks of one column) count once
+    if kind == 'numeric': values = values.astype('float64')
+    try:
+        return pd.util.hash_pandas_object(values, index=False).to_numpy()
+    except TypeError: # unhashable values such as lists from JSON
+        return pd.util.hash_pandas_object(values.astype(str), index=False).to_numpy()
+
+class ColumnStats:
+    def __init__(self):
+        self.kind = None # 'numeric', 'datetime', 'text', or 'mixed' once chunks disagree
+        self.dtype = None
+        self.count = 0
+        self.nulls = 0
+        self.distinct = HyperLogLog()
+        self.sketch = QuantileSketch()
+        self.min = self.max = None
+        self.total = 0.0
+
+    def update(self, series):
+        series = plain(series)
+        values = series.dropna()
+        self.count += len(series)
+        self.nulls += len(series) - len(values)
+        if values.empty: return
+        kind = column_kind(values)
+        self.dtype = str(series.dtype)
+        if self.kind is None: self.kind = kind
+        elif self.kind != kind: self.kind = 'mixed'
+        self.distinct.add(value_hashes(values, kind))
+        if self.kind == 'numeric':
+            numbers = values.to_numpy(dtype=np.float64)
+            self.total += numbers.sum()
+            self.sketch.add(numbers)
+            self.extend(numbers.min(), numbers.max())
+        elif self.kind == 'datetime':
+            self.extend(values.min(), values.max())
+
+    def extend(self, low, high):
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+
+    def result(self):
+        stats = {'dtype': self.dtype, 'nulls': int(self.nulls), 'distinct': self.distinct.count() if self.count > self.nulls else 0}
+        if self.kind == 'numeric':
+            stats.update(min=finite(self.min), max=finite(self.max), mean=finite(self.total / (self.count - self.nulls)), quantiles=self.sketch.quantiles())
+        elif self.kind == 'datetime':
+            stats.update(min=self.min.isoformat(), max=self.max.isoformat())
+        return stats
+
+class Profiler:
+    """
+    Per-column statistics over a file read in chunks, in one pass: null count, min/max, mean,
+    approximate distinct count (HyperLogLog) and quantiles (QuantileSketch), plus the row count
+    and in-memory size the engine uses when planning reads of the file.
+    """
+    def __init__(self):
+        self.rows = 0
+        self.memory_bytes = 0
+        self.columns = {}
+
+    def update(self, chunk):
+        self.rows += len(chunk)
+        self.memory_bytes += estimate_frame_bytes(chunk)
+        seen = set()
+        for i, col in enumerate(chunk.columns):
+            # Duplicate names: only the first column of that name is profiled
+            key = str(col)
+            if key in seen: continue
+            seen.add(key)
+            self.columns.setdefault(key, ColumnStats()).update(chunk.iloc[:, i])
+
+    def result(self, path=None):
+        """JSON-ready profile; with the profiled file's path, its size is kept to detect later changes."""
+        profile = {'rows': self.rows, 'memory_bytes': int(self.memory_bytes), 'columns': {col: stats.result() for col, stats in self.columns.items()}}
+        if path: profile['file_size'] = os.path.getsize(path)
+        return profile
+
+def profile_frame(df, path=None, chunksize=1_000_000):
+    profiler = Profiler()
+    for start in range(0, max(len(df), 1), chunksize):
+        profiler.update(df.iloc[start:start + chunksize])
+    return profiler.result(path)
+
+def profile_json(profile):
+    return json.dumps(profile) if profile else None
+
+def lookup_profile(path):
+    """Stored profile of a catalogued file (latest output or upload at that path), or None if missing or the file changed since."""
+    candidates = [path, os.path.abspath(path)]
+    for model, created in ((ProcessedFile, ProcessedFile.created_at), (DataSource, DataSource.upload_date)):
+        record = model.query.filter(model.filepath.in_(candidates), model.profile.isnot(None)).order_by(created.desc()).first()
+        if record is None: continue
+        profile = json.loads(record.profile)
+        if profile.get('file_size') == os.path.getsize(path): return profile
+    return None
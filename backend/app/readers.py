@@ -0,0 +1,367 @@
+import os
+import bz2
+import gzip
+import mmap
+import numpy as np
+import pandas as pd
+from pandas._libs.parsers import STR_NA_VALUES
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.compute as pc
+    import pyarrow.json as pajson
+    import pyarrow.parquet as pq
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+JSON_LINES_EXTENSIONS = ('.jsonl', '.ndjson')
+# Formats iter_chunks can read a piece at a time
+CHUNKED_FORMATS = ('csv', 'parquet', 'feather', 'jsonl')
+
+# Compressed text files are decompressed on the fly while they are parsed; the codec comes from the last extension
+COMPRESSION_EXTENSIONS = {'.gz': 'gzip', '.bz2': 'bz2', '.zst': 'zstd'}
+COMPRESSIBLE_FORMATS = ('csv', 'json', 'jsonl')
+
+# Typed Parquet copies of raw text/Excel files live in this hidden folder next to the original
+SIDECAR_DIR = '.columnar'
+SIDECAR_FORMATS = ('csv', 'json', 'jsonl', 'excel')
+
+# Filter operators whose Arrow semantics match pandas (Arrow drops nulls for '!=', pandas keeps them)
+ARROW_FILTER_OPS = {'>', '<', '=='}
+
+# Parse whole CSV/JSON Lines files with Arrow's multithreaded reader (set to 0 to always use pandas)
+ARROW_PARSER = os.getenv('PIPELINE_ARROW_PARSER', '1') != '0'
+# Arrow reads the same strings as missing and as booleans as pandas does
+CSV_NULL_VALUES = sorted(STR_NA_VALUES)
+CSV_TRUE_VALUES = ['True', 'TRUE', 'true']
+CSV_FALSE_VALUES = ['False', 'FALSE', 'false']
+# Text pandas reads as an integer (int64, uint64, or text past 64 bits) that Arrow may read as float64: '+5', 18446744073709551615
+INTEGER_TEXT = r'^\s*[+-]?\d+\s*$'
+# Hexadecimal, which Arrow reads as integers and pandas keeps as text
+HEX_TEXT = r'^\s*[+-]?0[xX]'
+
+def compression_of(path):
+    """'gzip', 'bz2' or 'zstd' for a compressed file, else None."""
+    return COMPRESSION_EXTENSIONS.get(os.path.splitext(path.lower())[1])
+
+def file_format(path):
+    """
+    Maps a filename to 'csv', 'json', 'jsonl', 'excel', 'parquet', 'feather' or None.
+    Compressed CSV/JSON files (data.csv.gz) have the format of the file inside.
+    """
+    if compression_of(path):
+        fmt = file_format(os.path.splitext(path)[0])
+        return fmt if fmt in COMPRESSIBLE_FORMATS else None
+    name = path.lower()
+    if name.endswith('.csv'): return 'csv'
+    if name.endswith('.json'): return 'json'
+    if name.endswith(JSON_LINES_EXTENSIONS): return 'jsonl'
+    if name.endswith(('.xls', '.xlsx')): return 'excel'
+    if name.endswith('.parquet'): return 'parquet'
+    if name.endswith(('.feather', '.arrow')): return 'feather'
+    return None
+
+def is_tabular(filename):
+    """Whether the engine can use the file as a tabular source."""
+    return file_format(filename) is not None
+
+def require_arrow():
+    if pa is None:
+        raise ValueError("Parquet/Feather support requires the 'pyarrow' package.")
+
+def open_text(path, mode='r', newline=None):
+    """Text handle on a file, compressing or decompressing on the fly when its extension names a codec."""
+    codec = compression_of(path)
+    if codec == 'gzip': return gzip.open(path, mode + 't', encoding='utf-8', newline=newline)
+    if codec == 'bz2': return bz2.open(path, mode + 't', encoding='utf-8', newline=newline)
+    if codec == 'zstd':
+        if zstandard is None: raise ValueError("Zstandard (.zst) files require the 'zstandard' package.")
+        return zstandard.open(path, mode + 't', encoding='utf-8', newline=newline)
+    return open(path, mode, encoding='utf-8', newline=newline)
+
+def read_header(path):
+    """Column names of a file without loading its rows."""
+    fmt = file_format(path)
+    if fmt == 'csv':
+        return list(pd.read_csv(path, nrows=0).columns)
+    if fmt == 'excel':
+        return list(pd.read_excel(path, nrows=0).columns)
+    if fmt == 'jsonl':
+        # Records carry their own keys; the first ones stand in for a header
+        return list(read_json_file(path, lines=True, nrows=100).columns)
+    if fmt == 'parquet':
+        require_arrow()
+        return pq.read_schema(path).names
+    if fmt == 'feather':
+        require_arrow()
+        with pa.memory_map(path) as source:
+            return pa.ipc.open_file(source).schema.names
+    raise ValueError(f"Cannot read column names of {os.path.basename(path)}")
+
+def arrow_csv_type(dtype):
+    return {'int64': pa.int64(), 'uint64': pa.uint64(), 'float64': pa.float64(), 'bool': pa.bool_(), 'object': pa.string()}.get(dtype)
+
+def arrow_to_pandas(table):
+    """
+    Arrow table to the frame pandas' own parser would have produced: all-null columns as
+    float64 and missing strings as NaN rather than None.
+    """
+    for i, field in enumerate(table.schema):
+        if pa.types.is_null(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.float64()))
+    df = table.to_pandas(split_blocks=True, self_destruct=True)
+    for col in df.columns[(df.dtypes == object).to_numpy()]:
+        missing = df[col].isna().to_numpy()
+        if missing.any():
+            values = df[col].to_numpy(copy=True)
+            values[missing] = np.nan
+            df[col] = values
+    return df
+
+def contains(path, *needles):
+    """Whether a file contains any of the byte strings anywhere (memchr-speed scans)."""
+    if compression_of(path):
+        # Scanning would mean decompressing the file twice; assume it does, which is always safe
+        return True
+    if os.path.getsize(path) == 0:
+        return False
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return any(data.find(needle) != -1 for needle in needles)
+
+def types_differ_from_pandas(path, table, inferred, parse_options, options):
+    """
+    Whether pandas would type a column Arrow inferred differently: whole-number text read as
+    float64 ('+5', integers past int64) or hexadecimal read as integers. Only the columns that
+    could be affected are read again, as text, to check.
+    """
+    floats, ints = [], []
+    for field in table.schema:
+        if field.name not in inferred: continue
+        column = table.column(field.name)
+        # pandas reads integers with missing values as float64 too
+        if pa.types.is_floating(field.type) and column.null_count == 0 and pc.all(pc.equal(pc.floor(column), column)).as_py():
+            floats.append(field.name)
+        elif pa.types.is_integer(field.type):
+            ints.append(field.name)
+    if ints and not contains(path, b'0x', b'0X'): ints = []
+    if not floats and not ints: return False
+    text = pacsv.read_csv(path, parse_options=parse_options, convert_options=pacsv.ConvertOptions(
+        **dict(options, include_columns=floats + ints, column_types={c: pa.string() for c in floats + ints})))
+    return (any(pc.all(pc.match_substring_regex(text.column(c), INTEGER_TEXT)).as_py() for c in floats)
+            or any(pc.any(pc.match_substring_regex(text.column(c), HEX_TEXT)).as_py() for c in ints))
+
+def read_csv_arrow(path, usecols=None, dtype=None):
+    """
+    Parses a whole CSV file on all cores with pyarrow.csv. Returns None when the file needs
+    pandas' parser instead: duplicate column names (pandas renames them), values Arrow can't
+    give one type, or columns it would type differently from pandas (see types_differ_from_pandas).
+    dtype (a registered schema) pins the types of its columns, which then need no check.
+    """
+    if pa is None or not ARROW_PARSER:
+        return None
+    header = read_header(path)
+    column_types = {col: arrow_csv_type(t) for col, t in (dtype or {}).items() if arrow_csv_type(t) is not None}
+    options = dict(
+        null_values=CSV_NULL_VALUES, strings_can_be_null=True, quoted_strings_can_be_null=True,
+        true_values=CSV_TRUE_VALUES, false_values=CSV_FALSE_VALUES,
+        # pandas returns the file's column order whatever the order of usecols
+        include_columns=[c for c in header if c in usecols] if usecols is not None else None,
+    )
+    # Quoted values may span lines; Arrow only splits such files into parallel blocks safely when told
+    parse_options = pacsv.ParseOptions(newlines_in_values=contains(path, b'"'))
+    try:
+        # Arrow would parse date and time text; pandas keeps it as text, so re-type those columns
+        with pacsv.open_csv(path, parse_options=parse_options, convert_options=pacsv.ConvertOptions(column_types=column_types, **options)) as probe:
+            names = [field.name for field in probe.schema]
+            if len(set(names)) != len(names) and usecols is None: return None
+            for field in probe.schema:
+                if pa.types.is_temporal(field.type): column_types[field.name] = pa.string()
+        inferred = set(names) - set(column_types)
+        table = pacsv.read_csv(path, parse_options=parse_options, convert_options=pacsv.ConvertOptions(column_types=column_types, **options))
+        if inferred and types_differ_from_pandas(path, table, inferred, parse_options, options): return None
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        return None
+    return arrow_to_pandas(table)
+
+def read_csv_file(path, nrows=None, usecols=None, dtype=None):
+    """CSV to DataFrame: Arrow's parser for whole files when it can, pandas otherwise."""
+    if nrows is None:
+        df = read_csv_arrow(path, usecols, dtype)
+        if df is not None: return df
+    return pd.read_csv(path, nrows=nrows, usecols=usecols, dtype=dtype)
+
+def read_json_lines_arrow(path):
+    try:
+        # As for CSV, date and time strings stay strings
+        with pajson.open_json(path) as probe:
+            names = probe.schema.names
+            temporal = [pa.field(f.name, pa.string()) for f in probe.schema if pa.types.is_temporal(f.type)]
+        options = pajson.ParseOptions(explicit_schema=pa.schema(temporal)) if temporal else None
+        table = pajson.read_json(path, parse_options=options)
+        # Explicitly typed fields come first in the result; put them back in file order
+        if temporal: table = table.select(names + [c for c in table.column_names if c not in names])
+        return arrow_to_pandas(table)
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        # Types that change between records: pandas handles them
+        return None
+
+def read_json_lines(path, nrows=None, chunksize=None):
+    """
+    pandas' JSON Lines reader, reading the file lazily: nrows stops after that many lines and
+    chunksize returns an iterator. Values keep their JSON types (no guessing numbers or dates in strings).
+    """
+    return pd.read_json(path, lines=True, nrows=nrows, chunksize=chunksize, dtype=False, convert_dates=False)
+
+def read_json_file(path, lines=False, nrows=None):
+    """
+    JSON records to DataFrame. Line-delimited files are parsed on all cores with pyarrow.json,
+    or only up to nrows lines; JSON arrays have to be parsed as one document by pandas.
+    """
+    if lines:
+        df = read_json_lines_arrow(path) if nrows is None and pa is not None and ARROW_PARSER else None
+        return df if df is not None else read_json_lines(path, nrows=nrows)
+    df = pd.read_json(path)
+    return df.head(nrows) if nrows is not None else df
+
+def read_columnar(path, columns=None, filters=None, nrows=None):
+    """
+    Reads a Parquet or Feather (Arrow IPC) file through a memory map.
+    Parquet filters are (column, op, value) tuples evaluated against row-group
+    statistics, so whole row groups are skipped without being decoded.
+    """
+    require_arrow()
+    if file_format(path) == 'parquet':
+        if nrows is not None:
+            parquet_file = pq.ParquetFile(path, memory_map=True)
+            batches = parquet_file.iter_batches(batch_size=max(nrows, 1), columns=columns)
+            batch = next(batches, None)
+            if batch is None:
+                table = parquet_file.schema_arrow.empty_table()
+                return (table.select(columns) if columns is not None else table).to_pandas()
+            return batch.slice(0, nrows).to_pandas(split_blocks=True)
+        if filters:
+            try:
+                table = pq.read_table(path, columns=columns, filters=list(filters), memory_map=True)
+            except (pa.ArrowException, TypeError, ValueError):
+                # Value doesn't match the column type: read everything, pandas filters afterwards
+                table = pq.read_table(path, columns=columns, memory_map=True)
+        else:
+            table = pq.read_table(path, columns=columns, memory_map=True)
+    else:
+        table = feather.read_table(path, columns=columns, memory_map=True)
+        if nrows is not None: table = table.slice(0, nrows)
+    return table.to_pandas(split_blocks=True)
+
+def iter_chunks(path, chunksize, usecols=None, dtype=None):
+    """
+    Yields a file as DataFrames of at most chunksize rows (CSV, JSON Lines and columnar formats).
+    dtype ({column: dtype} of the whole file, CSV and JSON Lines) keeps every chunk on the same
+    columns and types; without it each text chunk is typed from its own rows.
+    """
+    fmt = file_format(path)
+    if fmt == 'csv':
+        with pd.read_csv(path, chunksize=chunksize, usecols=usecols, dtype=dtype) as reader:
+            for chunk in reader:
+                yield chunk
+    elif fmt == 'jsonl':
+        with read_json_lines(path, chunksize=chunksize) as reader:
+            for chunk in reader:
+                if dtype is not None: chunk = conform_chunk(chunk, dtype)
+                yield chunk[[c for c in chunk.columns if c in usecols]] if usecols is not None else chunk
+    elif fmt == 'parquet':
+        require_arrow()
+        parquet_file = pq.ParquetFile(path, memory_map=True)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=usecols):
+            yield batch.to_pandas(split_blocks=True)
+    elif fmt == 'feather':
+        require_arrow()
+        table = feather.read_table(path, columns=usecols, memory_map=True)
+        for batch in table.to_batches(max_chunksize=chunksize):
+            yield batch.to_pandas(split_blocks=True)
+    else:
+        raise ValueError(f"{os.path.basename(path)} cannot be read in chunks")
+
+def conform_chunk(chunk, dtype):
+    """A JSON Lines chunk with every column of the file (keys its records lack are missing) in the file's dtypes."""
+    if list(chunk.columns) != list(dtype): chunk = chunk.reindex(columns=list(dtype))
+    changed = {col: t for col, t in dtype.items() if str(chunk[col].dtype) != t}
+    return chunk.astype(changed) if changed else chunk
+
+def columnar_metadata(path):
+    """Row count and {column: dtype} for Parquet/Feather files, read from the footer/schema only."""
+    require_arrow()
+    if file_format(path) == 'parquet':
+        metadata = pq.read_metadata(path)
+        schema = metadata.schema.to_arrow_schema()
+        row_count = metadata.num_rows
+    else:
+        with pa.memory_map(path) as source:
+            reader = pa.ipc.open_file(source)
+            schema = reader.schema
+            row_count = sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+    dtypes = schema.empty_table().to_pandas().dtypes
+    return row_count, {col: str(dtype) for col, dtype in dtypes.items()}
+
+def write_columnar(df, path):
+    require_arrow()
+    if file_format(path) == 'parquet':
+        df.to_parquet(path, index=False)
+    else:
+        # Feather needs a default index and string column names
+        df = df.reset_index(drop=True)
+        df.columns = [str(c) for c in df.columns]
+        df.to_feather(path)
+
+def sidecar_path(path):
+    return os.path.join(os.path.dirname(path), SIDECAR_DIR, os.path.basename(path) + '.parquet')
+
+def fresh_sidecar(path):
+    """Path of the columnar sidecar for a raw file, or None if it is missing or older than the file."""
+    if pa is None or file_format(path) not in SIDECAR_FORMATS:
+        return None
+    sidecar = sidecar_path(path)
+    try:
+        if os.stat(sidecar).st_mtime_ns >= os.stat(path).st_mtime_ns:
+            return sidecar
+    except OSError:
+        pass
+    return None
+
+def write_sidecar(path, df=None, dtype=None):
+    """
+    Writes a typed Parquet copy of a CSV/JSON/Excel file, parsing the full file unless the
+    already-loaded frame is passed in (dtype: registered CSV column types). Returns the sidecar
+    path, or None when the data can't be represented in Parquet (e.g. columns mixing numbers and text).
+    """
+    fmt = file_format(path)
+    if pa is None or fmt not in SIDECAR_FORMATS:
+        return None
+    if df is None:
+        if fmt == 'csv':
+            df = read_csv_arrow(path, dtype=dtype)
+            if df is None: df = pd.read_csv(path, low_memory=False, dtype=dtype)
+        elif fmt in ('json', 'jsonl'): df = read_json_file(path, lines=fmt == 'jsonl')
+        else: df = pd.read_excel(path)
+
+    sidecar = sidecar_path(path)
+    os.makedirs(os.path.dirname(sidecar), exist_ok=True)
+    tmp_path = sidecar + '.tmp'
+    try:
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, sidecar)
+        return sidecar
+    except (pa.ArrowException, TypeError, ValueError) as e:
+        print(f"Columnar sidecar skipped for {os.path.basename(path)}: {e}")
+        if os.path.exists(tmp_path): os.remove(tmp_path)
+        return None
+
+def remove_sidecar(path):
+    sidecar = sidecar_path(path)
+    if os.path.exists(sidecar): os.remove(sidecar)
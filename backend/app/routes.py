@@ -1,24 +1,36 @@
 import json
 import os
+import uuid
 import sqlite3
 import pandas as pd
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
-from datetime import datetime
+from datetime import datetime, timedelta
 from flask import Blueprint, jsonify, request, current_app, send_from_directory
 from werkzeug.utils import secure_filename
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
 from flask_apscheduler import APScheduler
+from sqlalchemy.orm import joinedload
 from dotenv import load_dotenv
 import google.generativeai as genai
 
 # Import global extensions and the jobs module
 from . import db, socketio, scheduler
 from . import jobs 
-from .models import Pipeline, User, DataSource, ProcessedFile, SharedPipeline, PipelineRun, Notification
+from .models import Pipeline, User, DataSource, ProcessedFile, SharedPipeline, PipelineRun, Notification, NodeMetric, UploadSession, LineageEdge
 from .pipeline_engine import PipelineEngine, get_size_format
+from .node_cache import preview_cache
+from .workers import submit_run, submit_task, index_upload, track_unsaved_run, unsaved_run_status, SERVER_ID
+from .readers import file_format, compression_of, columnar_metadata, read_columnar, read_csv_file, read_json_file, remove_sidecar
+from .schemas import save_schema, remove_schema
+from .profiling import profile_json
+from .lineage import record_pipeline_lineage, lineage_walk
+from .run_logs import append_logs, read_logs, log_tail, log_counts, delete_pipeline_logs, RUN_LOG_PAGE_SIZE, MAX_RUN_LOG_PAGE_SIZE
+from .pagination import page_args, keyset_page, merged_keyset_page, merged_cursor, paged_response
+from .catalog import search_catalog, catalog_entry, CATALOG_PAGE_SIZE, MAX_CATALOG_PAGE_SIZE
+from .uploads import UploadScanner, UPLOAD_CHUNK_BYTES, MAX_CHUNK_BYTES, PARTIAL_DIR, UPLOAD_SESSION_TTL_HOURS, session_scanner, drop_scanner, append_chunk, copy_stream
 from .chatbot_context import get_gemini_response, generate_pipeline_plan 
 
 try:
@@ -39,6 +51,11 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 if GEMINI_API_KEY:
     genai.configure(api_key=GEMINI_API_KEY)
 
+# Pipeline outputs (ProcessedFile.file_type) that can't feed a source node
+NON_TABULAR_OUTPUTS = ('Image', 'Database')
+# Runs per page of a pipeline's history: each carries its per-node metrics (logs are read separately)
+RUN_HISTORY_PAGE_SIZE = 20
+
 def safe_convert(val):
     try:
         return int(val)
@@ -125,7 +142,10 @@ def delete_account():
         current_user_id = int(get_jwt_identity())
         user = User.query.get(current_user_id)
         
-        # 1. Delete items owned by user
+        # 1. Delete items owned by user (bulk deletes skip cascades: shares of my pipelines go first)
+        LineageEdge.query.filter_by(user_id=current_user_id).delete()
+        SharedPipeline.query.filter(SharedPipeline.pipeline_id.in_(db.session.query(Pipeline.id).filter_by(user_id=current_user_id))).delete(synchronize_session=False)
+        delete_pipeline_logs(db.session.query(Pipeline.id).filter_by(user_id=current_user_id))
         Pipeline.query.filter_by(user_id=current_user_id).delete()
         DataSource.query.filter_by(user_id=current_user_id).delete()
         ProcessedFile.query.filter_by(user_id=current_user_id).delete()
@@ -273,80 +293,77 @@ def admin_send_email():
 @jwt_required()
 def run_pipeline():
     current_user_id = int(get_jwt_identity())
-    user = User.query.get(current_user_id)
     req_data = request.json
     pipeline_id = req_data.get('pipelineId')
+    nodes = req_data.get('nodes', [])
+    edges = req_data.get('edges', [])
 
-    run_record = None
-    pipeline_entry = None
-    
-    if pipeline_id:
-        pipeline_entry = Pipeline.query.get(pipeline_id)
-        if pipeline_entry:
-            pipeline_entry.status = 'Active'
-            run_record = PipelineRun(
-                pipeline_id=pipeline_id,
-                status='Running',
-                start_time=datetime.utcnow(),
-                logs=json.dumps(["Initializing pipeline..."])
-            )
-            db.session.add(run_record)
-            db.session.commit()
+    pipeline_entry = Pipeline.query.get(pipeline_id) if pipeline_id else None
+    if not pipeline_entry:
+        # Unsaved canvas: there is no run row, so the outcome is polled with a ticket (GET /runs/unsaved/<ticket>)
+        ticket = track_unsaved_run(current_user_id, submit_run(current_app._get_current_object(), current_user_id, nodes, edges))
+        return jsonify({"message": "Pipeline queued", "ticket": ticket, "status": 'Queued'}), 202
+
+    pipeline_entry.status = 'Active'
+    run_record = PipelineRun(
+        pipeline_id=pipeline_entry.id,
+        status='Queued',
+        start_time=datetime.utcnow(),
+        owner=SERVER_ID
+    )
+    db.session.add(run_record)
+    db.session.flush()
+    append_logs(db.session, run_record.id, ["Waiting for a free worker..."])
+    db.session.commit()
 
-    engine = None
-    try:
-        base_dir = os.path.abspath(os.path.dirname(__file__))
-        engine = PipelineEngine(
-            nodes=req_data.get('nodes', []),
-            edges=req_data.get('edges', []),
-            user=user,
-            base_dir=base_dir,
-            db_session=db.session,
-            pipeline_id=pipeline_id 
-        )
-        
-        logs = engine.run()
-        
-        if run_record:
-            run_record.status = 'Success'
-            run_record.end_time = datetime.utcnow()
-            run_record.logs = json.dumps(logs)
-            if pipeline_entry: pipeline_entry.status = 'Ready'
-            
-            if user.notify_on_success:
-                msg = f"Pipeline '{pipeline_entry.name}' completed successfully."
-                try:
-                    notif = Notification(user_id=user.id, message=msg, type='success')
-                    db.session.add(notif)
-                    socketio.emit('notification', {'type': 'success', 'message': msg}, room=f"user_{user.id}")
-                except Exception as e:
-                    print(f"Notif Error: {e}")
+    submit_run(current_app._get_current_object(), current_user_id, nodes, edges, run_id=run_record.id, pipeline_id=pipeline_entry.id)
+    return jsonify({"message": "Pipeline queued", "run_id": run_record.id, "status": run_record.status}), 202
 
-            db.session.commit()
+def visible_run(run_id, user_id):
+    """The run, if it belongs to a pipeline the user owns or has been shared."""
+    run = PipelineRun.query.get(run_id)
+    if not run or not run.pipeline: return None
+    if run.pipeline.user_id != user_id and not SharedPipeline.query.filter_by(pipeline_id=run.pipeline_id, user_id=user_id).first(): return None
+    return run
 
-        return jsonify({"message": "Pipeline Executed Successfully", "logs": logs})
+@main.route('/runs/<int:id>', methods=['GET'])
+@jwt_required()
+def get_run(id):
+    """Status of a run and the last lines of its log (the whole log is at /runs/<id>/logs)."""
+    run = visible_run(id, int(get_jwt_identity()))
+    if not run: return jsonify({"error": "Run not found"}), 404
+    return jsonify({
+        "id": run.id,
+        "pipeline_id": run.pipeline_id,
+        "status": run.status,
+        "start_time": run.start_time.strftime('%Y-%m-%d %H:%M:%S') if run.start_time else None,
+        "end_time": run.end_time.strftime('%Y-%m-%d %H:%M:%S') if run.end_time else None,
+        "log_tail": log_tail(run.id)
+    })
+
+@main.route('/runs/unsaved/<ticket>', methods=['GET'])
+@jwt_required()
+def get_unsaved_run(ticket):
+    """Status of an unsaved canvas run (see run_pipeline), with its whole log once it has finished."""
+    run = unsaved_run_status(ticket, int(get_jwt_identity()))
+    if not run: return jsonify({"error": "Run not found"}), 404
+    return jsonify(dict(run, ticket=ticket))
 
-    except Exception as e:
-        if run_record:
-            run_record.status = 'Failed'
-            run_record.end_time = datetime.utcnow()
-            current_logs = engine.logs if engine else ["Pipeline failed before engine init."]
-            current_logs.append(f"CRITICAL ERROR: {str(e)}")
-            run_record.logs = json.dumps(current_logs)
-            if pipeline_entry: pipeline_entry.status = 'Ready'
-            
-            if user.notify_on_failure and pipeline_entry:
-                msg = f"Pipeline '{pipeline_entry.name}' failed: {str(e)}"
-                try:
-                    notif = Notification(user_id=user.id, message=msg, type='error')
-                    db.session.add(notif)
-                    socketio.emit('notification', {'type': 'error', 'message': msg}, room=f"user_{user.id}")
-                except Exception as e:
-                    print(f"Notif Error: {e}")
-
-            db.session.commit()
-            
-        return jsonify({"error": str(e)}), 500
+@main.route('/runs/<int:id>/logs', methods=['GET'])
+@jwt_required()
+def get_run_logs(id):
+    """
+    A range of a run's log, readable while the run goes on: ?offset=N (and ?limit=) for the lines from N on,
+    or ?tail=N for the last N. Follow a running log by asking again from the returned next_offset.
+    """
+    run = visible_run(id, int(get_jwt_identity()))
+    if not run: return jsonify({"error": "Run not found"}), 404
+    tail = request.args.get('tail', type=int)
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    limit = min(max(request.args.get('limit', RUN_LOG_PAGE_SIZE, type=int), 1), MAX_RUN_LOG_PAGE_SIZE)
+    result = read_logs(run.id, offset=offset, tail=min(max(tail, 0), MAX_RUN_LOG_PAGE_SIZE) if tail is not None else None, limit=limit)
+    result.update({"run_id": run.id, "status": run.status})
+    return jsonify(result)
 
 @main.route('/collaboration/stats', methods=['GET'])
 @jwt_required()
@@ -363,23 +380,15 @@ def get_collab_stats():
 @jwt_required()
 def get_shared_with_me():
     current_user_id = int(get_jwt_identity())
-    shares = SharedPipeline.query.filter_by(user_id=current_user_id).all()
+    try:
+        limit, cursor = page_args()
+    except ValueError:
+        return jsonify({"error": "Invalid cursor"}), 400
+    # Share, pipeline and owner in one query; shares whose pipeline or owner is gone simply don't join
+    query = db.session.query(SharedPipeline, Pipeline, User).join(Pipeline, Pipeline.id == SharedPipeline.pipeline_id).join(User, User.id == Pipeline.user_id).filter(SharedPipeline.user_id == current_user_id)
+    rows, next_cursor = keyset_page(query, SharedPipeline.id, limit, cursor)
     output = []
-    
-    for share in shares:
-        p = share.pipeline
-        # If the pipeline itself was deleted but the share remains
-        if not p: 
-            db.session.delete(share) # Auto-cleanup
-            continue 
-        
-        owner_user = User.query.get(p.user_id)
-        
-        # If the Owner was deleted, we shouldn't see this share anymore
-        if not owner_user:
-            db.session.delete(share) # Auto-cleanup
-            continue
-
+    for share, p, owner_user in rows:
         output.append({
             "id": p.id, 
             "name": p.name, 
@@ -390,49 +399,39 @@ def get_shared_with_me():
             "version": "1.0", 
             "share_id": share.id
         })
-        
-    # Commit any auto-cleanups
-    db.session.commit()
-    return jsonify(output)
+    return paged_response(output, next_cursor)
 
 @main.route('/collaboration/shared-by-me', methods=['GET'])
 @jwt_required()
 def get_shared_by_me():
     current_user_id = int(get_jwt_identity())
-    pipelines = Pipeline.query.filter_by(user_id=current_user_id).all()
+    try:
+        limit, cursor = page_args()
+    except ValueError:
+        return jsonify({"error": "Invalid cursor"}), 400
+    # A page of my pipelines that have shares, then all their shares with the recipients in one query
+    recipients = db.session.query(SharedPipeline.pipeline_id).join(User, User.id == SharedPipeline.user_id)
+    pipelines, next_cursor = keyset_page(Pipeline.query.filter(Pipeline.user_id == current_user_id, Pipeline.id.in_(recipients)), Pipeline.id, limit, cursor)
+    shared_users = {}
+    if pipelines:
+        shares = db.session.query(SharedPipeline, User).join(User, User.id == SharedPipeline.user_id).filter(SharedPipeline.pipeline_id.in_([p.id for p in pipelines])).order_by(SharedPipeline.id)
+        for share, recipient_user in shares:
+            shared_users.setdefault(share.pipeline_id, []).append({
+                "share_id": share.id, 
+                "username": recipient_user.username, 
+                "email": recipient_user.email, 
+                "role": share.role
+            })
     output = []
-    
     for p in pipelines:
-        if p.shares.count() > 0:
-            shared_users = []
-            # Iterate through shares and filter out deleted users
-            for s in p.shares:
-                recipient_user = User.query.get(s.user_id)
-                
-                # If the user I shared with no longer exists, remove the share
-                if not recipient_user:
-                    db.session.delete(s) # Auto-cleanup
-                    continue
-                
-                shared_users.append({
-                    "share_id": s.id, 
-                    "username": recipient_user.username, 
-                    "email": recipient_user.email, 
-                    "role": s.role
-                })
-            
-            # Only add to output if there are valid shares left
-            if shared_users:
-                output.append({
-                    "id": p.id, 
-                    "name": p.name, 
-                    "status": p.status, 
-                    "shared_users": shared_users, 
-                    "user_count": len(shared_users)
-                })
-    
-    db.session.commit()
-    return jsonify(output)
+        output.append({
+            "id": p.id, 
+            "name": p.name, 
+            "status": p.status, 
+            "shared_users": shared_users[p.id], 
+            "user_count": len(shared_users[p.id])
+        })
+    return paged_response(output, next_cursor)
 
 @main.route('/pipelines/share', methods=['POST'])
 @jwt_required()
@@ -505,7 +504,7 @@ def get_admin_stats():
     total_users = User.query.count()
     total_pipelines = Pipeline.query.count()
     active_pipelines = Pipeline.query.filter_by(status='Active').count()
-    global_bytes = sum(u.total_processed_bytes for u in User.query.all())
+    global_bytes = db.session.query(db.func.coalesce(db.func.sum(User.total_processed_bytes), 0)).scalar()
     recent_users = []
     for u in User.query.order_by(User.id.desc()).limit(5).all():
         recent_users.append({"id": u.id, "username": u.username, "email": u.email})
@@ -516,7 +515,18 @@ def get_admin_stats():
 def get_user_stats():
     current_user_id = int(get_jwt_identity())
     user = User.query.get(current_user_id)
-    return jsonify({"total_processed_bytes": user.total_processed_bytes, "username": user.username})
+    # Counts for the dashboard cards, so it needn't page through the lists themselves
+    pipeline_counts = db.session.query(
+        db.func.count(Pipeline.id),
+        db.func.count(db.case((Pipeline.status == 'Active', 1))),
+        db.func.count(Pipeline.schedule)
+    ).filter(Pipeline.user_id == current_user_id).one()
+    return jsonify({
+        "total_processed_bytes": user.total_processed_bytes, "username": user.username,
+        "pipelines": pipeline_counts[0], "active_pipelines": pipeline_counts[1], "scheduled_pipelines": pipeline_counts[2],
+        "sources": DataSource.query.filter_by(user_id=current_user_id).count(),
+        "processed": ProcessedFile.query.filter(ProcessedFile.user_id == current_user_id, ProcessedFile.file_type.notin_(NON_TABULAR_OUTPUTS)).count()
+    })
 
 @main.route('/pipelines', methods=['POST'])
 @jwt_required()
@@ -525,46 +535,56 @@ def create_pipeline():
     data = request.get_json()
     new_pipeline = Pipeline(name=data.get('name', 'Untitled'), structure=json.dumps(data.get('flow')), user_id=current_user_id)
     db.session.add(new_pipeline)
+    db.session.flush()
+    record_pipeline_lineage(new_pipeline)
     db.session.commit()
     return jsonify({"message": "Pipeline Created!", "id": new_pipeline.id})
 
 @main.route('/pipelines', methods=['GET'])
 @jwt_required()
 def get_pipelines():
+    """
+    My pipelines and the ones shared with me, newest first, a page at a time (?limit=, ?cursor=,
+    ?scheduled=1 for scheduled ones only). The flow itself comes from GET /pipelines/<id>.
+    """
     current_user_id = int(get_jwt_identity())
-    pipelines = Pipeline.query.filter_by(user_id=current_user_id).all()
+    try:
+        limit, cursor = page_args()
+    except ValueError:
+        return jsonify({"error": "Invalid cursor"}), 400
+    share_join = db.and_(SharedPipeline.pipeline_id == Pipeline.id, SharedPipeline.user_id == current_user_id)
+    query = db.session.query(Pipeline, SharedPipeline.role).outerjoin(SharedPipeline, share_join).filter(
+        db.or_(Pipeline.user_id == current_user_id, SharedPipeline.id.isnot(None))
+    ).options(joinedload(Pipeline.owner))
+    if request.args.get('scheduled'): query = query.filter(Pipeline.schedule.isnot(None), Pipeline.user_id == current_user_id)
+    rows, next_cursor = keyset_page(query, Pipeline.id, limit, cursor)
     output = []
     
-    for p in pipelines:
-        output.append({
-            "id": p.id, 
-            "name": p.name, 
-            "flow": json.loads(p.structure), 
-            "status": p.status, 
-            "schedule": p.schedule,  # <--- NEW: Return schedule info
-            "created_at": p.created_at.strftime('%Y-%m-%d %H:%M'), 
-            "is_shared": False, 
-            "permission": "owner"
-        })
-        
-    shares = SharedPipeline.query.filter_by(user_id=current_user_id).all()
-    for share in shares:
-        p = share.pipeline
-        if not p: continue 
-        output.append({
-            "id": p.id, 
-            "name": f"{p.name} (Shared)", 
-            "flow": json.loads(p.structure), 
-            "status": p.status, 
-            "schedule": None, 
-            "created_at": p.created_at.strftime('%Y-%m-%d %H:%M'), 
-            "is_shared": True, 
-            "permission": share.role, 
-            "owner": p.owner.username
-        })
+    for p, role in rows:
+        if p.user_id == current_user_id:
+            output.append({
+                "id": p.id, 
+                "name": p.name, 
+                "status": p.status, 
+                "schedule": p.schedule,  # <--- NEW: Return schedule info
+                "created_at": p.created_at.strftime('%Y-%m-%d %H:%M'), 
+                "is_shared": False, 
+                "permission": "owner"
+            })
+        else:
+            output.append({
+                "id": p.id, 
+                "name": f"{p.name} (Shared)", 
+                "status": p.status, 
+                "schedule": None, 
+                "created_at": p.created_at.strftime('%Y-%m-%d %H:%M'), 
+                "is_shared": True, 
+                "permission": role, 
+                "owner": p.owner.username if p.owner else None
+            })
     
     # --- FIX IS HERE ---
-    response = jsonify(output) # Create response object first
+    response = paged_response(output, next_cursor) # Create response object first
     response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
     response.headers["Pragma"] = "no-cache"
     response.headers["Expires"] = "0"
@@ -594,6 +614,7 @@ def update_pipeline(id):
     data = request.get_json()
     pipeline.name = data.get('name', pipeline.name)
     pipeline.structure = json.dumps(data.get('flow'))
+    record_pipeline_lineage(pipeline)
     db.session.commit()
     return jsonify({"message": "Updated"})
 
@@ -603,6 +624,8 @@ def delete_pipeline(id):
     current_user_id = int(get_jwt_identity())
     pipeline = Pipeline.query.filter_by(id=id, user_id=current_user_id).first()
     if not pipeline: return jsonify({"error": "Not found"}), 404
+    # Logs are bulk-deleted: a chatty run can have far too many lines to cascade one by one
+    delete_pipeline_logs([pipeline.id])
     db.session.delete(pipeline)
     db.session.commit()
     return jsonify({"message": "Deleted"})
@@ -619,46 +642,36 @@ def generate_pipeline():
 @main.route('/api/catalog/search', methods=['GET'])
 @jwt_required()
 def catalog_search():
+    """Ranked, prefix-matched catalog search (see catalog.py); the cursor of the next page is sent in X-Next-Cursor."""
     current_user_id = int(get_jwt_identity())
-    query = request.args.get('q', '').lower()
-    raw_files = DataSource.query.filter_by(user_id=current_user_id).all()
-    proc_files = ProcessedFile.query.filter_by(user_id=current_user_id).all()
-    results = []
-    def check_match(file_obj, ftype):
-        match_found = False
-        match_reason = []
-        if query in file_obj.filename.lower():
-            match_found = True
-            match_reason.append("Filename")
-        cols = {}
-        if file_obj.columns:
-            try:
-                cols = json.loads(file_obj.columns)
-                for c_name in cols.keys():
-                    if query in c_name.lower():
-                        match_found = True
-                        match_reason.append(f"Column: {c_name}")
-            except: pass
-        if match_found:
-            results.append({"id": file_obj.id, "name": file_obj.filename, "type": ftype, "rows": file_obj.row_count, "columns": cols, "matches": match_reason[:3]})
-    for f in raw_files: check_match(f, 'Source')
-    for f in proc_files: check_match(f, 'Processed')
-    return jsonify(results)
+    query = request.args.get('q', '')
+    limit = min(max(request.args.get('limit', CATALOG_PAGE_SIZE, type=int), 1), MAX_CATALOG_PAGE_SIZE)
+    try:
+        records, next_cursor = search_catalog(current_user_id, query, limit, request.args.get('cursor') or None)
+    except ValueError:
+        return jsonify({"error": "Invalid cursor"}), 400
+    response = jsonify([catalog_entry(record, query) for record in records])
+    if next_cursor: response.headers['X-Next-Cursor'] = next_cursor
+    return response
 
 @main.route('/api/catalog/lineage/<string:ftype>/<int:fid>', methods=['GET'])
 @jwt_required()
 def get_lineage(ftype, fid):
+    """
+    Where a catalog entry comes from and where it goes: the pipeline that created it and the ones
+    reading it (one hop), plus the full upstream and downstream graphs (see lineage.py).
+    """
     current_user_id = int(get_jwt_identity())
-    lineage_data = {"used_in": [], "created_by": None}
+    lineage_data = {"used_in": [], "created_by": None, "upstream": [], "downstream": []}
     target_filename = ""
     if ftype == 'Processed':
-        f = ProcessedFile.query.get(fid)
+        f = ProcessedFile.query.filter_by(id=fid, user_id=current_user_id).first()
         if f:
             if f.source_pipeline:
                 lineage_data['created_by'] = {"id": f.source_pipeline.id, "name": f.source_pipeline.name}
             target_filename = f.filename
     elif ftype == 'Source':
-        f = DataSource.query.get(fid)
+        f = DataSource.query.filter_by(id=fid, user_id=current_user_id).first()
         if f:
             target_filename = f.filename
             linked_processed = ProcessedFile.query.filter_by(user_id=current_user_id, filename=target_filename).order_by(ProcessedFile.created_at.desc()).first()
@@ -667,19 +680,50 @@ def get_lineage(ftype, fid):
             else:
                 lineage_data['created_by'] = {"name": "User Upload"}
     if target_filename:
-        all_pipelines = Pipeline.query.filter_by(user_id=current_user_id).all()
-        for p in all_pipelines:
-            try:
-                structure = json.loads(p.structure)
-                for node in structure:
-                    if node['type'].startswith('source_') or node['type'] == 'sourceNode':
-                        p_file = node['data'].get('filename') or node['data'].get('label')
-                        if p_file == target_filename:
-                            lineage_data['used_in'].append({"id": p.id, "name": p.name})
-                            break
-            except: continue
+        readers = Pipeline.query.join(LineageEdge).filter(LineageEdge.user_id == current_user_id, LineageEdge.dataset == target_filename, LineageEdge.role == 'input').order_by(Pipeline.id)
+        lineage_data['used_in'] = [{"id": p.id, "name": p.name} for p in readers]
+        lineage_data['upstream'] = lineage_walk(current_user_id, target_filename, 'upstream')
+        lineage_data['downstream'] = lineage_walk(current_user_id, target_filename, 'downstream')
     return jsonify(lineage_data)
 
+def upload_folder():
+    folder = os.path.join(os.path.abspath(os.path.dirname(__file__)), '..', 'uploads')
+    if not os.path.exists(folder): os.makedirs(folder)
+    return folder
+
+def upload_file_type(filename):
+    file_ext = filename.rsplit('.', 1)[1].upper() if '.' in filename else 'UNKNOWN'
+    # Compressed uploads keep the inner type visible (CSV.GZ)
+    if compression_of(filename) and filename.count('.') > 1: file_ext = '.'.join(filename.rsplit('.', 2)[1:]).upper()
+    return file_ext
+
+def register_upload(user_id, filename, file_path, scanner):
+    """
+    DataSource for a fully received upload. Hash, row count and types come from the scan done while
+    the bytes arrived; the sidecar (and metadata of formats the scan can't read) follow on the worker pool.
+    """
+    content_hash, row_count, dtypes, profile = scanner.finish()
+    if profile: profile['file_size'] = os.path.getsize(file_path)
+    fmt = file_format(filename)
+    scanned = dtypes is not None
+    try:
+        if fmt in ('parquet', 'feather'):
+            # Row count and types come straight from the file footer/schema
+            row_count, dtypes = columnar_metadata(file_path)
+        elif fmt == 'csv' and scanned:
+            save_schema(db.session, file_path, dtypes, row_count)
+    except Exception as e:
+        print(f"Metadata extraction failed: {e}")
+    new_source = DataSource(filename=filename, file_type=upload_file_type(filename), file_size=get_size_format(os.path.getsize(file_path)), filepath=file_path,
+                            user_id=user_id, row_count=row_count or 0, columns=json.dumps(dtypes or {}), content_hash=content_hash, profile=profile_json(profile))
+    db.session.add(new_source)
+    db.session.commit()
+    try:
+        submit_task(index_upload, new_source.id, dtypes if fmt == 'csv' else None, scanned)
+    except Exception as e:
+        print(f"Upload indexing failed: {e}")
+    return new_source
+
 @main.route('/upload', methods=['POST'])
 @jwt_required()
 def upload_file():
@@ -689,50 +733,128 @@ def upload_file():
     if file.filename == '': return jsonify({"error": "No selected file"}), 400
     if file:
         filename = secure_filename(file.filename)
-        base_dir = os.path.abspath(os.path.dirname(__file__))
-        upload_folder = os.path.join(base_dir, '..', 'uploads')
-        if not os.path.exists(upload_folder): os.makedirs(upload_folder)
-        file_path = os.path.join(upload_folder, filename)
-        file.save(file_path)
-        file_size = os.path.getsize(file_path)
-        formatted_size = get_size_format(file_size)
-        file_ext = filename.rsplit('.', 1)[1].upper() if '.' in filename else 'UNKNOWN'
-        row_count = 0
-        columns_json = "{}"
-        try:
-            df = None
-            if filename.lower().endswith('.csv'):
-                df = pd.read_csv(file_path, nrows=5) 
-                with open(file_path) as f: row_count = sum(1 for line in f) - 1 
-            elif filename.lower().endswith('.json'):
-                df = pd.read_json(file_path)
-                row_count = len(df)
-            elif filename.lower().endswith(('.xls', '.xlsx')):
-                df = pd.read_excel(file_path)
-                row_count = len(df)
-            if df is not None:
-                col_map = {col: str(dtype) for col, dtype in df.dtypes.items()}
-                columns_json = json.dumps(col_map)
-        except Exception as e:
-            print(f"Metadata extraction failed: {e}")
-        new_source = DataSource(filename=filename, file_type=file_ext, file_size=formatted_size, filepath=file_path, user_id=current_user_id, row_count=row_count, columns=columns_json)
-        db.session.add(new_source)
-        db.session.commit()
+        file_path = os.path.join(upload_folder(), filename)
+        # Hash, rows and types are taken from the bytes while they are copied to disk
+        scanner = UploadScanner(filename)
+        copy_stream(file.stream, file_path, scanner)
+        new_source = register_upload(current_user_id, filename, file_path, scanner)
         return jsonify({"message": "File uploaded successfully", "id": new_source.id}), 201
 
+# --- Chunked, resumable uploads ---
+# POST /uploads starts a session, PUT /uploads/<id>?offset=N appends one chunk, GET /uploads/<id>
+# tells a reconnecting client where to resume, POST /uploads/<id>/complete registers the file.
+
+def find_upload_session(upload_id, user_id):
+    return UploadSession.query.filter_by(id=upload_id, user_id=user_id).first()
+
+def partial_path(upload_id):
+    folder = os.path.join(upload_folder(), PARTIAL_DIR)
+    if not os.path.exists(folder): os.makedirs(folder)
+    return os.path.join(folder, upload_id)
+
+def upload_session_json(session):
+    return {"upload_id": session.id, "filename": session.filename, "size": session.total_size, "received": session.received_bytes, "chunk_size": UPLOAD_CHUNK_BYTES}
+
+def discard_upload_session(session):
+    path = partial_path(session.id)
+    if os.path.exists(path): os.remove(path)
+    drop_scanner(session.id)
+    db.session.delete(session)
+
+@main.route('/uploads', methods=['POST'])
+@jwt_required()
+def start_upload():
+    current_user_id = int(get_jwt_identity())
+    data = request.get_json() or {}
+    filename = secure_filename(data.get('filename') or '')
+    if not filename: return jsonify({"error": "Filename required"}), 400
+    size = data.get('size')
+    if size is not None and (not isinstance(size, int) or size < 0): return jsonify({"error": "Invalid size"}), 400
+
+    # Abandoned sessions of this user go first, with their partial files
+    cutoff = datetime.utcnow() - timedelta(hours=UPLOAD_SESSION_TTL_HOURS)
+    for stale in UploadSession.query.filter(UploadSession.user_id == current_user_id, UploadSession.updated_at < cutoff).all():
+        discard_upload_session(stale)
+
+    session = UploadSession(id=uuid.uuid4().hex, user_id=current_user_id, filename=filename, total_size=size, received_bytes=0)
+    db.session.add(session)
+    db.session.commit()
+    open(partial_path(session.id), 'wb').close()
+    return jsonify(upload_session_json(session)), 201
+
+@main.route('/uploads/<upload_id>', methods=['GET'])
+@jwt_required()
+def get_upload(upload_id):
+    session = find_upload_session(upload_id, int(get_jwt_identity()))
+    if not session: return jsonify({"error": "Upload not found"}), 404
+    return jsonify(upload_session_json(session))
+
+@main.route('/uploads/<upload_id>', methods=['PUT'])
+@jwt_required()
+def upload_chunk(upload_id):
+    session = find_upload_session(upload_id, int(get_jwt_identity()))
+    if not session: return jsonify({"error": "Upload not found"}), 404
+    offset = request.args.get('offset', type=int)
+    # A chunk for another offset (a retry of one already stored, or one after a gap) is refused with the resume point
+    if offset != session.received_bytes: return jsonify({"error": "Offset mismatch", "received": session.received_bytes}), 409
+    if request.content_length is None or request.content_length > MAX_CHUNK_BYTES: return jsonify({"error": f"Chunks must be at most {MAX_CHUNK_BYTES} bytes"}), 413
+    data = request.get_data(cache=False)
+    if session.total_size is not None and offset + len(data) > session.total_size: return jsonify({"error": "Chunk goes past the announced size"}), 400
+
+    path = partial_path(session.id)
+    scanner = session_scanner(session, path)
+    append_chunk(path, offset, data)
+    scanner.feed(data)
+    session.received_bytes = offset + len(data)
+    db.session.commit()
+    return jsonify(upload_session_json(session))
+
+@main.route('/uploads/<upload_id>/complete', methods=['POST'])
+@jwt_required()
+def complete_upload(upload_id):
+    current_user_id = int(get_jwt_identity())
+    session = find_upload_session(upload_id, current_user_id)
+    if not session: return jsonify({"error": "Upload not found"}), 404
+    if session.total_size is not None and session.received_bytes != session.total_size:
+        return jsonify({"error": "Upload incomplete", "received": session.received_bytes}), 409
+
+    path = partial_path(session.id)
+    scanner = session_scanner(session, path)
+    file_path = os.path.join(upload_folder(), session.filename)
+    os.replace(path, file_path)
+    drop_scanner(session.id)
+    db.session.delete(session)
+    new_source = register_upload(current_user_id, session.filename, file_path, scanner)
+    return jsonify({"message": "File uploaded successfully", "id": new_source.id, "row_count": new_source.row_count, "content_hash": new_source.content_hash}), 201
+
+@main.route('/uploads/<upload_id>', methods=['DELETE'])
+@jwt_required()
+def cancel_upload(upload_id):
+    session = find_upload_session(upload_id, int(get_jwt_identity()))
+    if not session: return jsonify({"error": "Upload not found"}), 404
+    discard_upload_session(session)
+    db.session.commit()
+    return jsonify({"message": "Upload cancelled"})
+
 @main.route('/datasources', methods=['GET'])
 @jwt_required()
 def get_datasources():
+    """Uploads and tabular pipeline outputs, newest first, a page at a time (?limit=, ?cursor=)."""
     current_user_id = int(get_jwt_identity())
-    raw_sources = DataSource.query.filter_by(user_id=current_user_id).all()
-    processed_sources = ProcessedFile.query.filter_by(user_id=current_user_id).all()
+    try:
+        limit, cursor = page_args(parse=merged_cursor)
+    except ValueError:
+        return jsonify({"error": "Invalid cursor"}), 400
+    raw_sources = DataSource.query.filter_by(user_id=current_user_id)
+    processed_sources = ProcessedFile.query.filter(ProcessedFile.user_id == current_user_id, ProcessedFile.file_type.notin_(NON_TABULAR_OUTPUTS))
+    records, next_cursor = merged_keyset_page([(raw_sources, DataSource, DataSource.upload_date, 0), (processed_sources, ProcessedFile, ProcessedFile.created_at, 1)], limit, cursor)
     combined = []
-    for s in raw_sources:
-        combined.append({"id": s.id, "name": s.filename, "size": s.file_size, "type": s.file_type, "date": s.upload_date.strftime("%Y-%m-%d"), "category": "upload", "row_count": s.row_count, "columns": json.loads(s.columns) if s.columns else {}})
-    for p in processed_sources:
-        if p.filename.lower().endswith(('.csv', '.json', '.xlsx', '.xls')):
-            combined.append({"id": p.id, "name": p.filename, "size": p.file_size_display, "type": p.file_type, "date": p.created_at.strftime("%Y-%m-%d"), "category": "processed", "row_count": p.row_count, "columns": json.loads(p.columns) if p.columns else {}})
-    return jsonify(combined)
+    for s in records:
+        if isinstance(s, DataSource):
+            combined.append({"id": s.id, "name": s.filename, "size": s.file_size, "type": s.file_type, "date": s.upload_date.strftime("%Y-%m-%d"), "category": "upload", "row_count": s.row_count, "columns": json.loads(s.columns) if s.columns else {}})
+        else:
+            combined.append({"id": s.id, "name": s.filename, "size": s.file_size_display, "type": s.file_type, "date": s.created_at.strftime("%Y-%m-%d"), "category": "processed", "row_count": s.row_count, "columns": json.loads(s.columns) if s.columns else {}})
+    return paged_response(combined, next_cursor)
 
 @main.route('/datasources/<int:id>', methods=['DELETE'])
 @jwt_required()
@@ -741,6 +863,8 @@ def delete_datasource(id):
     source = DataSource.query.filter_by(id=id, user_id=current_user_id).first()
     if not source: return jsonify({"error": "File not found"}), 404
     if os.path.exists(source.filepath): os.remove(source.filepath)
+    remove_sidecar(source.filepath)
+    remove_schema(db.session, source.filepath)
     db.session.delete(source)
     db.session.commit()
     return jsonify({"message": "File removed successfully!"})
@@ -749,8 +873,13 @@ def delete_datasource(id):
 @jwt_required()
 def get_processed_files():
     current_user_id = int(get_jwt_identity())
-    files = ProcessedFile.query.filter_by(user_id=current_user_id).order_by(ProcessedFile.created_at.desc()).all()
-    return jsonify([{"id": f.id, "name": f.filename, "type": f.file_type, "size": f.file_size_display, "size_bytes": f.file_size_bytes, "date": f.created_at.strftime('%Y-%m-%d %H:%M')} for f in files])
+    try:
+        limit, cursor = page_args()
+    except ValueError:
+        return jsonify({"error": "Invalid cursor"}), 400
+    # Newest first by id (ids follow creation order)
+    files, next_cursor = keyset_page(ProcessedFile.query.filter_by(user_id=current_user_id), ProcessedFile.id, limit, cursor)
+    return paged_response([{"id": f.id, "name": f.filename, "type": f.file_type, "size": f.file_size_display, "size_bytes": f.file_size_bytes, "date": f.created_at.strftime('%Y-%m-%d %H:%M')} for f in files], next_cursor)
 
 @main.route('/download/processed/<path:filename>', methods=['GET'])
 def download_processed_file(filename):
@@ -861,7 +990,7 @@ def preview_node():
     if not target_node_id: return jsonify({"error": "Target node ID required"}), 400
     try:
         base_dir = os.path.abspath(os.path.dirname(__file__))
-        engine = PipelineEngine(nodes=nodes, edges=edges, user=user, base_dir=base_dir, db_session=db.session, preview_mode=True)
+        engine = PipelineEngine(nodes=nodes, edges=edges, user=user, base_dir=base_dir, db_session=db.session, preview_mode=True, cache=preview_cache)
         result = engine.run_preview(target_node_id)
         if "error" in result: return jsonify(result), 400
         return jsonify(result)
@@ -877,9 +1006,12 @@ def preview_processed_file(id):
     if not os.path.exists(file_entry.filepath): return jsonify({"error": "File missing from server"}), 404
     try:
         df = None
-        if file_entry.filename.lower().endswith('.csv'): df = pd.read_csv(file_entry.filepath, nrows=100)
-        elif file_entry.filename.lower().endswith('.json'): df = pd.read_json(file_entry.filepath).head(100)
-        elif file_entry.filename.lower().endswith(('.xls', '.xlsx')): df = pd.read_excel(file_entry.filepath, nrows=100)
+        fmt = file_format(file_entry.filename)
+        if fmt == 'csv': df = read_csv_file(file_entry.filepath, nrows=100)
+        elif fmt == 'json': df = read_json_file(file_entry.filepath, nrows=100)
+        elif fmt == 'jsonl': df = read_json_file(file_entry.filepath, lines=True, nrows=100)
+        elif fmt == 'excel': df = pd.read_excel(file_entry.filepath, nrows=100)
+        elif fmt in ('parquet', 'feather'): df = read_columnar(file_entry.filepath, nrows=100)
         if df is not None:
              records = df.where(pd.notnull(df), None).to_dict(orient='records')
              return jsonify({"columns": list(df.columns), "data": records, "filename": file_entry.filename})
@@ -895,12 +1027,32 @@ def get_pipeline_history(id):
     if not pipeline:
         share = SharedPipeline.query.filter_by(pipeline_id=id, user_id=current_user_id).first()
         if not share: return jsonify({"error": "Pipeline not found"}), 404
-    runs = PipelineRun.query.filter_by(pipeline_id=id).order_by(PipelineRun.start_time.desc()).all()
+    try:
+        limit, cursor = page_args(RUN_HISTORY_PAGE_SIZE)
+    except ValueError:
+        return jsonify({"error": "Invalid cursor"}), 400
+    # Newest first by id (runs are created as they start)
+    runs, next_cursor = keyset_page(PipelineRun.query.filter_by(pipeline_id=id), PipelineRun.id, limit, cursor)
+
+    # Per-node breakdown for every run in one query, slowest node first
+    breakdown = {}
+    metrics = NodeMetric.query.filter(NodeMetric.run_id.in_([r.id for r in runs])).order_by(NodeMetric.wall_time.desc()).all() if runs else []
+    for m in metrics:
+        breakdown.setdefault(m.run_id, []).append({
+            "node_id": m.node_id, "type": m.node_type, "label": m.label,
+            "wall_time": round(m.wall_time or 0, 4), "cpu_time": round(m.cpu_time or 0, 4),
+            "rows_in": m.rows_in, "rows_out": m.rows_out,
+            "bytes_read": m.bytes_read, "bytes_written": m.bytes_written,
+            "rss_delta": m.rss_delta, "peak_rss": m.peak_rss
+        })
+
+    # Summaries only: a run's log is read on demand from /runs/<id>/logs
+    line_counts = log_counts([r.id for r in runs])
     output = []
     for r in runs:
         duration = "N/A"
         if r.end_time and r.start_time:
             diff = r.end_time - r.start_time
             duration = f"{diff.total_seconds():.2f}s"
-        output.append({"id": r.id, "status": r.status, "start_time": r.start_time.strftime('%Y-%m-%d %H:%M:%S'), "duration": duration, "logs": json.loads(r.logs) if r.logs else []})
-    return jsonify(output)
\ No newline at end of file
+        output.append({"id": r.id, "status": r.status, "start_time": r.start_time.strftime('%Y-%m-%d %H:%M:%S'), "duration": duration, "log_lines": line_counts.get(r.id, 0), "nodes": breakdown.get(r.id, [])})
+    return paged_response(output, next_cursor)
\ No newline at end of file
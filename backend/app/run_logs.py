@@ -0,0 +1,99 @@
+import os
+import time
+import threading
+from sqlalchemy import func, select
+
+from . import db
+from .models import RunLog, PipelineRun
+
+# Lines a running pipeline buffers before writing them to run_log, and the longest they wait (seconds)
+RUN_LOG_BATCH = int(os.getenv('RUN_LOG_BATCH', 200))
+RUN_LOG_FLUSH_SECONDS = float(os.getenv('RUN_LOG_FLUSH_SECONDS', 1.0))
+# Lines per read of GET /runs/<id>/logs when the client doesn't ask, and the most it may ask for
+RUN_LOG_PAGE_SIZE = 500
+MAX_RUN_LOG_PAGE_SIZE = 5000
+# Last lines GET /runs/<id> includes, enough for a poller to show how a run ended
+RUN_LOG_TAIL = 20
+
+def next_seq(conn, run_id):
+    """Number of the next line of a run's log (its length so far); conn is a session or a connection."""
+    return conn.execute(select(func.coalesce(func.max(RunLog.seq) + 1, 0)).where(RunLog.run_id == run_id)).scalar()
+
+def log_rows(run_id, start, lines):
+    return [{'run_id': run_id, 'seq': start + i, 'line': str(line)} for i, line in enumerate(lines)]
+
+def append_logs(session, run_id, lines):
+    """Appends lines to a run's log inside the session's transaction. The caller commits."""
+    if lines: session.execute(RunLog.__table__.insert(), log_rows(run_id, next_seq(session, run_id), lines))
+
+class RunLogWriter:
+    """
+    Appends a running pipeline's log lines to run_log in batches, on a connection of its own so they
+    can be read while the run goes on, whatever the engine's session is in the middle of.
+    Safe to write to from several node threads.
+    """
+    def __init__(self, run_id, engine=None):
+        self.run_id = run_id
+        self.engine = engine or db.engine
+        self.lock = threading.Lock()
+        self.pending = []
+        self.flushed_at = time.monotonic()
+        with self.engine.connect() as conn:
+            self.seq = next_seq(conn, run_id)
+
+    def write(self, lines):
+        with self.lock:
+            self.pending.extend(lines)
+            if len(self.pending) >= RUN_LOG_BATCH or time.monotonic() - self.flushed_at >= RUN_LOG_FLUSH_SECONDS:
+                self.flush_pending()
+
+    def flush(self):
+        with self.lock:
+            self.flush_pending()
+
+    def flush_pending(self):
+        self.flushed_at = time.monotonic()
+        if not self.pending: return
+        rows = log_rows(self.run_id, self.seq, self.pending)
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(RunLog.__table__.insert(), rows)
+        except Exception as e:
+            # Kept for the next flush: a failed log write mustn't fail the pipeline
+            print(f"Run log write failed for run {self.run_id}: {e}")
+            return
+        self.seq += len(rows)
+        self.pending = []
+
+def read_logs(run_id, offset=None, tail=None, limit=RUN_LOG_PAGE_SIZE):
+    """
+    Lines of a run's log, from offset on (at most limit), or the last tail lines:
+    {offset, lines: [{seq, time, text}], next_offset, total}. Follow a running log by reading from next_offset.
+    """
+    query = RunLog.query.filter(RunLog.run_id == run_id)
+    if tail is not None:
+        rows = query.order_by(RunLog.seq.desc()).limit(tail).all()[::-1]
+    else:
+        rows = query.filter(RunLog.seq >= (offset or 0)).order_by(RunLog.seq).limit(limit).all()
+    total = next_seq(db.session, run_id)
+    start = rows[0].seq if rows else (total if tail is not None else min(offset or 0, total))
+    return {
+        "offset": start,
+        "lines": [{"seq": r.seq, "time": r.logged_at.strftime('%H:%M:%S') if r.logged_at else None, "text": r.line} for r in rows],
+        "next_offset": rows[-1].seq + 1 if rows else start,
+        "total": total
+    }
+
+def log_tail(run_id, lines=RUN_LOG_TAIL):
+    return [r.line for r in RunLog.query.filter_by(run_id=run_id).order_by(RunLog.seq.desc()).limit(lines)][::-1]
+
+def log_counts(run_ids):
+    """{run_id: number of log lines} for several runs in one query."""
+    if not run_ids: return {}
+    rows = db.session.query(RunLog.run_id, func.max(RunLog.seq) + 1).filter(RunLog.run_id.in_(run_ids)).group_by(RunLog.run_id)
+    return dict(rows.all())
+
+def delete_pipeline_logs(pipeline_ids):
+    """Bulk-deletes the logs of every run of the given pipelines (a query or a list of ids). The caller commits."""
+    runs = db.session.query(PipelineRun.id).filter(PipelineRun.pipeline_id.in_(pipeline_ids))
+    RunLog.query.filter(RunLog.run_id.in_(runs)).delete(synchronize_session=False)
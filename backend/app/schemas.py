@@ -0,0 +1,77 @@
+import os
+import json
+import numpy as np
+from .models import DatasetSchema
+from .readers import iter_chunks
+
+# Rows parsed per step when a file is scanned for its schema
+SCAN_CHUNK_ROWS = 100_000
+# Dtypes a registered schema may hold: exactly what read_csv infers without parse_dates
+CSV_DTYPES = ('int64', 'uint64', 'float64', 'bool', 'object')
+
+def merge_dtypes(a, b):
+    """
+    Dtype that holds the values of two chunks of the same column, resolved the way a single
+    full-file read_csv would: ints widen to floats, and anything mixing text, booleans and
+    numbers becomes text. 'empty' stands for a chunk where the column was all missing.
+    """
+    if a is None or a == b: return b
+    if a == 'empty': a, b = b, a
+    if b == 'empty':
+        # Missing values turn ints into floats and booleans into text
+        if a in ('int64', 'uint64'): return 'float64'
+        return 'object' if a == 'bool' else a
+    numeric = ('int64', 'uint64', 'float64')
+    if a in numeric and b in numeric:
+        return str(np.result_type(a, b))
+    return 'object'
+
+class SchemaBuilder:
+    """Accumulates one dtype per column over the chunks of a file (see merge_dtypes)."""
+    def __init__(self):
+        self.dtypes = {}
+        self.rows = 0
+
+    def update(self, chunk):
+        self.rows += len(chunk)
+        for col in chunk.columns:
+            series = chunk[col]
+            dtype = 'empty' if not series.notna().any() else str(series.dtype)
+            # Anything read_csv doesn't produce on its own (dates, categories) is read back as text
+            if dtype not in CSV_DTYPES and dtype != 'empty': dtype = 'object'
+            self.dtypes[col] = merge_dtypes(self.dtypes.get(col), dtype)
+
+    def result(self):
+        # A column that is missing everywhere parses as float64, as in pandas
+        return {col: 'float64' if dtype == 'empty' else dtype for col, dtype in self.dtypes.items()}
+
+def scan_file(path, chunksize=SCAN_CHUNK_ROWS):
+    """Full pass over a CSV or JSON Lines file, a chunk at a time. Returns the SchemaBuilder."""
+    builder = SchemaBuilder()
+    for chunk in iter_chunks(path, chunksize):
+        builder.update(chunk)
+    return builder
+
+def file_signature(path):
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+def lookup_schema(path):
+    """Registered dtypes of a file, or None if it has no schema or changed since it was scanned."""
+    record = DatasetSchema.query.filter_by(path=os.path.abspath(path)).first()
+    if not record or (record.file_size, record.file_mtime_ns) != file_signature(path):
+        return None
+    return json.loads(record.dtypes)
+
+def save_schema(session, path, dtypes, row_count):
+    """Adds or refreshes the schema of a file in the session; the caller commits."""
+    path = os.path.abspath(path)
+    record = DatasetSchema.query.filter_by(path=path).first() or DatasetSchema(path=path)
+    record.dtypes = json.dumps(dtypes)
+    record.row_count = row_count
+    record.file_size, record.file_mtime_ns = file_signature(path)
+    session.add(record)
+    return record
+
+def remove_schema(session, path):
+    DatasetSchema.query.filter_by(path=os.path.abspath(path)).delete()
@@ -0,0 +1,295 @@
+import os
+import math
+import pickle
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+
+from .readers import compression_of
+
+# Memory a single join/aggregation/sort may use before it spills to disk (in MB)
+MEMORY_BUDGET_MB = int(os.getenv('PIPELINE_MEMORY_BUDGET_MB', 1024))
+MEMORY_BUDGET = MEMORY_BUDGET_MB * 1024 * 1024
+# Scratch space for spilled data (defaults to the system temp dir)
+SPILL_DIR = os.getenv('PIPELINE_SPILL_DIR') or None
+
+# Approximate in-memory size of a file relative to its size on disk
+FILE_EXPANSION = {'csv': 2.0, 'json': 3.0, 'jsonl': 3.0, 'excel': 4.0, 'parquet': 5.0, 'feather': 1.2}
+# Typical compression ratio of gzip/zstd/bz2 text, applied on top for compressed files
+COMPRESSED_EXPANSION = 5.0
+# pd.merge holds both inputs plus the hash table and the result, roughly this multiple of the inputs
+JOIN_EXPANSION = 3
+# Times a skewed bucket is re-hashed with a new salt before falling back to a chunked merge
+MAX_REPARTITIONS = 2
+# A sub-bucket holding this share of its parent's rows means one key dominates: re-hashing can't split it
+SKEW_SHARE = 0.9
+
+def estimate_frame_bytes(df, sample=1000):
+    """In-memory size of a frame, measuring object (string) columns on a sample instead of on every row."""
+    if len(df) <= sample:
+        return int(df.memory_usage(deep=True, index=False).sum())
+    # Fixed-width and category columns are measured exactly, which is cheap
+    is_object = (df.dtypes == object).to_numpy()
+    exact = df.iloc[:, ~is_object].memory_usage(deep=True, index=False).sum()
+    sampled = df.iloc[:sample, is_object].memory_usage(deep=True, index=False).sum() / sample * len(df)
+    return int(exact + sampled)
+
+def estimate_file_bytes(path, fmt):
+    ratio = COMPRESSED_EXPANSION if compression_of(path) else 1.0
+    return int(os.path.getsize(path) * FILE_EXPANSION.get(fmt, 2.0) * ratio)
+
+def frame_chunks(df, chunksize):
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start:start + chunksize]
+    if df.empty:
+        yield df
+
+class SpillDir:
+    """Scratch directory for one spilling operator, removed with everything in it on exit."""
+    def __enter__(self):
+        self.path = tempfile.mkdtemp(prefix='streamforge-spill-', dir=SPILL_DIR)
+        return self
+
+    def __exit__(self, *exc):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def file(self, name):
+        return os.path.join(self.path, name)
+
+def append_frame(path, df):
+    """Spill files are a sequence of pickled frames, appended one chunk at a time."""
+    with open(path, 'ab') as f:
+        pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+def iter_frames(path):
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
+
+def read_frames(path, schema):
+    frames = list(iter_frames(path))
+    if not frames:
+        return schema
+    return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+def join_keys(data):
+    """Join key setting as a list of columns ('id' or 'region, year')."""
+    return [k.strip() for k in str(data.get('key') or '').split(',') if k.strip()]
+
+def bucket_count(total_bytes, budget):
+    """Enough buckets that merging any one of them fits in the budget, if keys are spread evenly."""
+    return min(1024, max(2, math.ceil(total_bytes * JOIN_EXPANSION / max(budget, 1))))
+
+def key_hash(df, keys, salt=0):
+    """
+    Bucket hash of the key columns. Numeric keys are hashed as floats because pd.merge
+    matches 1 with 1.0; a different salt gives an independent hash for re-partitioning.
+    """
+    cols = {}
+    for key in keys:
+        col = df[key]
+        if pd.api.types.is_numeric_dtype(col):
+            col = col.astype('float64')
+        cols[key] = col
+    return pd.util.hash_pandas_object(pd.DataFrame(cols), index=False, hash_key=f'streamforge{salt:05d}').to_numpy()
+
+class Partitions:
+    """Rows, estimated bytes and an empty schema frame for one side of a partitioned join."""
+    def __init__(self, spill, side, n_buckets):
+        self.spill = spill
+        self.side = side
+        self.rows = np.zeros(n_buckets, dtype=np.int64)
+        self.bytes = np.zeros(n_buckets, dtype=np.float64)
+        self.schema = None
+
+    def path(self, bucket):
+        return self.spill.file(f'{self.side}_{bucket}')
+
+    def read(self, bucket):
+        return read_frames(self.path(bucket), self.schema)
+
+    def chunks(self, bucket):
+        return iter_frames(self.path(bucket))
+
+    def discard(self, bucket):
+        if os.path.exists(self.path(bucket)): os.remove(self.path(bucket))
+
+def partition(chunks, keys, n_buckets, spill, side, salt=0, schema=None):
+    """Writes each chunk's rows to n_buckets spill files chosen by key hash."""
+    parts = Partitions(spill, side, n_buckets)
+    parts.schema = schema
+    for chunk in chunks:
+        if parts.schema is None: parts.schema = chunk.iloc[:0]
+        if chunk.empty: continue
+        missing = [k for k in keys if k not in chunk.columns]
+        if missing:
+            raise ValueError(f"Join key '{', '.join(missing)}' not found in one of the inputs. Columns available: {list(chunk.columns)}")
+        row_bytes = estimate_frame_bytes(chunk) / len(chunk)
+        buckets = key_hash(chunk, keys, salt) % n_buckets
+        order = np.argsort(buckets, kind='stable')
+        bounds = np.searchsorted(buckets[order], np.arange(n_buckets + 1))
+        for bucket in range(n_buckets):
+            lo, hi = bounds[bucket], bounds[bucket + 1]
+            if lo == hi: continue
+            append_frame(parts.path(bucket), chunk.iloc[order[lo:hi]])
+            parts.rows[bucket] += hi - lo
+            parts.bytes[bucket] += (hi - lo) * row_bytes
+    if parts.schema is None:
+        raise ValueError("Join input produced no data.")
+    return parts
+
+def hash_join(left_chunks, right_chunks, keys, how, n_buckets, budget=MEMORY_BUDGET, log=print):
+    """
+    Grace hash join: both inputs are partitioned by key hash into on-disk buckets, then joined
+    bucket by bucket with pd.merge. Yields the result one bucket (or bucket slice) at a time,
+    so only a single bucket pair is in memory at once. Row order differs from a plain pd.merge.
+    """
+    with SpillDir() as spill:
+        left = partition(left_chunks, keys, n_buckets, spill, 'L')
+        right = partition(right_chunks, keys, n_buckets, spill, 'R')
+        log(f"Partitioned join inputs into {n_buckets} buckets ({int(left.rows.sum())} + {int(right.rows.sum())} rows)")
+        for bucket in range(n_buckets):
+            yield from join_bucket(left, right, bucket, keys, how, budget / JOIN_EXPANSION, spill, log, depth=0)
+
+def join_bucket(left, right, bucket, keys, how, bucket_budget, spill, log, depth):
+    l_rows, r_rows = left.rows[bucket], right.rows[bucket]
+    if l_rows == 0 and r_rows == 0: return
+    if how == 'inner' and (l_rows == 0 or r_rows == 0): return
+    if how == 'left' and l_rows == 0: return
+    if how == 'right' and r_rows == 0: return
+
+    if left.bytes[bucket] + right.bytes[bucket] <= bucket_budget:
+        yield pd.merge(left.read(bucket), right.read(bucket), on=keys, how=how)
+        return
+
+    if depth < MAX_REPARTITIONS:
+        # Too big for one merge: split it again with an independent hash
+        n_sub = min(64, max(2, math.ceil((left.bytes[bucket] + right.bytes[bucket]) / bucket_budget)))
+        salt = depth + 1
+        sub_left = partition(left.chunks(bucket), keys, n_sub, spill, f'{left.side}{bucket}.{salt}', salt, left.schema)
+        sub_right = partition(right.chunks(bucket), keys, n_sub, spill, f'{right.side}{bucket}.{salt}', salt, right.schema)
+        left.discard(bucket)
+        right.discard(bucket)
+        total = sub_left.rows + sub_right.rows
+        if total.max() < SKEW_SHARE * total.sum():
+            for sub in range(n_sub):
+                yield from join_bucket(sub_left, sub_right, sub, keys, how, bucket_budget, spill, log, depth + 1)
+            return
+        # One key owns (nearly) the whole bucket: more hashing won't help
+        for sub in range(n_sub):
+            if sub_left.rows[sub] + sub_right.rows[sub] == total.max():
+                yield from chunked_merge(sub_left, sub_right, sub, keys, how, log)
+            else:
+                yield from join_bucket(sub_left, sub_right, sub, keys, how, bucket_budget, spill, log, MAX_REPARTITIONS)
+        return
+
+    yield from chunked_merge(left, right, bucket, keys, how, log)
+
+def chunked_merge(left, right, bucket, keys, how, log):
+    """
+    Skewed bucket: keep one side in memory and merge the other against it one spilled chunk
+    at a time. Only sides whose unmatched rows need no global view may be streamed
+    (either side of an inner join, the preserved side of a left/right join).
+    """
+    stream_side = {'left': 'left', 'right': 'right'}.get(how)
+    if how == 'inner':
+        stream_side = 'left' if left.bytes[bucket] >= right.bytes[bucket] else 'right'
+    log(f"Skewed join key detected: {int(left.rows[bucket] + right.rows[bucket])} rows share one bucket"
+        + (f", merging the {stream_side} side chunk by chunk" if stream_side else ", merging it in one piece (full outer join)"))
+
+    if stream_side == 'left':
+        held = right.read(bucket)
+        for chunk in left.chunks(bucket):
+            yield pd.merge(chunk, held, on=keys, how=how)
+    elif stream_side == 'right':
+        held = left.read(bucket)
+        for chunk in right.chunks(bucket):
+            yield pd.merge(held, chunk, on=keys, how=how)
+    else:
+        yield pd.merge(left.read(bucket), right.read(bucket), on=keys, how=how)
+
+# Rows per block when sorted runs are written out and read back for merging
+MERGE_BLOCK_ROWS = 50_000
+
+def external_sort(chunks, column, ascending, run_bytes, log=print):
+    """
+    External merge sort. Input chunks are collected into runs of about run_bytes, each run is
+    sorted and spilled in blocks, then all runs are merged block by block. Rows whose sort key
+    is null are set aside and yielded last, as with sort_values(na_position='last').
+    Equal keys keep their input order. Input without rows yields one empty frame with its columns.
+    """
+    with SpillDir() as spill:
+        runs, buffer, buffered = [], [], 0
+        schema = None
+        nulls = spill.file('nulls')
+
+        def write_run():
+            run = pd.concat(buffer, ignore_index=True).sort_values(column, ascending=ascending, kind='stable')
+            path = spill.file(f'run_{len(runs)}')
+            for start in range(0, len(run), MERGE_BLOCK_ROWS):
+                append_frame(path, run.iloc[start:start + MERGE_BLOCK_ROWS])
+            runs.append(path)
+
+        for chunk in chunks:
+            if schema is None: schema = chunk.iloc[:0]
+            missing = chunk[column].isna()
+            if missing.any():
+                append_frame(nulls, chunk[missing])
+                chunk = chunk[~missing]
+            if chunk.empty: continue
+            buffer.append(chunk)
+            buffered += estimate_frame_bytes(chunk)
+            if buffered >= run_bytes:
+                write_run()
+                buffer, buffered = [], 0
+        if buffer:
+            write_run()
+            buffer = []
+
+        if not runs and not os.path.exists(nulls):
+            if schema is not None: yield schema
+            return
+        log(f"External sort: merging {len(runs)} sorted runs spilled to disk")
+        yield from merge_runs(runs, column, ascending)
+        yield from iter_frames(nulls)
+
+def merge_runs(paths, column, ascending):
+    """
+    k-way merge of sorted runs, a block at a time: every buffered row that sorts no later than
+    the smallest block-end key among the runs is final, so it is emitted in one vectorised sort.
+    Rows equal to that key wait in the runs after the first one ending on it, whose next block
+    may hold more of them, so equal keys still come out in run (input) order.
+    """
+    readers = [iter_frames(path) for path in paths]
+    buffers = [next(reader, None) for reader in readers]
+    while True:
+        live = [i for i, block in enumerate(buffers) if block is not None]
+        if not live:
+            return
+        if len(live) == 1:
+            yield buffers[live[0]]
+            yield from readers[live[0]]
+            return
+
+        ends = [buffers[i][column].iloc[-1] for i in live]
+        bound = min(ends) if ascending else max(ends)
+        first_end = live[ends.index(bound)]
+        parts = []
+        for i in live:
+            keys = buffers[i][column]
+            # Unordered categories only compare for equality; their values sort like their codes
+            if isinstance(keys.dtype, pd.CategoricalDtype): keys = keys.astype(object)
+            if i <= first_end: final = keys <= bound if ascending else keys >= bound
+            else: final = keys < bound if ascending else keys > bound
+            take = int(final.sum())
+            if take: parts.append(buffers[i].iloc[:take])
+            rest = buffers[i].iloc[take:]
+            buffers[i] = rest if len(rest) else next(readers[i], None)
+        # Parts are concatenated in run order, so a stable sort keeps ties in input order
+        yield pd.concat(parts).sort_values(column, ascending=ascending, kind='stable')
@@ -0,0 +1,173 @@
+import io
+import os
+import bz2
+import zlib
+import hashlib
+import threading
+import pandas as pd
+
+from .readers import file_format, compression_of, iter_chunks, read_json_file, write_sidecar, zstandard
+from .schemas import SchemaBuilder, SCAN_CHUNK_ROWS
+from .profiling import PROFILING, Profiler, profile_frame
+
+# Size of the pieces clients send an upload in (and the form upload is copied in)
+UPLOAD_CHUNK_BYTES = int(os.getenv('UPLOAD_CHUNK_MB', 8)) * 1024 * 1024
+# A chunk request may not carry more than this
+MAX_CHUNK_BYTES = 4 * UPLOAD_CHUNK_BYTES
+# Uploads in progress are appended to files in this hidden folder of the uploads directory
+PARTIAL_DIR = '.partial'
+# Sessions untouched for this long are abandoned and removed
+UPLOAD_SESSION_TTL_HOURS = int(os.getenv('UPLOAD_SESSION_TTL_HOURS', 24))
+# Formats whose rows and column types are read from the bytes as they arrive
+SCANNED_FORMATS = ('csv', 'jsonl')
+
+def decompressor(codec):
+    """Incremental decoder for a compressed upload, or None for plain files."""
+    if codec == 'gzip': return zlib.decompressobj(zlib.MAX_WBITS | 32)
+    if codec == 'bz2': return bz2.BZ2Decompressor()
+    if codec == 'zstd':
+        if zstandard is None: raise ValueError("Zstandard (.zst) files require the 'zstandard' package.")
+        return zstandard.ZstdDecompressor().decompressobj()
+    return None
+
+def record_end(data, fmt, first=False):
+    """
+    Offset just past the last (or, with first=True, the first) complete record in data, 0 if
+    there is none. A CSV newline inside quotes doesn't end a record: data always starts at a
+    record, so a newline ends one when the quotes before it are balanced.
+    """
+    quoted = fmt == 'csv' and b'"' in data
+    pos = len(data) if not first else -1
+    while True:
+        pos = data.find(b'\n', pos + 1) if first else data.rfind(b'\n', 0, pos)
+        if pos == -1: return 0
+        if not quoted or data.count(b'"', 0, pos) % 2 == 0: return pos + 1
+
+class UploadScanner:
+    """
+    Reads an upload once, as it arrives: SHA-256 of the bytes as sent and, for CSV and JSON Lines,
+    the row count, column types and column profile, parsed a block of complete records at a time the
+    way scan_file would (compressed uploads are decompressed on the fly). position is the number of bytes fed.
+    """
+    def __init__(self, filename):
+        self.hasher = hashlib.sha256()
+        self.position = 0
+        self.fmt = file_format(filename)
+        self.schema = SchemaBuilder() if self.fmt in SCANNED_FORMATS else None
+        self.profile = Profiler() if self.schema and PROFILING else None
+        self.decoder = decompressor(compression_of(filename)) if self.schema else None
+        self.header = None
+        self.pending = b''
+
+    def feed(self, data):
+        self.hasher.update(data)
+        self.position += len(data)
+        if self.schema is None: return
+        try:
+            self.parse(self.decoder.decompress(data) if self.decoder else data)
+        except Exception as e:
+            # The upload itself goes on; the file is scanned in full after it completes
+            print(f"Upload scan stopped: {e}")
+            self.schema, self.profile, self.pending = None, None, b''
+
+    def parse(self, data, final=False):
+        data = self.pending + data
+        if self.fmt == 'csv' and self.header is None:
+            end = record_end(data, 'csv', first=True) or (len(data) if final else 0)
+            if not end:
+                self.pending = data
+                return
+            self.header, data = data[:end], data[end:]
+            if not self.header.endswith(b'\n'): self.header += b'\n'
+        end = len(data) if final else record_end(data, self.fmt)
+        block, self.pending = data[:end], data[end:]
+        if not block.strip(): return
+        if self.fmt == 'csv':
+            df = pd.read_csv(io.BytesIO(self.header + block))
+        else:
+            df = pd.read_json(io.BytesIO(block), lines=True, dtype=False, convert_dates=False)
+        self.schema.update(df)
+        if self.profile: self.profile.update(df)
+
+    def finish(self):
+        """Parses whatever is left. Returns (content hash, row count, {column: dtype}, profile), None for what wasn't scanned."""
+        if self.schema is None:
+            return self.hasher.hexdigest(), None, None, None
+        try:
+            tail = self.decoder.flush() if self.decoder and hasattr(self.decoder, 'flush') else b''
+            self.parse(tail, final=True)
+            if self.fmt == 'csv' and self.header is not None and not self.schema.dtypes:
+                # Header without rows: text columns, as read_csv gives them
+                self.schema.update(pd.read_csv(io.BytesIO(self.header)))
+        except Exception as e:
+            print(f"Upload scan stopped: {e}")
+            self.schema = None
+            return self.hasher.hexdigest(), None, None, None
+        return self.hasher.hexdigest(), self.schema.rows, self.schema.result(), self.profile.result() if self.profile else None
+
+    @classmethod
+    def replay(cls, filename, path, length):
+        """Scanner rebuilt from the first length bytes already on disk (after a restart)."""
+        scanner = cls(filename)
+        with open(path, 'rb') as f:
+            while scanner.position < length:
+                data = f.read(min(UPLOAD_CHUNK_BYTES, length - scanner.position))
+                if not data: break
+                scanner.feed(data)
+        return scanner
+
+# Scanners of the sessions this process is receiving, by upload id
+_scanners = {}
+_scanners_lock = threading.Lock()
+
+def session_scanner(session, path):
+    """The scanner of an upload session, positioned at the bytes received so far."""
+    with _scanners_lock:
+        scanner = _scanners.get(session.id)
+        if scanner is None or scanner.position != session.received_bytes:
+            scanner = _scanners[session.id] = UploadScanner.replay(session.filename, path, session.received_bytes)
+        return scanner
+
+def drop_scanner(upload_id):
+    with _scanners_lock:
+        _scanners.pop(upload_id, None)
+
+def append_chunk(path, offset, data):
+    """Writes data at offset, cutting off anything a dropped request left past it."""
+    with open(path, 'r+b' if os.path.exists(path) else 'wb') as f:
+        f.seek(offset)
+        f.truncate()
+        f.write(data)
+
+def copy_stream(stream, path, scanner):
+    """Copies a request stream to path in UPLOAD_CHUNK_BYTES pieces, feeding each to the scanner."""
+    with open(path, 'wb') as f:
+        while True:
+            data = stream.read(UPLOAD_CHUNK_BYTES)
+            if not data: break
+            f.write(data)
+            scanner.feed(data)
+
+def index_file(path, csv_dtypes=None, scanned=True):
+    """
+    The slow part of registering an upload, run on the worker pool: the typed columnar sidecar and
+    whatever the upload scan couldn't provide (JSON arrays, Excel and columnar files, or a scan that
+    failed). Returns the DataSource fields computed here: row_count, columns and profile.
+    """
+    fmt = file_format(path)
+    df, updates = None, {}
+    if fmt in ('json', 'excel') or fmt == 'jsonl' and not scanned:
+        df = read_json_file(path, lines=fmt == 'jsonl') if fmt != 'excel' else pd.read_excel(path)
+        updates = {'row_count': len(df), 'columns': {col: str(dtype) for col, dtype in df.dtypes.items()}}
+        if PROFILING: updates['profile'] = profile_frame(df, path)
+    elif fmt == 'csv' and not scanned or fmt in ('parquet', 'feather'):
+        # One chunked pass for the schema (CSV) and the profile
+        schema, profiler = SchemaBuilder(), Profiler()
+        for chunk in iter_chunks(path, SCAN_CHUNK_ROWS):
+            schema.update(chunk)
+            if PROFILING: profiler.update(chunk)
+        if fmt == 'csv': updates = {'row_count': schema.rows, 'columns': schema.result()}
+        if PROFILING: updates['profile'] = profiler.result(path)
+        csv_dtypes = updates.get('columns', csv_dtypes)
+    if fmt not in ('parquet', 'feather'): write_sidecar(path, df, csv_dtypes)
+    return updates
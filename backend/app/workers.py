@@ -0,0 +1,274 @@
+import os
+import json
+import time
+import socket
+import logging
+import secrets
+import threading
+import multiprocessing
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+# Number of pipelines that may execute at the same time, each in its own process
+WORKER_PROCESSES = int(os.getenv('PIPELINE_WORKERS', max(1, min(4, (os.cpu_count() or 2) // 2))))
+# Seconds the outcome of an unsaved canvas run can still be polled after it finished
+UNSAVED_RUN_TTL = int(os.getenv('UNSAVED_RUN_TTL', 3600))
+
+# Recorded on the runs this server process queues: host, pid and a token for this start, since a
+# restarted container gets the same pid again (see fail_interrupted_runs)
+SERVER_ID = f"{socket.gethostname()}:{os.getpid()}:{secrets.token_hex(4)}"
+
+_pool = None
+_pool_lock = threading.Lock()
+_worker_app = None
+# Runs of unsaved canvases, which have no PipelineRun row: ticket -> {user_id, future, finished_at}
+_unsaved_runs = {}
+_unsaved_lock = threading.Lock()
+
+def init_worker():
+    """Runs once in every worker process: builds a database-only app (no scheduler, routes or sockets)."""
+    global _worker_app
+    from . import create_app
+    _worker_app = create_app(worker=True)
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # 'spawn' so workers never inherit the server's scheduler/socket threads mid-flight
+            _pool = ProcessPoolExecutor(max_workers=WORKER_PROCESSES, mp_context=multiprocessing.get_context('spawn'), initializer=init_worker)
+        return _pool
+
+def reset_pool():
+    """Drops a pool whose worker died so the next submission starts a fresh one."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+def execute_run(user_id, nodes, edges, run_id=None, pipeline_id=None, scheduled=False):
+    """
+    Worker-process entry point. Executes the pipeline and, for saved pipelines, writes the
+    outcome to its PipelineRun row. Returns a plain dict the server uses for its response
+    and for pushing the notification over the socket.
+    """
+    from . import db
+    from .models import Pipeline, PipelineRun, Notification, User
+    from .pipeline_engine import PipelineEngine
+    from .run_logs import RunLogWriter
+
+    with _worker_app.app_context():
+        user = User.query.get(user_id)
+        run_record = PipelineRun.query.get(run_id) if run_id else None
+        pipeline = Pipeline.query.get(pipeline_id) if pipeline_id else None
+        # Saved runs log as they go, so their log can be followed while they execute
+        writer = RunLogWriter(run_record.id) if run_record else None
+        if run_record:
+            run_record.status = 'Running'
+            run_record.start_time = datetime.utcnow()
+            db.session.commit()
+            writer.write(["Scheduled Run Started automatically." if scheduled else "Initializing pipeline..."])
+
+        engine = None
+        try:
+            base_dir = os.path.abspath(os.path.dirname(__file__))
+            engine = PipelineEngine(nodes=nodes, edges=edges, user=user, base_dir=base_dir, db_session=db.session, pipeline_id=pipeline_id, log_writer=writer)
+            logs = engine.run()
+            result = {"status": "Success", "logs": logs, "error": None}
+        except Exception as e:
+            db.session.rollback()
+            failure = ([] if engine else ["Pipeline failed before engine init."]) + [f"CRITICAL ERROR: {str(e)}"]
+            if writer: writer.write(failure)
+            logs = (list(engine.logs) if engine else []) + failure
+            result = {"status": "Failed", "logs": logs, "error": str(e)}
+
+        result["notification"] = None
+        if run_record:
+            if engine: engine.save_metrics(run_record.id)
+            # Every line is in before the status says the run is over
+            writer.flush()
+            run_record.status = result["status"]
+            run_record.end_time = datetime.utcnow()
+            if pipeline:
+                pipeline.status = 'Ready'
+                # One-off date schedules are removed once they have run successfully
+                if scheduled and result["status"] == 'Success' and pipeline.schedule and pipeline.schedule.startswith('date:'):
+                    pipeline.schedule = None
+                result["notification"] = build_notification(pipeline, result, scheduled)
+            if result["notification"]:
+                notif = result["notification"]
+                db.session.add(Notification(user_id=notif["user_id"], message=notif["message"], type=notif["type"]))
+            db.session.commit()
+        return result
+
+def index_upload(source_id, csv_dtypes=None, scanned=True):
+    """
+    Worker-process entry point run after an upload completes: writes the columnar sidecar and fills
+    in row count, column types and profile where the upload scan couldn't (see uploads.index_file).
+    """
+    from . import db
+    from .models import DataSource
+    from .readers import file_format
+    from .schemas import save_schema
+    from .profiling import profile_json
+    from .uploads import index_file
+
+    with _worker_app.app_context():
+        source = DataSource.query.get(source_id)
+        if not source or not os.path.exists(source.filepath): return
+        try:
+            updates = index_file(source.filepath, csv_dtypes, scanned)
+        except Exception as e:
+            print(f"Indexing upload {source.filename} failed: {e}")
+            return
+        if not updates: return
+        if 'row_count' in updates: source.row_count = updates['row_count']
+        if 'columns' in updates:
+            source.columns = json.dumps(updates['columns'])
+            if file_format(source.filepath) == 'csv': save_schema(db.session, source.filepath, updates['columns'], source.row_count)
+        if 'profile' in updates: source.profile = profile_json(updates['profile'])
+        db.session.commit()
+
+def submit_task(fn, *args):
+    """Queues fn(*args) on the worker pool, replacing the pool once if a dead worker broke it."""
+    try:
+        return get_pool().submit(fn, *args)
+    except BrokenProcessPool:
+        reset_pool()
+        return get_pool().submit(fn, *args)
+
+def build_notification(pipeline, result, scheduled):
+    owner = pipeline.owner
+    prefix = "Scheduled Run: " if scheduled else "Pipeline "
+    if result["status"] == 'Success':
+        if not owner.notify_on_success: return None
+        return {"user_id": owner.id, "type": "success", "message": f"{prefix}'{pipeline.name}' completed successfully."}
+    if not owner.notify_on_failure: return None
+    detail = "." if scheduled else f": {result['error']}"
+    return {"user_id": owner.id, "type": "error", "message": f"{prefix}'{pipeline.name}' failed{detail}"}
+
+def submit_run(app, user_id, nodes, edges, run_id=None, pipeline_id=None, scheduled=False):
+    """
+    Queues a pipeline on the worker pool and returns the Future.
+    When it finishes, the server process pushes the notification to the owner's socket room.
+    If the worker crashed, the run row is marked as failed here instead.
+    """
+    from . import db, socketio
+    from .models import Pipeline, PipelineRun
+    from .run_logs import append_logs
+
+    future = submit_task(execute_run, user_id, nodes, edges, run_id, pipeline_id, scheduled)
+
+    def on_done(done):
+        error = done.exception()
+        if error is None:
+            notif = done.result().get("notification")
+            if notif:
+                try:
+                    socketio.emit('notification', {'type': notif['type'], 'message': notif['message']}, room=f"user_{notif['user_id']}")
+                except Exception as e:
+                    print(f"Notif Error: {e}")
+            return
+
+        if isinstance(error, BrokenProcessPool): reset_pool()
+        if not run_id: return
+        with app.app_context():
+            run_record = PipelineRun.query.get(run_id)
+            if run_record and run_record.status in ('Queued', 'Running'):
+                run_record.status = 'Failed'
+                run_record.end_time = datetime.utcnow()
+                append_logs(db.session, run_id, [f"CRITICAL ERROR: Worker process failed: {error}"])
+                pipeline = Pipeline.query.get(pipeline_id)
+                if pipeline: pipeline.status = 'Ready'
+                db.session.commit()
+
+    future.add_done_callback(on_done)
+    return future
+
+def track_unsaved_run(user_id, future):
+    """Registers the run of an unsaved canvas and returns the ticket its outcome is polled with."""
+    ticket = secrets.token_hex(16)
+    entry = {'user_id': user_id, 'future': future, 'finished_at': None}
+    with _unsaved_lock:
+        expire_unsaved_runs()
+        _unsaved_runs[ticket] = entry
+    future.add_done_callback(lambda done: entry.update(finished_at=time.monotonic()))
+    return ticket
+
+def expire_unsaved_runs():
+    """Drops finished unsaved runs nobody polled within UNSAVED_RUN_TTL. Called with _unsaved_lock held."""
+    now = time.monotonic()
+    for ticket in [t for t, e in _unsaved_runs.items() if e['finished_at'] is not None and now - e['finished_at'] > UNSAVED_RUN_TTL]:
+        del _unsaved_runs[ticket]
+
+def unsaved_run_status(ticket, user_id):
+    """{status, logs, error} of one of the user's unsaved runs (the logs once it has finished), or None."""
+    with _unsaved_lock:
+        expire_unsaved_runs()
+        entry = _unsaved_runs.get(ticket)
+    if not entry or entry['user_id'] != user_id: return None
+    future = entry['future']
+    if not future.done():
+        return {"status": 'Running' if future.running() else 'Queued', "logs": [], "error": None}
+    try:
+        result = future.result()
+    except Exception as e:
+        return {"status": 'Failed', "logs": [f"CRITICAL ERROR: Worker process failed: {e}"], "error": f"Worker process failed: {e}"}
+    return {"status": result["status"], "logs": result["logs"], "error": result["error"]}
+
+def process_alive(pid):
+    """Whether a process with this id exists on this machine, checked without signalling it."""
+    if os.name == 'nt':
+        # os.kill would terminate it on Windows
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid) # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle: return False
+        code = ctypes.c_ulong()
+        alive = kernel32.GetExitCodeProcess(handle, ctypes.byref(code)) and code.value == 259 # STILL_ACTIVE
+        kernel32.CloseHandle(handle)
+        return bool(alive)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def owner_alive(owner):
+    """
+    Whether the server process that queued a run (its SERVER_ID) may still be running it. Processes
+    on other hosts can't be checked and count as alive; runs queued before owners were recorded don't.
+    """
+    if not owner: return False
+    if owner == SERVER_ID: return True
+    host, pid, _ = owner.rsplit(':', 2)
+    if host != socket.gethostname(): return True
+    # Our own pid from an earlier start of this server
+    if int(pid) == os.getpid(): return False
+    return process_alive(int(pid))
+
+def fail_interrupted_runs():
+    """
+    Runs left Queued/Running by a server process that has since exited can never finish; mark them
+    failed. Runs of other live server processes (several workers, a reloader) are left alone.
+    """
+    from . import db
+    from .models import PipelineRun
+    from .run_logs import append_logs
+
+    pending = PipelineRun.query.filter(PipelineRun.status.in_(['Queued', 'Running'])).all()
+    stale = [run_record for run_record in pending if not owner_alive(run_record.owner)]
+    for run_record in stale:
+        run_record.status = 'Failed'
+        run_record.end_time = run_record.end_time or datetime.utcnow()
+        append_logs(db.session, run_record.id, ["CRITICAL ERROR: Run interrupted by a server restart."])
+        if run_record.pipeline: run_record.pipeline.status = 'Ready'
+    if stale:
+        db.session.commit()
+        logger.warning("Marked %d interrupted pipeline runs as failed.", len(stale))
@@ -0,0 +1 @@
+"""Synthetic data generator, canonical pipeline graphs and timing harness for PipelineEngine."""
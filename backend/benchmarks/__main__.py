@@ -0,0 +1,54 @@
+import os
+import sys
+import argparse
+
+from .datagen import DatasetSpec
+from .graphs import GRAPHS
+from .harness import DEFAULT_WORKDIR, run_benchmarks, load_baseline, save_baseline, compare
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="Benchmark PipelineEngine on synthetic data.")
+    parser.add_argument('--rows', type=float, default=1e5, help="fact table rows, 1e4 .. 1e8 (default 1e5)")
+    parser.add_argument('--shape', choices=['narrow', 'wide'], default='narrow')
+    parser.add_argument('--cardinality', type=int, default=1000, help="distinct keys/categories")
+    parser.add_argument('--nulls', type=float, default=0.05, help="null fraction in nullable columns")
+    parser.add_argument('--string-length', type=int, default=12)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv')
+    parser.add_argument('--graphs', default=','.join(GRAPHS), help="comma-separated subset of: " + ', '.join(GRAPHS))
+    parser.add_argument('--repeat', type=int, default=3, help="runs per graph; the fastest is reported")
+    parser.add_argument('--no-streaming', action='store_true', help="force the in-memory executor")
+    parser.add_argument('--workdir', default=DEFAULT_WORKDIR, help="where datasets and outputs are kept between runs")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--update-baseline', action='store_true', help="store this run as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed relative slowdown / memory growth")
+    args = parser.parse_args(argv)
+
+    graph_names = [g.strip() for g in args.graphs.split(',') if g.strip()]
+    unknown = [g for g in graph_names if g not in GRAPHS]
+    if unknown:
+        parser.error(f"unknown graphs: {', '.join(unknown)}")
+
+    spec = DatasetSpec(args.rows, args.shape, args.cardinality, args.nulls, args.string_length, args.seed, args.format)
+    report = run_benchmarks(spec, graph_names, args.workdir, args.repeat, streaming=not args.no_streaming)
+
+    if args.update_baseline:
+        save_baseline(report, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    regressions = compare(report, load_baseline(args.baseline), args.tolerance)
+    if regressions is None:
+        print("No comparable baseline (missing, or recorded with a different dataset).")
+        return 0
+    if regressions:
+        print("Regressions against baseline:")
+        for line in regressions: print(f"  - {line}")
+        return 1
+    print(f"No regressions against baseline (tolerance {args.tolerance:.0%}).")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
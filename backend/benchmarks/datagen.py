@@ -0,0 +1,136 @@
+import os
+import string
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# Rows generated (and written) per step, so 10^8-row files never sit in memory at once
+GENERATE_CHUNK_ROWS = 1_000_000
+
+# Extra columns that turn the narrow layout into the wide one
+WIDE_NUMERIC_COLUMNS = 20
+WIDE_STRING_COLUMNS = 14
+
+class DatasetSpec:
+    """
+    Describes one synthetic fact table. The same spec and seed always produce the same rows.
+    cardinality is the number of distinct join/group keys and categories, null_fraction the
+    share of missing values in the nullable columns, string_length the length of free-text values.
+    """
+    def __init__(self, rows, shape='narrow', cardinality=1000, null_fraction=0.05, string_length=12, seed=42, fmt='csv'):
+        if shape not in ('narrow', 'wide'):
+            raise ValueError(f"Unknown shape '{shape}' (expected 'narrow' or 'wide')")
+        if fmt not in ('csv', 'parquet'):
+            raise ValueError(f"Unknown format '{fmt}' (expected 'csv' or 'parquet')")
+        self.rows = int(rows)
+        self.shape = shape
+        self.cardinality = max(1, int(cardinality))
+        self.null_fraction = float(null_fraction)
+        self.string_length = max(1, int(string_length))
+        self.seed = int(seed)
+        self.fmt = fmt
+
+    @property
+    def name(self):
+        return f"{self.shape}_{self.rows}_c{self.cardinality}_n{self.null_fraction:g}_s{self.string_length}_seed{self.seed}.{self.fmt}"
+
+    @property
+    def dimension_name(self):
+        return f"dim_c{self.cardinality}_s{self.string_length}_seed{self.seed}.{self.fmt}"
+
+    def to_dict(self):
+        return {'rows': self.rows, 'shape': self.shape, 'cardinality': self.cardinality, 'null_fraction': self.null_fraction,
+                'string_length': self.string_length, 'seed': self.seed, 'format': self.fmt}
+
+def random_strings(rng, count, length):
+    letters = np.array(list(string.ascii_lowercase + ' '))
+    codes = rng.integers(0, len(letters), size=(count, length))
+    codes[:, 0] = rng.integers(0, 26, size=count) # no leading blanks
+    return np.array([''.join(row) for row in letters[codes]], dtype=object)
+
+def with_nulls(rng, values, fraction):
+    if fraction <= 0:
+        return values
+    values = pd.Series(values)
+    return values.mask(rng.random(len(values)) < fraction)
+
+# Independent random streams derived from the seed
+FACT_STREAM, VOCABULARY_STREAM, DIMENSION_STREAM = 0, 1, 2
+
+@lru_cache(maxsize=4)
+def vocabulary(seed, cardinality, string_length):
+    """Category values (one per key) and a pool of free-text names shared by all chunks."""
+    rng = np.random.default_rng([seed, VOCABULARY_STREAM])
+    return random_strings(rng, min(cardinality, 100_000), string_length), random_strings(rng, 10_000, string_length)
+
+def generate_chunk(spec, start, count):
+    """Rows [start, start + count) of the fact table. Each chunk has its own seed, so chunks are reproducible independently."""
+    rng = np.random.default_rng([spec.seed, FACT_STREAM, start])
+    categories, names = vocabulary(spec.seed, spec.cardinality, spec.string_length)
+
+    keys = rng.integers(0, spec.cardinality, size=count)
+    base_date = np.datetime64('2020-01-01')
+    df = pd.DataFrame({
+        'id': np.arange(start, start + count, dtype=np.int64),
+        'key': keys,
+        'category': with_nulls(rng, categories[keys % len(categories)], spec.null_fraction),
+        'amount': with_nulls(rng, np.round(rng.normal(500, 250, size=count), 2), spec.null_fraction),
+        'quantity': rng.integers(0, 100, size=count),
+        'created': (base_date + rng.integers(0, 365 * 5, size=count).astype('timedelta64[D]')).astype(str),
+        'name': with_nulls(rng, names[rng.integers(0, len(names), size=count)], spec.null_fraction),
+    })
+    if spec.shape == 'wide':
+        for i in range(WIDE_NUMERIC_COLUMNS):
+            df[f'metric_{i}'] = with_nulls(rng, np.round(rng.random(count) * 1000, 3), spec.null_fraction)
+        for i in range(WIDE_STRING_COLUMNS):
+            df[f'attr_{i}'] = with_nulls(rng, names[rng.integers(0, len(names), size=count)], spec.null_fraction)
+    return df
+
+def generate_dimension(spec):
+    """Lookup table with one row per key, used as the right side of join benchmarks."""
+    rng = np.random.default_rng([spec.seed, DIMENSION_STREAM])
+    return pd.DataFrame({
+        'key': np.arange(spec.cardinality, dtype=np.int64),
+        'region': random_strings(rng, spec.cardinality, spec.string_length),
+        'weight': np.round(rng.random(spec.cardinality), 4),
+    })
+
+def write_frames(frames, path, fmt):
+    tmp_path = path + '.tmp'
+    writer = None
+    try:
+        for i, df in enumerate(frames):
+            if fmt == 'csv':
+                df.to_csv(tmp_path, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+            else:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                if writer is None: writer = pq.ParquetWriter(tmp_path, table.schema)
+                writer.write_table(table)
+    finally:
+        if writer is not None: writer.close()
+    os.replace(tmp_path, path)
+
+def ensure_dataset(spec, data_dir):
+    """
+    Writes the fact table and its dimension table into data_dir unless they already exist.
+    Returns (fact filename, dimension filename).
+    """
+    if spec.fmt == 'parquet' and pa is None:
+        raise ValueError("Parquet datasets require the 'pyarrow' package.")
+    os.makedirs(data_dir, exist_ok=True)
+
+    fact_path = os.path.join(data_dir, spec.name)
+    if not os.path.exists(fact_path):
+        chunks = (generate_chunk(spec, start, min(GENERATE_CHUNK_ROWS, spec.rows - start)) for start in range(0, spec.rows, GENERATE_CHUNK_ROWS))
+        write_frames(chunks, fact_path, spec.fmt)
+
+    dim_path = os.path.join(data_dir, spec.dimension_name)
+    if not os.path.exists(dim_path):
+        write_frames([generate_dimension(spec)], dim_path, spec.fmt)
+    return spec.name, spec.dimension_name
@@ -0,0 +1,72 @@
+"""
+Canonical pipeline graphs, built in the same {nodes, edges} shape the builder sends to /run-pipeline.
+Every graph reads the generated fact table (and, for joins, the dimension table).
+"""
+
+def node(node_id, node_type, **data):
+    data.setdefault('label', node_id)
+    return {'id': node_id, 'type': node_type, 'data': data}
+
+def chain(*nodes):
+    return [{'source': a['id'], 'target': b['id']} for a, b in zip(nodes, nodes[1:])]
+
+def source_type(filename):
+    return 'source_parquet' if filename.endswith('.parquet') else 'source_csv'
+
+def filter_heavy(fact, dimension):
+    nodes = [
+        node('source', source_type(fact), filename=fact),
+        node('filter_amount', 'filterNode', column='amount', condition='>', value='100'),
+        node('filter_quantity', 'filterNode', column='quantity', condition='<', value='80'),
+        node('filter_key', 'filterNode', column='key', condition='!=', value='3'),
+        node('select', 'trans_select', columns='id, key, category, amount, quantity'),
+        node('output', 'dest_csv', outputName='bench_filter_heavy'),
+    ]
+    return nodes, chain(*nodes)
+
+def join(fact, dimension):
+    fact_node = node('source', source_type(fact), filename=fact)
+    dim_node = node('dimension', source_type(dimension), filename=dimension)
+    join_node = node('join', 'trans_join', key='key', how='inner')
+    calc_node = node('calc', 'trans_calc', colA='amount', colB='weight', op='*', newCol='weighted')
+    out_node = node('output', 'dest_csv', outputName='bench_join')
+    edges = [{'source': 'source', 'target': 'join'}, {'source': 'dimension', 'target': 'join'}] + chain(join_node, calc_node, out_node)
+    return [fact_node, dim_node, join_node, calc_node, out_node], edges
+
+def group_by(fact, dimension):
+    nodes = [
+        node('source', source_type(fact), filename=fact),
+        node('group', 'trans_group', groupCol='category', targetCol='amount', operation='sum'),
+        node('sort', 'trans_sort', column='amount', order='false'),
+        node('output', 'dest_csv', outputName='bench_group_by'),
+    ]
+    return nodes, chain(*nodes)
+
+def cast_string(fact, dimension):
+    nodes = [
+        node('source', source_type(fact), filename=fact),
+        node('cast_quantity', 'trans_cast', column='quantity', targetType='float'),
+        node('cast_created', 'trans_cast', column='created', targetType='date'),
+        node('upper_name', 'trans_string', column='name', operation='upper'),
+        node('title_category', 'trans_string', column='category', operation='title'),
+        node('output', 'dest_csv', outputName='bench_cast_string'),
+    ]
+    return nodes, chain(*nodes)
+
+def chart(fact, dimension):
+    nodes = [
+        node('source', source_type(fact), filename=fact),
+        node('group', 'trans_group', groupCol='key', targetCol='amount', operation='mean'),
+        node('sort', 'trans_sort', column='amount', order='false'),
+        node('limit', 'trans_limit', limit='50'),
+        node('chart', 'vis_chart', chartType='bar', x_col='key', y_col='amount', outputName='bench_chart'),
+    ]
+    return nodes, chain(*nodes)
+
+GRAPHS = {
+    'filter_heavy': filter_heavy,
+    'join': join,
+    'group_by': group_by,
+    'cast_string': cast_string,
+    'chart': chart,
+}
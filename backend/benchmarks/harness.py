@@ -0,0 +1,126 @@
+import os
+import json
+import time
+import platform
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from .datagen import ensure_dataset
+from .graphs import GRAPHS
+
+DEFAULT_WORKDIR = os.path.join(tempfile.gettempdir(), 'streamforge-bench')
+MB = 1024 * 1024
+
+def prepare_workdir(workdir):
+    """The engine resolves uploads/ and processed/ relative to its base_dir, so mirror the backend layout."""
+    for sub in ('app', 'uploads', 'processed'):
+        os.makedirs(os.path.join(workdir, sub), exist_ok=True)
+    return os.path.join(workdir, 'uploads')
+
+def run_case(graph_name, fact, dimension, workdir, streaming=True):
+    """
+    Runs one graph once through PipelineEngine against a scratch SQLite database.
+    Meant to be called in a fresh process so peak RSS belongs to this case alone.
+    """
+    from flask import Flask
+    from app import db
+    from app.models import User
+    from app.pipeline_engine import PipelineEngine, current_rss, peak_rss
+
+    app = Flask('benchmarks')
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        user = User.query.filter_by(username='bench').first()
+        if not user:
+            user = User(username='bench', email='bench@streamforge.io', password_hash='-')
+            db.session.add(user)
+            db.session.commit()
+
+        nodes, edges = GRAPHS[graph_name](fact, dimension)
+        engine = PipelineEngine(nodes, edges, user, os.path.join(workdir, 'app'), db.session, streaming=streaming)
+        rss_before = current_rss() or 0
+        start = time.perf_counter()
+        engine.run()
+        wall = time.perf_counter() - start
+        peak = peak_rss()
+
+        return {
+            'wall_time': wall,
+            'peak_mem_mb': round(max(0, (peak or 0) - rss_before) / MB, 1),
+            'nodes': {nid: round(m['wall_time'], 4) for nid, m in engine.metrics.items()},
+            'streamed': any('Streaming mode' in line for line in engine.logs),
+        }
+
+def run_benchmarks(spec, graph_names, workdir=DEFAULT_WORKDIR, repeat=1, streaming=True, progress=print):
+    """
+    Generates (or reuses) the dataset, then runs every graph `repeat` times, each run in its own
+    process. Keeps the fastest run's timings and the largest memory peak.
+    """
+    data_dir = prepare_workdir(workdir)
+    started = time.perf_counter()
+    fact, dimension = ensure_dataset(spec, data_dir)
+    progress(f"Dataset ready: {fact} ({time.perf_counter() - started:.1f}s)")
+
+    results = {}
+    context = multiprocessing.get_context('spawn')
+    for name in graph_names:
+        runs = []
+        for _ in range(max(1, repeat)):
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                runs.append(pool.submit(run_case, name, fact, dimension, workdir, streaming).result())
+        best = min(runs, key=lambda r: r['wall_time'])
+        results[name] = {
+            'wall_time': round(best['wall_time'], 4),
+            'rows_per_sec': round(spec.rows / best['wall_time']) if best['wall_time'] > 0 else None,
+            'peak_mem_mb': max(r['peak_mem_mb'] for r in runs),
+            'streamed': best['streamed'],
+            'nodes': best['nodes'],
+        }
+        progress(format_result(name, results[name]))
+
+    return {
+        'dataset': spec.to_dict(),
+        'environment': {'python': platform.python_version(), 'machine': platform.machine(), 'cpus': os.cpu_count()},
+        'results': results,
+    }
+
+def format_result(name, result):
+    hottest = max(result['nodes'].items(), key=lambda item: item[1]) if result['nodes'] else ('-', 0)
+    mode = 'streamed' if result['streamed'] else 'in-memory'
+    return (f"{name:<14} {result['wall_time']:>9.3f}s {result['rows_per_sec'] or 0:>13,} rows/s "
+            f"{result['peak_mem_mb']:>9.1f} MB peak  [{mode}; slowest node: {hottest[0]} {hottest[1]:.3f}s]")
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def save_baseline(report, path):
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+def compare(report, baseline, tolerance=0.25, min_mem_mb=16):
+    """
+    Lists regressions against a stored baseline: throughput down by more than `tolerance`,
+    or peak memory up by more than `tolerance` (ignoring growth below min_mem_mb).
+    Baselines recorded with a different dataset are not comparable and yield no findings.
+    """
+    if not baseline or baseline.get('dataset') != report['dataset']:
+        return None
+    regressions = []
+    for name, result in report['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if not base: continue
+        if base.get('rows_per_sec') and result['rows_per_sec'] < base['rows_per_sec'] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {result['rows_per_sec']:,} rows/s vs baseline {base['rows_per_sec']:,} rows/s")
+        growth = result['peak_mem_mb'] - base.get('peak_mem_mb', 0)
+        if growth > min_mem_mb and result['peak_mem_mb'] > base.get('peak_mem_mb', 0) * (1 + tolerance):
+            regressions.append(f"{name}: peak memory {result['peak_mem_mb']} MB vs baseline {base['peak_mem_mb']} MB")
+    return regressions
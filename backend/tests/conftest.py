@@ -0,0 +1,43 @@
+import os
+import pytest
+from flask import Flask
+
+from app import db
+from app.database import init_database
+from app.models import User
+from app.pipeline_engine import PipelineEngine
+
+@pytest.fixture
+def workdir(tmp_path):
+    """The engine resolves uploads/ and processed/ relative to its base_dir, so mirror the backend layout."""
+    for sub in ('app', 'uploads', 'processed'):
+        (tmp_path / sub).mkdir()
+    return tmp_path
+
+@pytest.fixture
+def flask_app(workdir):
+    app = Flask('tests')
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{workdir / 'tests.db'}"
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        init_database()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+@pytest.fixture
+def user(flask_app):
+    user = User(username='tests', email='tests@streamforge.io', password_hash='-')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+@pytest.fixture
+def run_pipeline(workdir, user):
+    """Runs a graph through PipelineEngine (extra keyword arguments go to the engine) and returns the engine."""
+    def run(nodes, edges, **kwargs):
+        engine = PipelineEngine(nodes, edges, user, os.path.join(workdir, 'app'), db.session, **kwargs)
+        engine.run()
+        return engine
+    return run
@@ -0,0 +1,47 @@
+import pandas as pd
+import pytest
+
+from benchmarks import datagen
+from benchmarks.datagen import DatasetSpec, ensure_dataset, generate_chunk
+from benchmarks.graphs import GRAPHS
+from benchmarks.harness import prepare_workdir, run_case, compare
+
+def test_chunks_are_reproducible_on_their_own(tmp_path, monkeypatch):
+    spec = DatasetSpec(250, cardinality=20, seed=3)
+    monkeypatch.setattr(datagen, 'GENERATE_CHUNK_ROWS', 100)
+    fact, dimension = ensure_dataset(spec, str(tmp_path))
+    written = pd.read_csv(tmp_path / fact)
+    assert written['id'].tolist() == list(range(250)) and written['key'].max() < 20
+    # Any chunk can be regenerated without the ones before it
+    middle = generate_chunk(spec, 100, 100)
+    pd.testing.assert_frame_equal(written.iloc[100:200].reset_index(drop=True), middle, check_dtype=False)
+    assert len(pd.read_csv(tmp_path / dimension)) == 20
+
+def test_spec_controls_shape_and_nulls():
+    narrow = generate_chunk(DatasetSpec(2000, null_fraction=0), 0, 2000)
+    wide = generate_chunk(DatasetSpec(2000, 'wide', null_fraction=0.3, string_length=5), 0, 2000)
+    assert narrow.notna().all().all()
+    assert len(wide.columns) == len(narrow.columns) + datagen.WIDE_NUMERIC_COLUMNS + datagen.WIDE_STRING_COLUMNS
+    assert 0.25 < wide['amount'].isna().mean() < 0.35
+    assert wide['name'].dropna().str.len().eq(5).all()
+    with pytest.raises(ValueError, match="Unknown shape"):
+        DatasetSpec(10, shape='tall')
+
+@pytest.mark.parametrize('fmt', ['csv', 'parquet'])
+def test_every_graph_runs_on_a_small_dataset(tmp_path, fmt):
+    workdir = str(tmp_path)
+    fact, dimension = ensure_dataset(DatasetSpec(500, cardinality=10, fmt=fmt), prepare_workdir(workdir))
+    for name in GRAPHS:
+        result = run_case(name, fact, dimension, workdir)
+        assert result['wall_time'] > 0 and result['nodes'], name
+
+def test_compare_flags_slowdowns_and_memory_growth():
+    dataset = DatasetSpec(1000).to_dict()
+    baseline = {'dataset': dataset, 'results': {'sort': {'rows_per_sec': 1000, 'peak_mem_mb': 100}}}
+    report = lambda rate, mem: {'dataset': dataset, 'results': {'sort': {'rows_per_sec': rate, 'peak_mem_mb': mem}}}
+    assert compare(report(900, 110), baseline) == []
+    assert compare(report(700, 200), baseline) == [
+        "sort: throughput 700 rows/s vs baseline 1,000 rows/s",
+        "sort: peak memory 200 MB vs baseline 100 MB",
+    ]
+    assert compare(report(1, 1), dict(baseline, dataset=DatasetSpec(10).to_dict())) is None
@@ -0,0 +1,63 @@
+import json
+import pytest
+
+from app import db, catalog
+from app.catalog import search_catalog, ensure_catalog_index, catalog_entry
+from app.models import DataSource, ProcessedFile, User
+
+@pytest.fixture
+def indexed(user, monkeypatch):
+    monkeypatch.setattr(catalog, '_fts_ready', None)
+    ensure_catalog_index()
+    assert catalog.fts_ready()
+    other = User(username='other', email='other@streamforge.io', password_hash='-')
+    db.session.add(other)
+    db.session.flush()
+    db.session.add_all([
+        DataSource(filename='orders_2024.csv', user_id=user.id, columns=json.dumps({'order_id': 'int64', 'total': 'float64'})),
+        DataSource(filename='customers.csv', user_id=user.id, columns=json.dumps({'customer_id': 'int64', 'orders': 'int64'})),
+        ProcessedFile(filename='orders_summary.csv', file_type='CSV', user_id=user.id, columns=json.dumps({'region': 'object'})),
+        DataSource(filename='inventory.csv', user_id=user.id, columns=json.dumps({'sku': 'object', 'qty': 'int64'})),
+        DataSource(filename='orders_private.csv', user_id=other.id, columns='{}'),
+    ])
+    db.session.commit()
+    return user
+
+def names(records):
+    return [r.filename for r in records]
+
+def test_filename_matches_rank_above_column_matches(indexed):
+    records, cursor = search_catalog(indexed.id, 'orders')
+    assert cursor is None
+    assert set(names(records[:2])) == {'orders_2024.csv', 'orders_summary.csv'} and names(records)[2:] == ['customers.csv']
+
+def test_every_word_matches_as_a_prefix(indexed):
+    assert names(search_catalog(indexed.id, 'ord 2024')[0]) == ['orders_2024.csv']
+    assert names(search_catalog(indexed.id, 'sk')[0]) == ['inventory.csv']
+    # dtypes are not indexed
+    assert search_catalog(indexed.id, 'float64')[0] == []
+
+def test_pages_cover_every_match_once(indexed):
+    first, cursor = search_catalog(indexed.id, 'orders', limit=2)
+    rest, end = search_catalog(indexed.id, 'orders', limit=2, cursor=cursor)
+    assert end is None and names(first + rest) == names(search_catalog(indexed.id, 'orders')[0])
+
+def test_index_follows_renames_and_deletes(indexed):
+    source = DataSource.query.filter_by(filename='inventory.csv').one()
+    source.filename = 'stock_levels.csv'
+    db.session.commit()
+    assert names(search_catalog(indexed.id, 'stock')[0]) == ['stock_levels.csv']
+    assert search_catalog(indexed.id, 'inventory')[0] == []
+    db.session.delete(ProcessedFile.query.one())
+    db.session.commit()
+    assert 'orders_summary.csv' not in names(search_catalog(indexed.id, 'orders')[0])
+
+def test_like_fallback_finds_the_same_entries(indexed, monkeypatch):
+    ranked = set(names(search_catalog(indexed.id, 'orders')[0]))
+    monkeypatch.setattr(catalog, '_fts_ready', False)
+    assert set(names(search_catalog(indexed.id, 'orders')[0])) == ranked
+
+def test_entry_lists_what_matched(indexed):
+    [record] = search_catalog(indexed.id, 'customer')[0]
+    entry = catalog_entry(record, 'customer')
+    assert entry['type'] == 'Source' and entry['matches'] == ['Filename', 'Column: customer_id']
@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+
+from app.models import ProcessedFile
+from benchmarks.graphs import node, chain
+
+def typed_frame():
+    return pd.DataFrame({
+        'id': pd.Series(range(50), dtype='int32'),
+        'price': [i / 4 if i % 7 else None for i in range(50)],
+        'when': pd.date_range('2024-01-01', periods=50, freq='h'),
+        'flag': [i % 3 == 0 for i in range(50)],
+        'name': [f'item{i}' for i in range(50)],
+    })
+
+@pytest.mark.parametrize('streaming', [True, False])
+@pytest.mark.parametrize('fmt', ['parquet', 'feather'])
+def test_columnar_round_trip_keeps_dtypes(workdir, run_pipeline, fmt, streaming):
+    df = typed_frame()
+    path = workdir / 'uploads' / f'typed.{fmt}'
+    df.to_parquet(path) if fmt == 'parquet' else df.to_feather(path)
+    nodes = [node('s', f'source_{fmt}', filename=path.name), node('d', f'dest_{fmt}', outputName='out')]
+    run_pipeline(nodes, chain(*nodes), streaming=streaming, chunk_size=16)
+    out = workdir / 'processed' / f'out.{fmt}'
+    result = pd.read_parquet(out) if fmt == 'parquet' else pd.read_feather(out)
+    pd.testing.assert_frame_equal(result, df)
+    [record] = ProcessedFile.query.all()
+    assert record.filename == f'out.{fmt}' and record.file_type == fmt.capitalize() and record.row_count == 50
+
+def test_columnar_source_feeds_text_destination(workdir, run_pipeline):
+    typed_frame().to_parquet(workdir / 'uploads' / 'typed.parquet')
+    nodes = [
+        node('s', 'source_parquet', filename='typed.parquet'),
+        node('f', 'filterNode', column='id', condition='<', value='3'),
+        node('d', 'dest_csv', outputName='out'),
+    ]
+    run_pipeline(nodes, chain(*nodes))
+    out = pd.read_csv(workdir / 'processed' / 'out.csv')
+    assert out['when'].tolist() == ['2024-01-01 00:00:00', '2024-01-01 01:00:00', '2024-01-01 02:00:00']
+    assert out['flag'].tolist() == [True, False, False]
@@ -0,0 +1,118 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+
+from app import pipeline_engine
+from app.compaction import compact_frame, restore
+from app.models import ProcessedFile
+from benchmarks.graphs import node, chain
+
+def sales_frame(rows=200):
+    return pd.DataFrame({
+        'id': np.arange(1, rows + 1),
+        'region': [['North', 'South', 'East'][i % 3] for i in range(rows)],
+        'day': [f'2020-01-{i % 28 + 1:02d}' for i in range(rows)],
+        'stamp': [f'2021-03-04 {i % 24:02d}:{i % 60:02d}:05' for i in range(rows)],
+        'amount': [i * 0.5 for i in range(rows)],
+    })
+
+@pytest.fixture
+def sales(workdir):
+    sales_frame().to_csv(workdir / 'uploads' / 'sales.csv', index=False)
+    return 'sales.csv'
+
+@pytest.fixture
+def run_compacted(run_pipeline, monkeypatch, workdir):
+    """Runs a graph ending in a Parquet destination with and without compaction; returns both outputs."""
+    def run(nodes, edges):
+        outputs = []
+        for compact in (True, False):
+            monkeypatch.setattr(pipeline_engine, 'COMPACT_DTYPES', compact)
+            engine = run_pipeline(nodes, edges, streaming=False)
+            assert any(line.startswith('Compacted') for line in engine.logs) == compact
+            outputs.append(pd.read_parquet(workdir / 'processed' / 'out.parquet'))
+        return outputs
+    return run
+
+def test_round_trip_restores_loaded_values_and_dtypes():
+    df = pd.DataFrame({
+        'small': [1, 2, 3, 4],
+        'ratio': [0.5, 0.25, np.nan, 1.0],
+        'day': ['2020-01-01', np.nan, '2020-02-29', '2020-01-01'],
+        'stamp': ['2020-01-01 10:00:00', '2020-01-01 10:00:01', '2020-01-01 10:00:00', np.nan],
+        'impossible': ['2021-02-30', '2021-02-28', '2021-02-27', '2021-02-26'],
+        'loose': ['2020-1-1', '2020-01-01', '2020-01-02', '2020-01-03'],
+        'none': ['2020-01-01', None, '2020-01-01', '2020-01-01'],
+        'region': ['a', 'a', 'a', np.nan],
+        'flag': [True, False, True, True],
+    })
+    compacted, changes, originals = compact_frame(df)
+    assert changes == {'integers': 1, 'floats': 1, 'dates': 2, 'categories': 1}
+    assert set(originals) == {'small', 'ratio', 'day', 'stamp', 'region'}
+    pd.testing.assert_frame_equal(restore(compacted, originals), df)
+
+def test_restore_leaves_replaced_columns_alone():
+    df, _, originals = compact_frame(pd.DataFrame({'small': [1, 2, 3], 'day': ['2020-01-01'] * 3}))
+    df['small'] = df['small'].astype('float64') * 1.5
+    restored = restore(df, originals)
+    assert restored['small'].tolist() == [1.5, 3.0, 4.5]
+    assert restored['day'].tolist() == ['2020-01-01'] * 3
+
+def test_python_node_sees_loaded_integers(sales, run_compacted):
+    nodes = [
+        node('s', 'sourceNode', filename=sales),
+        node('p', 'trans_python', code="df['id'] = df['id'] * 1000"),
+        node('d', 'dest_parquet', outputName='out'),
+    ]
+    compacted, plain = run_compacted(nodes, chain(*nodes))
+    assert compacted['id'].tolist() == list(range(1000, 200_001, 1000))
+    pd.testing.assert_frame_equal(compacted, plain)
+
+def test_python_node_can_write_new_category_values(sales, run_compacted):
+    nodes = [
+        node('s', 'sourceNode', filename=sales),
+        node('p', 'trans_python', code="df.loc[0, 'region'] = 'Antarctica'"),
+        node('d', 'dest_parquet', outputName='out'),
+    ]
+    compacted, plain = run_compacted(nodes, chain(*nodes))
+    assert compacted.loc[0, 'region'] == 'Antarctica'
+    pd.testing.assert_frame_equal(compacted, plain)
+
+@pytest.mark.parametrize('target', ['int', 'float', 'string'])
+def test_cast_of_date_text_matches_uncompacted(sales, run_compacted, target):
+    nodes = [
+        node('s', 'sourceNode', filename=sales),
+        node('c', 'trans_cast', column='day', targetType=target),
+        node('d', 'dest_parquet', outputName='out'),
+    ]
+    compacted, plain = run_compacted(nodes, chain(*nodes))
+    pd.testing.assert_frame_equal(compacted, plain)
+
+def test_filter_compares_loaded_text(sales, run_compacted):
+    # The dedupe keeps the filter from being pushed into the read, before compaction
+    nodes = [
+        node('s', 'sourceNode', filename=sales),
+        node('u', 'trans_dedupe'),
+        node('f', 'filterNode', column='day', condition='<', value='2020-01-1'),
+        node('d', 'dest_parquet', outputName='out'),
+    ]
+    compacted, plain = run_compacted(nodes, chain(*nodes))
+    assert sorted(compacted['day'].unique()) == [f'2020-01-0{i}' for i in range(1, 10)]
+    pd.testing.assert_frame_equal(compacted, plain)
+
+def test_outputs_keep_loaded_dtypes(sales, run_compacted, flask_app):
+    left, right = node('s', 'sourceNode', filename=sales), node('j', 'sourceNode', filename=sales)
+    ordered = node('o', 'trans_sort', column='day', order='false')
+    renamed = node('r', 'trans_rename', oldName='amount', newName='total')
+    join, out = node('k', 'trans_join', key='id', how='inner'), node('d', 'dest_parquet', outputName='out')
+    edges = chain(left, ordered, join, out) + chain(right, renamed, join)
+    compacted, plain = run_compacted([left, ordered, right, renamed, join, out], edges)
+    pd.testing.assert_frame_equal(compacted, plain)
+    assert compacted.dtypes.to_dict() == {
+        'id': 'int64', 'region_x': object, 'day_x': object, 'stamp_x': object, 'amount': 'float64',
+        'region_y': object, 'day_y': object, 'stamp_y': object, 'total': 'float64'
+    }
+    recorded = [json.loads(f.columns) for f in ProcessedFile.query.filter_by(filename='out.parquet')]
+    assert len(recorded) == 2 and recorded[0] == recorded[1]
+    assert recorded[0]['id'] == 'int64' and recorded[0]['day_x'] == 'object'
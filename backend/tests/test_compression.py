@@ -0,0 +1,35 @@
+import io
+import pandas as pd
+import pytest
+
+from app.readers import open_text, file_format
+from benchmarks.graphs import node, chain
+
+CODECS = {'gzip': '.gz', 'bz2': '.bz2', 'zstd': '.zst'}
+FRAME = pd.DataFrame({'id': range(25), 'name': [f'n{i}' for i in range(25)], 'value': [i / 3 for i in range(25)]})
+
+def write(path, fmt):
+    with open_text(str(path), 'w', newline='') as handle:
+        handle.write(FRAME.to_csv(index=False) if fmt == 'csv' else FRAME.to_json(orient='records', lines=True))
+
+@pytest.mark.parametrize('streaming', [True, False])
+@pytest.mark.parametrize('fmt, dest', [('csv', 'dest_csv'), ('jsonl', 'dest_jsonl'), ('jsonl', 'dest_json')])
+@pytest.mark.parametrize('codec', list(CODECS))
+def test_compressed_files_read_and_write_like_plain_ones(workdir, run_pipeline, codec, fmt, dest, streaming):
+    filename = f'data.{fmt}{CODECS[codec]}'
+    write(workdir / 'uploads' / filename, fmt)
+    assert file_format(filename) == fmt
+    nodes = [
+        node('s', f'source_{fmt}', filename=filename),
+        node('f', 'filterNode', column='id', condition='<', value='10'),
+        node('d', dest, outputName='out', compression=codec),
+    ]
+    run_pipeline(nodes, chain(*nodes), streaming=streaming, chunk_size=6)
+    ext = {'dest_csv': 'csv', 'dest_jsonl': 'jsonl', 'dest_json': 'json'}[dest]
+    with open_text(str(workdir / 'processed' / f'out.{ext}{CODECS[codec]}')) as handle:
+        text = handle.read()
+    out = pd.read_csv(io.StringIO(text)) if dest == 'dest_csv' else pd.read_json(io.StringIO(text), lines=dest == 'dest_jsonl')
+    pd.testing.assert_frame_equal(out, FRAME.head(10))
+
+def test_excel_and_parquet_are_not_compressible():
+    assert file_format('book.xlsx.gz') is None and file_format('t.parquet.zst') is None
@@ -0,0 +1,26 @@
+import pandas as pd
+
+from benchmarks.graphs import node, chain
+
+def test_engine_leaves_pandas_options_alone():
+    import app.pipeline_engine
+    assert pd.get_option('mode.copy_on_write') is False
+
+def test_branches_never_see_each_others_writes(workdir, run_pipeline):
+    # Values compaction leaves as they are (float32 can't hold 0.1, names are all distinct), so every branch shares the source's buffers
+    pd.DataFrame({'name': ['a', 'b', 'c'], 'val': [0.1, None, 0.3]}).to_csv(workdir / 'uploads' / 'shared.csv', index=False)
+    source = node('s', 'source_csv', filename='shared.csv')
+    script = node('p', 'trans_python', code="df.loc[:, 'val'] = -1.5\ndf.loc[0, 'name'] = 'z'")
+    fill = node('f', 'trans_fillna', column='val', value='0')
+    constant = node('c', 'trans_constant', colName='name', value='k')
+    untouched = node('u', 'trans_dedupe')
+    outputs = [node(f'd{i}', 'dest_csv', outputName=f'out{i}') for i in range(4)]
+    edges = []
+    for branch, out in zip((script, fill, constant, untouched), outputs):
+        edges += chain(source, branch, out)
+    run_pipeline([source, script, fill, constant, untouched] + outputs, edges, streaming=False)
+    read = lambda i: pd.read_csv(workdir / 'processed' / f'out{i}.csv')
+    assert read(0).to_dict('list') == {'name': ['z', 'b', 'c'], 'val': [-1.5, -1.5, -1.5]}
+    assert read(1).to_dict('list') == {'name': ['a', 'b', 'c'], 'val': [0.1, 0.0, 0.3]}
+    assert read(2)['name'].tolist() == ['k', 'k', 'k']
+    pd.testing.assert_frame_equal(read(3), pd.read_csv(workdir / 'uploads' / 'shared.csv'))
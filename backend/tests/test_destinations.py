@@ -0,0 +1,28 @@
+import json
+import sqlite3
+import pandas as pd
+import pytest
+
+from benchmarks.graphs import node, chain
+
+OUTPUTS = {
+    'dest_csv': lambda path: pd.read_csv(path, dtype=str)['day'].tolist(),
+    'dest_json': lambda path: [r['day'] for r in json.load(open(path))],
+    'dest_jsonl': lambda path: [json.loads(line)['day'] for line in open(path)],
+    'dest_excel': lambda path: pd.read_excel(path, dtype=str)['day'].tolist(),
+    'dest_db': lambda path: [r[0] for r in sqlite3.connect(path).execute('SELECT day FROM export_data')],
+}
+EXTENSIONS = {'dest_csv': 'csv', 'dest_json': 'json', 'dest_jsonl': 'jsonl', 'dest_excel': 'xlsx', 'dest_db': 'db'}
+
+@pytest.mark.parametrize('streaming', [True, False])
+@pytest.mark.parametrize('dest', list(OUTPUTS))
+def test_dates_are_written_as_the_same_text(workdir, run_pipeline, dest, streaming):
+    days = ['2020-01-01', '2020-02-29', '2021-12-31']
+    pd.DataFrame({'id': [1, 2, 3], 'day': days}).to_csv(workdir / 'uploads' / 'days.csv', index=False)
+    nodes = [
+        node('s', 'source_csv', filename='days.csv'),
+        node('c', 'trans_cast', column='day', targetType='date'),
+        node('d', dest, outputName='out'),
+    ]
+    run_pipeline(nodes, chain(*nodes), streaming=streaming)
+    assert OUTPUTS[dest](workdir / 'processed' / f'out.{EXTENSIONS[dest]}') == days
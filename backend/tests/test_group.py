@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app import pipeline_engine
+from benchmarks.graphs import node, chain
+
+def write_sales(workdir, rows=5000):
+    rng = np.random.default_rng(3)
+    amount = rng.normal(100, 40, rows).round(2)
+    amount[rng.random(rows) < 0.05] = np.nan
+    pd.DataFrame({
+        'region': rng.choice(['North', 'South', 'East', 'West'], rows),
+        'store': rng.integers(0, 60, rows),
+        'amount': amount,
+        'units': rng.integers(1, 9, rows),
+    }).to_csv(workdir / 'uploads' / 'sales.csv', index=False)
+
+def group_graph(group_col, target_col, operation):
+    nodes = [
+        node('s', 'source_csv', filename='sales.csv'),
+        node('f', 'filterNode', column='units', condition='>', value='2'),
+        node('c', 'trans_calc', colA='amount', colB='units', op='*', newCol='revenue'),
+        node('g', 'trans_group', groupCol=group_col, targetCol=target_col, operation=operation),
+        node('d', 'dest_csv', outputName='out'),
+    ]
+    return nodes, chain(*nodes)
+
+# The calc assigns to what the filter returned: each folded node needs its own frame
+@pytest.mark.filterwarnings('error::pandas.errors.SettingWithCopyWarning')
+@pytest.mark.parametrize('operation', ['sum', 'count', 'min', 'max', 'mean'])
+@pytest.mark.parametrize('group_col, target_col', [('region', 'revenue'), ('store', 'amount'), ('store', 'region')])
+def test_partial_aggregation_matches_in_memory_group(workdir, run_pipeline, monkeypatch, group_col, target_col, operation):
+    if target_col == 'region' and operation == 'mean': pytest.skip("mean of text fails on both paths")
+    write_sales(workdir)
+    nodes, edges = group_graph(group_col, target_col, operation)
+    engine = run_pipeline(nodes, edges, chunk_size=700)
+    assert any(f'({operation}) over 8 chunks' in line for line in engine.logs)
+    chunked = pd.read_csv(workdir / 'processed' / 'out.csv')
+    monkeypatch.setattr(pipeline_engine, 'PARTIAL_GROUP_OPS', set())
+    engine = run_pipeline(nodes, edges, chunk_size=700)
+    assert not engine.partial_groups
+    in_memory = pd.read_csv(workdir / 'processed' / 'out.csv')
+    pd.testing.assert_frame_equal(chunked, in_memory, check_exact=False, rtol=1e-9)
@@ -0,0 +1,39 @@
+import os
+import socket
+import subprocess
+import sys
+
+from app import db
+from app.models import Pipeline, PipelineRun
+from app.run_logs import log_tail
+from app.workers import SERVER_ID, fail_interrupted_runs
+
+def exited_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+def test_only_runs_of_exited_servers_are_failed(user):
+    host = socket.gethostname()
+    owners = {
+        'this process': SERVER_ID,
+        'live process': f"{host}:{os.getppid()}:0000",
+        'other host': f"elsewhere.internal:{os.getpid()}:0000",
+        'earlier start': f"{host}:{os.getpid()}:0000",
+        'exited process': f"{host}:{exited_pid()}:0000",
+        'before owners': None,
+    }
+    runs = {}
+    for name, owner in owners.items():
+        pipeline = Pipeline(name=name, structure='[]', user_id=user.id, status='Active')
+        db.session.add(pipeline)
+        db.session.flush()
+        runs[name] = PipelineRun(pipeline_id=pipeline.id, status='Running', owner=owner)
+        db.session.add(runs[name])
+    db.session.commit()
+
+    fail_interrupted_runs()
+    failed = {name for name, run in runs.items() if run.status == 'Failed'}
+    assert failed == {'earlier start', 'exited process', 'before owners'}
+    assert {name for name, run in runs.items() if run.pipeline.status == 'Ready'} == failed
+    assert log_tail(runs['exited process'].id) == ["CRITICAL ERROR: Run interrupted by a server restart."]
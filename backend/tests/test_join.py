@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.graphs import node, chain
+
+def write_skewed(workdir, rows=3000):
+    """Most left rows share key 0, so one bucket stays over budget however often it is re-hashed."""
+    rng = np.random.default_rng(11)
+    keys = np.where(rng.random(rows) < 0.8, 0, rng.integers(1, 400, rows))
+    pd.DataFrame({'key': keys, 'left_val': np.arange(rows)}).to_csv(workdir / 'uploads' / 'left.csv', index=False)
+    right_keys = np.concatenate([np.zeros(4, dtype=int), np.arange(200, 600)])
+    pd.DataFrame({'key': right_keys, 'right_val': rng.choice(['x', 'y', 'z'], len(right_keys))}).to_csv(workdir / 'uploads' / 'right.csv', index=False)
+
+def join_graph(how, dest='dest_csv'):
+    left, right = node('l', 'source_csv', filename='left.csv'), node('r', 'source_csv', filename='right.csv')
+    join, out = node('j', 'trans_join', key='key', how=how), node('d', dest, outputName='out')
+    return [left, right, join, out], chain(left, join, out) + chain(right, join)
+
+def read_sorted(path):
+    # Parquet gives missing text back as None, CSV and pd.merge as NaN
+    df = pd.read_parquet(path).fillna(np.nan) if path.suffix == '.parquet' else pd.read_csv(path)
+    return df.sort_values(list(df.columns)).reset_index(drop=True)
+
+@pytest.mark.parametrize('dest', ['dest_csv', 'dest_parquet'])
+@pytest.mark.parametrize('how', ['inner', 'left', 'right', 'outer'])
+def test_spill_join_with_skew_matches_in_memory_merge(workdir, run_pipeline, how, dest):
+    write_skewed(workdir)
+    nodes, edges = join_graph(how, dest)
+    path = workdir / 'processed' / ('out.parquet' if dest == 'dest_parquet' else 'out.csv')
+    outputs, skewed = [], []
+    for budget in (20_000, 10**9):
+        engine = run_pipeline(nodes, edges, memory_budget=budget)
+        assert bool(engine.spill_joins) == (budget == 20_000)
+        outputs.append(read_sorted(path))
+        skewed.append(any(line.startswith('Skewed join key detected') for line in engine.logs))
+    spilled, in_memory = outputs
+    assert skewed == [True, False]
+    pd.testing.assert_frame_equal(spilled, in_memory)
+    left, right = pd.read_csv(workdir / 'uploads' / 'left.csv'), pd.read_csv(workdir / 'uploads' / 'right.csv')
+    expected = pd.merge(left, right, on='key', how=how)
+    pd.testing.assert_frame_equal(in_memory, expected.sort_values(list(expected.columns)).reset_index(drop=True), check_dtype=False)
@@ -0,0 +1,41 @@
+import json
+import pandas as pd
+import pytest
+
+from app.models import ProcessedFile
+from benchmarks.graphs import node, chain
+
+RECORDS = [{'id': i, 'team': 'ab'[i % 2], 'score': None if i % 5 == 0 else i * 1.5} for i in range(40)]
+
+@pytest.fixture
+def events(workdir):
+    path = workdir / 'uploads' / 'events.ndjson'
+    path.write_text(''.join(json.dumps(r) + '\n' for r in RECORDS))
+    return path
+
+def read_lines(path):
+    return [json.loads(line) for line in open(path)]
+
+@pytest.mark.parametrize('streaming', [True, False])
+def test_json_lines_source_to_json_lines_destination(workdir, events, run_pipeline, streaming):
+    nodes = [
+        node('s', 'source_jsonl', filename='events.ndjson'),
+        node('f', 'filterNode', column='id', condition='>', value='9'),
+        node('d', 'dest_jsonl', outputName='out'),
+    ]
+    engine = run_pipeline(nodes, chain(*nodes), streaming=streaming, chunk_size=7)
+    assert any('Streaming mode' in line for line in engine.logs) == streaming
+    assert read_lines(workdir / 'processed' / 'out.jsonl') == [r for r in RECORDS if r['id'] > 9]
+    [record] = ProcessedFile.query.all()
+    assert record.file_type == 'JSONL' and record.row_count == 30
+
+@pytest.mark.parametrize('streaming', [True, False])
+def test_json_lines_group_matches_pandas(workdir, events, run_pipeline, streaming):
+    nodes = [
+        node('s', 'source_jsonl', filename='events.ndjson'),
+        node('g', 'trans_group', groupCol='team', targetCol='score', operation='sum'),
+        node('d', 'dest_csv', outputName='out'),
+    ]
+    run_pipeline(nodes, chain(*nodes), streaming=streaming, chunk_size=7)
+    expected = pd.DataFrame(RECORDS).groupby('team', as_index=False)['score'].sum()
+    pd.testing.assert_frame_equal(pd.read_csv(workdir / 'processed' / 'out.csv'), expected)
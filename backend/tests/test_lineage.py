@@ -0,0 +1,50 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy.orm import Session
+
+from app import db
+from app.lineage import record_outputs, record_pipeline_lineage
+from app.models import LineageEdge, Pipeline
+from benchmarks.graphs import node
+
+def test_concurrent_runs_record_the_same_output(user):
+    pipeline = Pipeline(name='Nightly', structure='[]', user_id=user.id)
+    db.session.add(pipeline)
+    db.session.commit()
+    engine, pipeline_id, user_id = db.engine, pipeline.id, user.id
+
+    def run(pause):
+        # What flush_records does at the end of a run, in a process of its own
+        with Session(engine) as session:
+            record_outputs(session, pipeline_id, user_id, ['out.csv', f'chart_{pause}.png'])
+            time.sleep(pause)
+            session.commit()
+
+    with ThreadPoolExecutor(2) as pool:
+        # The slower run commits after the other has already added out.csv
+        for future in [pool.submit(run, 0.3), pool.submit(run, 0)]:
+            future.result()
+    edges = sorted(e.dataset for e in LineageEdge.query.filter_by(pipeline_id=pipeline_id))
+    assert edges == ['chart_0.3.png', 'chart_0.png', 'out.csv']
+
+def flow(output_name):
+    return json.dumps({'nodes': [node('s', 'source_csv', filename='sales.csv'), node('d', 'dest_csv', outputName=output_name)], 'edges': []})
+
+def test_saving_keeps_the_outputs_runs_recorded(user):
+    pipeline = Pipeline(name='Nightly', structure=flow('out'), user_id=user.id)
+    db.session.add(pipeline)
+    db.session.commit()
+    record_pipeline_lineage(pipeline)
+    db.session.commit()
+    record_outputs(db.session, pipeline.id, user.id, ['out.csv', 'chart.png'])
+    db.session.commit()
+
+    pipeline.structure = flow('renamed')
+    record_pipeline_lineage(pipeline)
+    db.session.commit()
+    edges = {(e.role, e.dataset): e.origin for e in LineageEdge.query.filter_by(pipeline_id=pipeline.id)}
+    assert edges == {
+        ('input', 'sales.csv'): 'flow', ('output', 'renamed.csv'): 'flow',
+        ('output', 'out.csv'): 'run', ('output', 'chart.png'): 'run',
+    }
@@ -0,0 +1,38 @@
+import os
+import pandas as pd
+import pytest
+
+from app import db
+from app.models import Pipeline, PipelineRun, NodeMetric
+from benchmarks.graphs import node, chain
+
+@pytest.mark.parametrize('streaming', [True, False])
+def test_each_node_gets_a_metric_row(workdir, user, run_pipeline, streaming):
+    source = workdir / 'uploads' / 'ids.csv'
+    pd.DataFrame({'id': range(20)}).to_csv(source, index=False)
+    nodes = [
+        node('s', 'source_csv', filename='ids.csv'),
+        node('f', 'filterNode', column='id', condition='<', value='5'),
+        node('p', 'trans_python', code="df['half'] = df['id'] / 2"),
+        node('d', 'dest_csv', outputName='out'),
+    ]
+    engine = run_pipeline(nodes, chain(*nodes), streaming=streaming, chunk_size=8)
+    pipeline = Pipeline(name='metrics', structure='[]', user_id=user.id, status='Active')
+    db.session.add(pipeline)
+    db.session.flush()
+    run = PipelineRun(pipeline_id=pipeline.id, status='Success')
+    db.session.add(run)
+    db.session.commit()
+
+    engine.save_metrics(run.id)
+    metrics = {m.node_id: m for m in run.node_metrics}
+    # The filter is folded into the source read, so it has no work of its own to measure
+    assert set(metrics) >= {'s', 'p', 'd'}
+    assert metrics['s'].bytes_read == os.path.getsize(source) and metrics['s'].node_type == 'source_csv'
+    assert (metrics['p'].rows_in, metrics['p'].rows_out) == (5, 5)
+    assert metrics['d'].rows_out == 5 and metrics['d'].bytes_written == os.path.getsize(workdir / 'processed' / 'out.csv')
+    assert all(m.wall_time >= 0 and m.cpu_time >= 0 for m in metrics.values())
+
+    db.session.delete(run)
+    db.session.commit()
+    assert NodeMetric.query.count() == 0
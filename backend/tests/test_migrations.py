@@ -0,0 +1,94 @@
+import sqlite3
+import pytest
+from flask import Flask
+from sqlalchemy import inspect, text
+
+from app import db
+from app.database import init_database
+from app.migrations import MIGRATIONS, upgrade
+from app.models import DataSource, LineageEdge, PipelineRun
+from app.run_logs import log_tail
+
+# The tables as db.create_all() made them before schema_migration existed (the last release)
+BASELINE_SCHEMA = """
+CREATE TABLE user (id INTEGER NOT NULL, username VARCHAR(64), email VARCHAR(120), password_hash VARCHAR(128), is_admin BOOLEAN,
+    is_suspended BOOLEAN, total_processed_bytes INTEGER, notify_on_success BOOLEAN, notify_on_failure BOOLEAN, PRIMARY KEY (id));
+CREATE UNIQUE INDEX ix_user_username ON user (username);
+CREATE UNIQUE INDEX ix_user_email ON user (email);
+CREATE TABLE notification (id INTEGER NOT NULL, user_id INTEGER NOT NULL, message VARCHAR(500), type VARCHAR(20), read BOOLEAN,
+    timestamp DATETIME, PRIMARY KEY (id), FOREIGN KEY(user_id) REFERENCES user (id));
+CREATE TABLE pipeline (id INTEGER NOT NULL, name VARCHAR(140), structure TEXT, status VARCHAR(20), created_at DATETIME, user_id INTEGER,
+    schedule VARCHAR(50), next_run DATETIME, PRIMARY KEY (id), FOREIGN KEY(user_id) REFERENCES user (id));
+CREATE TABLE data_source (id INTEGER NOT NULL, filename VARCHAR(140), file_type VARCHAR(20), file_size VARCHAR(20), filepath VARCHAR(200),
+    upload_date DATETIME, user_id INTEGER, row_count INTEGER, columns TEXT, PRIMARY KEY (id), FOREIGN KEY(user_id) REFERENCES user (id));
+CREATE TABLE pipeline_run (id INTEGER NOT NULL, pipeline_id INTEGER NOT NULL, status VARCHAR(20), start_time DATETIME, end_time DATETIME,
+    logs TEXT, PRIMARY KEY (id), FOREIGN KEY(pipeline_id) REFERENCES pipeline (id));
+CREATE TABLE shared_pipeline (id INTEGER NOT NULL, pipeline_id INTEGER, user_id INTEGER, role VARCHAR(20), PRIMARY KEY (id),
+    FOREIGN KEY(pipeline_id) REFERENCES pipeline (id), FOREIGN KEY(user_id) REFERENCES user (id));
+CREATE TABLE processed_file (id INTEGER NOT NULL, filename VARCHAR(140), file_type VARCHAR(20), file_size_display VARCHAR(20),
+    file_size_bytes INTEGER, filepath VARCHAR(200), created_at DATETIME, user_id INTEGER, row_count INTEGER, columns TEXT,
+    source_pipeline_id INTEGER, PRIMARY KEY (id), FOREIGN KEY(user_id) REFERENCES user (id), FOREIGN KEY(source_pipeline_id) REFERENCES pipeline (id));
+INSERT INTO user (id, username, email, password_hash) VALUES (1, 'old', 'old@streamforge.io', '-');
+INSERT INTO pipeline (id, name, structure, user_id) VALUES (1, 'Nightly', '{"nodes": [], "edges": []}', 1);
+INSERT INTO pipeline_run (id, pipeline_id, status, logs) VALUES (1, 1, 'Success', '["Loaded sales.csv", "Saved output to out.csv"]');
+INSERT INTO pipeline_run (id, pipeline_id, status, logs) VALUES (2, 1, 'Failed', 'Loaded sales.csv
+ERROR in s: boom');
+INSERT INTO pipeline_run (id, pipeline_id, status, logs) VALUES (3, 1, 'Running', NULL);
+INSERT INTO data_source (id, filename, file_type, upload_date, user_id) VALUES (1, 'sales.csv', 'csv', '2024-05-01 10:00:00.000000', 1);
+INSERT INTO processed_file (id, filename, file_type, created_at, user_id, source_pipeline_id) VALUES (1, 'chart.png', 'png', '2024-05-02 10:00:00.000000', 1, 1);
+"""
+
+@pytest.fixture
+def baseline_app(workdir):
+    """A Flask app on a database left by the last release, upgraded the way the app does at startup."""
+    path = workdir / 'baseline.db'
+    with sqlite3.connect(path) as conn:
+        conn.executescript(BASELINE_SCHEMA)
+    app = Flask('tests')
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{path}"
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        app.applied = init_database()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+def test_every_step_applies_to_a_baseline_database(baseline_app):
+    assert baseline_app.applied == [version for version, _, _ in MIGRATIONS]
+    recorded = db.session.execute(text("SELECT version FROM schema_migration ORDER BY version")).scalars().all()
+    assert recorded == baseline_app.applied
+    assert upgrade(db.engine) == []
+
+def test_baseline_database_matches_the_models(baseline_app):
+    inspector = inspect(db.engine)
+    for table in db.metadata.sorted_tables:
+        columns = {c['name'] for c in inspector.get_columns(table.name)}
+        assert {c.name for c in table.columns} <= columns, table.name
+        indexes = {ix['name'] for ix in inspector.get_indexes(table.name)}
+        assert {ix.name for ix in table.indexes} <= indexes, table.name
+
+def test_run_logs_move_to_run_log(baseline_app):
+    assert log_tail(1) == ["Loaded sales.csv", "Saved output to out.csv"]
+    assert log_tail(2) == ["Loaded sales.csv", "ERROR in s: boom"]
+    assert log_tail(3) == []
+    assert db.session.execute(text("SELECT COUNT(*) FROM pipeline_run WHERE logs IS NOT NULL")).scalar() == 0
+    assert [run.status for run in PipelineRun.query.order_by(PipelineRun.id)] == ['Success', 'Failed', 'Running']
+
+def test_existing_rows_read_through_the_models(baseline_app):
+    source = DataSource.query.one()
+    assert source.filename == 'sales.csv' and source.upload_date.year == 2024
+    assert source.content_hash is None and source.profile is None
+
+def test_date_indexes_reach_databases_already_at_version_5(baseline_app):
+    with db.engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_data_source_user_date"))
+        conn.execute(text("DROP INDEX ix_processed_file_user_created"))
+        conn.execute(text("DELETE FROM schema_migration WHERE version = 6"))
+    assert upgrade(db.engine) == [6]
+    inspector = inspect(db.engine)
+    assert 'ix_data_source_user_date' in {ix['name'] for ix in inspector.get_indexes('data_source')}
+    assert 'ix_processed_file_user_created' in {ix['name'] for ix in inspector.get_indexes('processed_file')}
+
+def test_outputs_of_earlier_runs_become_run_edges(baseline_app):
+    assert [(e.dataset, e.role, e.origin) for e in LineageEdge.query.filter_by(pipeline_id=1)] == [('chart.png', 'output', 'run')]
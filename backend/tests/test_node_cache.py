@@ -0,0 +1,64 @@
+import os
+import pandas as pd
+import pytest
+
+from app import db
+from app.node_cache import NodeCache
+from app.pipeline_engine import PipelineEngine
+from benchmarks.graphs import node, chain
+
+@pytest.fixture
+def preview(workdir, user):
+    """Previews a graph's target node against a shared cache and returns the engine's logs."""
+    cache = NodeCache(64 * 1024 * 1024)
+    def run(nodes, target):
+        engine = PipelineEngine(nodes, chain(*nodes), user, os.path.join(workdir, 'app'), db.session, preview_mode=True, cache=cache)
+        result = engine.run_preview(target)
+        assert 'error' not in result, result
+        return result, [line for line in engine.logs if line.startswith('Preview:')]
+    return run
+
+def graph(value='5'):
+    return [
+        node('s', 'source_csv', filename='ids.csv'),
+        node('p', 'trans_python', code="df['twice'] = df['id'] * 2"),
+        node('f', 'filterNode', column='id', condition='>', value=value),
+    ]
+
+@pytest.fixture
+def ids(workdir):
+    path = workdir / 'uploads' / 'ids.csv'
+    pd.DataFrame({'id': range(10)}).to_csv(path, index=False)
+    return path
+
+def test_unchanged_preview_is_served_from_cache(ids, preview):
+    first, logs = preview(graph(), 'f')
+    assert logs == ['Preview: Processing s', 'Preview: Processing p', 'Preview: Processing f']
+    second, logs = preview(graph(), 'f')
+    assert logs == ['Preview: Using cached result for f']
+    assert second['data'] == first['data']
+
+def test_edited_node_reuses_cached_inputs(ids, preview):
+    preview(graph(), 'f')
+    result, logs = preview(graph(value='7'), 'f')
+    assert logs == ['Preview: Using cached result for p', 'Preview: Processing f']
+    assert [row['id'] for row in result['data']] == [8, 9]
+
+def test_changed_source_file_is_read_again(ids, preview):
+    preview(graph(), 'f')
+    pd.DataFrame({'id': range(20)}).to_csv(ids, index=False)
+    result, logs = preview(graph(), 'f')
+    assert logs[0] == 'Preview: Processing s'
+    assert len(result['data']) == 14
+
+def test_least_recently_used_entries_are_evicted():
+    frame = pd.DataFrame({'x': range(100)})
+    size = int(frame.memory_usage(index=True, deep=True).sum())
+    cache = NodeCache(2 * size)
+    cache.put('a', frame)
+    cache.put('b', frame)
+    cache.get('a')
+    cache.put('c', frame)
+    assert cache.get('b') is None and cache.get('a') is frame and cache.get('c') is frame
+    cache.put('huge', pd.concat([frame] * 3))
+    assert cache.get('huge') is None and cache.total_bytes == 2 * size
@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+import pytest
+
+from app import db
+from app.catalog import search_catalog
+from app.models import DataSource, ProcessedFile
+from app.pagination import merged_keyset_page, merged_cursor
+
+@pytest.fixture
+def files(user):
+    """Uploads and outputs whose ids disagree with their dates, with ties inside and across tables."""
+    start = datetime(2024, 5, 1)
+    upload_days = [5, 1, 3, 3, 0, 7, 3]
+    output_days = [2, 3, 6, 3, 0, 9]
+    for i, day in enumerate(upload_days):
+        db.session.add(DataSource(filename=f'upload{i}.csv', user_id=user.id, upload_date=start + timedelta(days=day)))
+    for i, day in enumerate(output_days):
+        db.session.add(ProcessedFile(filename=f'output{i}.csv', file_type='CSV', user_id=user.id, created_at=start + timedelta(days=day)))
+    db.session.commit()
+    uploads = [(r.upload_date, 0, r.id, r.filename) for r in DataSource.query]
+    outputs = [(r.created_at, 1, r.id, r.filename) for r in ProcessedFile.query]
+    return [name for *_, name in sorted(uploads + outputs, reverse=True)]
+
+def sources(user):
+    return [
+        (DataSource.query.filter_by(user_id=user.id), DataSource, DataSource.upload_date, 0),
+        (ProcessedFile.query.filter_by(user_id=user.id), ProcessedFile, ProcessedFile.created_at, 1),
+    ]
+
+@pytest.mark.parametrize('limit', [1, 2, 3, 5, 13, 20])
+def test_merged_pages_are_newest_first(user, files, limit):
+    seen, cursor = [], None
+    while True:
+        records, next_cursor = merged_keyset_page(sources(user), limit, merged_cursor(cursor) if cursor else None)
+        assert len(records) <= limit
+        seen += [r.filename for r in records]
+        if next_cursor is None: break
+        cursor = next_cursor
+    assert seen == files
+
+def test_catalog_listing_without_a_query_is_newest_first(user, files):
+    seen, cursor = [], None
+    while True:
+        records, cursor = search_catalog(user.id, '', limit=4, cursor=cursor)
+        seen += [r.filename for r in records]
+        if cursor is None: break
+    assert seen == files
+
+@pytest.mark.parametrize('cursor', ['12', 'x_0_1', '2024-05-01T00:00:00_a_1'])
+def test_malformed_cursor(cursor):
+    with pytest.raises(ValueError):
+        merged_cursor(cursor)
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app import pipeline_engine
+from benchmarks.graphs import node, chain
+
+CHAINS = {
+    'filter_select': [('filterNode', dict(column='qty', condition='>', value='5')), ('trans_select', dict(columns='id, region'))],
+    'select_filter': [('trans_select', dict(columns='id,qty')), ('filterNode', dict(column='qty', condition='==', value='3'))],
+    'limit_filter': [('trans_limit', dict(limit='40')), ('filterNode', dict(column='region', condition='!=', value='North'))],
+    'filter_limit': [('filterNode', dict(column='qty', condition='<', value='4')), ('trans_limit', dict(limit='7'))],
+    'unknown_column': [('trans_select', dict(columns='id,missing')), ('filterNode', dict(column='missing', condition='>', value='1'))],
+}
+
+@pytest.fixture
+def sales(workdir):
+    rng = np.random.default_rng(5)
+    df = pd.DataFrame({'id': np.arange(300), 'region': rng.choice(['North', 'South'], 300), 'qty': rng.integers(0, 10, 300), 'price': rng.random(300)})
+    df.to_csv(workdir / 'uploads' / 'sales.csv', index=False)
+    df.to_parquet(workdir / 'uploads' / 'sales.parquet', index=False)
+
+@pytest.mark.parametrize('streaming', [True, False])
+@pytest.mark.parametrize('fmt', ['csv', 'parquet'])
+@pytest.mark.parametrize('name', list(CHAINS))
+def test_pushed_down_reads_match_plain_reads(workdir, sales, run_pipeline, monkeypatch, name, fmt, streaming):
+    steps = [node(f'n{i}', node_type, **data) for i, (node_type, data) in enumerate(CHAINS[name])]
+    nodes = [node('s', f'source_{fmt}', filename=f'sales.{fmt}')] + steps + [node('d', 'dest_csv', outputName='out')]
+    engine = run_pipeline(nodes, chain(*nodes), streaming=streaming)
+    assert set(engine.absorbed) == {n['id'] for n in steps}
+    pushed = pd.read_csv(workdir / 'processed' / 'out.csv')
+    monkeypatch.setattr(pipeline_engine, 'PUSHDOWN_NODES', set())
+    engine = run_pipeline(nodes, chain(*nodes), streaming=streaming)
+    assert not engine.read_plans
+    pd.testing.assert_frame_equal(pushed, pd.read_csv(workdir / 'processed' / 'out.csv'))
+
+def test_read_plan_contents(workdir, sales, run_pipeline):
+    nodes = [
+        node('s', 'source_parquet', filename='sales.parquet'),
+        node('f', 'filterNode', column='qty', condition='>', value='5'),
+        node('c', 'trans_select', columns='id,region'),
+        node('l', 'trans_limit', limit='10'),
+        node('d', 'dest_csv', outputName='out'),
+    ]
+    plan = run_pipeline(nodes, chain(*nodes), streaming=False).read_plans['s']
+    # The filter's column is read too; the limit comes after a filter, so it can't cap the read
+    assert plan['usecols'] == ['id', 'region', 'qty'] and plan['nrows'] is None
+    assert plan['filters'] == [('qty', '>', 5)]
+    assert list(pd.read_csv(workdir / 'processed' / 'out.csv').columns) == ['id', 'region']
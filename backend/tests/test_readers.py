@@ -0,0 +1,39 @@
+import pandas as pd
+import pytest
+
+from app.readers import read_csv_arrow, read_csv_file
+
+# Column text -> whether Arrow can parse it the way pandas does (otherwise pandas is used)
+COLUMNS = {
+    'ints': (['1', '-2', '007'], True),
+    'floats': (['1.5', '2', 'inf'], True),
+    'whole_floats': (['5.0', '6.', '1e3'], True),
+    'with_blank': (['+5', '', '6'], True),
+    'bools': (['True', 'false', 'TRUE'], True),
+    'text': (['a', '1', 'NA'], True),
+    'dates': (['2020-01-01', '2020-01-02', '2020-01-03'], True),
+    'plus_sign': (['+5', '6', '7'], False),
+    'uint64': (['18446744073709551615', '1', '2'], False),
+    'past_64_bits': (['99999999999999999999999', '1', '2'], False),
+    'below_int64': (['-9223372036854775809', '1', '2'], False),
+    'hex': (['0x10', '1', '2'], False),
+}
+
+def write_column(workdir, values):
+    path = workdir / 'uploads' / 'parity.csv'
+    path.write_text('key,c\n' + ''.join(f'{i},{v}\n' for i, v in enumerate(values)))
+    return str(path)
+
+@pytest.mark.parametrize('name', list(COLUMNS))
+def test_arrow_reads_csv_like_pandas(workdir, name):
+    values, arrow_parses = COLUMNS[name]
+    path = write_column(workdir, values)
+    assert (read_csv_arrow(path) is not None) == arrow_parses
+    pd.testing.assert_frame_equal(read_csv_file(path), pd.read_csv(path))
+
+def test_registered_types_pin_columns(workdir):
+    path = write_column(workdir, ['18446744073709551615', '1', '2'])
+    dtype = {'key': 'int64', 'c': 'uint64'}
+    df = read_csv_arrow(path, dtype=dtype)
+    assert df is not None
+    pd.testing.assert_frame_equal(df, pd.read_csv(path, dtype=dtype))
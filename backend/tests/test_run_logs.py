@@ -0,0 +1,65 @@
+import threading
+import pandas as pd
+import pytest
+
+from app import db, run_logs
+from app.models import Pipeline, PipelineRun, RunLog
+from app.run_logs import RunLogWriter, append_logs, read_logs, log_tail, log_counts, delete_pipeline_logs
+from benchmarks.graphs import node, chain
+
+@pytest.fixture
+def runs(user):
+    pipeline = Pipeline(name='logs', structure='[]', user_id=user.id, status='Active')
+    db.session.add(pipeline)
+    db.session.flush()
+    created = [PipelineRun(pipeline_id=pipeline.id) for _ in range(2)]
+    db.session.add_all(created)
+    db.session.commit()
+    return [run.id for run in created]
+
+def texts(page):
+    return [line['text'] for line in page['lines']]
+
+def test_range_and_tail_reads(runs):
+    run_id = runs[0]
+    append_logs(db.session, run_id, [f'line {i}' for i in range(10)])
+    db.session.commit()
+    page = read_logs(run_id, offset=3, limit=4)
+    assert texts(page) == ['line 3', 'line 4', 'line 5', 'line 6']
+    assert (page['offset'], page['next_offset'], page['total']) == (3, 7, 10)
+    assert texts(read_logs(run_id, tail=2)) == log_tail(run_id, 2) == ['line 8', 'line 9']
+    # Reading past the end is where a follower waits for new lines
+    end = read_logs(run_id, offset=25)
+    assert end['lines'] == [] and end['offset'] == end['next_offset'] == 10
+
+def test_writer_batches_lines_from_many_threads(runs, monkeypatch):
+    monkeypatch.setattr(run_logs, 'RUN_LOG_BATCH', 7)
+    monkeypatch.setattr(run_logs, 'RUN_LOG_FLUSH_SECONDS', 3600)
+    run_id = runs[0]
+    append_logs(db.session, run_id, ['queued'])
+    db.session.commit()
+    writer = RunLogWriter(run_id)
+    threads = [threading.Thread(target=lambda t=t: [writer.write([f'{t}:{i}']) for i in range(25)]) for t in range(4)]
+    for thread in threads: thread.start()
+    for thread in threads: thread.join()
+    # Full batches are already readable before the run ends
+    assert read_logs(run_id)['total'] == 1 + 7 * (100 // 7)
+    writer.flush()
+    seqs = [r.seq for r in RunLog.query.filter_by(run_id=run_id).order_by(RunLog.seq)]
+    assert seqs == list(range(101))
+    assert log_counts(runs) == {run_id: 101}
+
+def test_engine_streams_its_log_to_the_writer(workdir, runs, run_pipeline):
+    pd.DataFrame({'id': [1, 2]}).to_csv(workdir / 'uploads' / 'ids.csv', index=False)
+    nodes = [node('s', 'source_csv', filename='ids.csv'), node('d', 'dest_csv', outputName='out')]
+    writer = RunLogWriter(runs[1])
+    engine = run_pipeline(nodes, chain(*nodes), log_writer=writer)
+    writer.flush()
+    assert texts(read_logs(runs[1])) == engine.logs and engine.logs
+
+def test_logs_go_with_their_pipelines(runs):
+    for run_id in runs: append_logs(db.session, run_id, ['a', 'b'])
+    pipeline_id = db.session.get(PipelineRun, runs[0]).pipeline_id
+    delete_pipeline_logs([pipeline_id])
+    db.session.commit()
+    assert RunLog.query.count() == 0
@@ -0,0 +1,59 @@
+import time
+import pandas as pd
+import pytest
+
+from app.pipeline_engine import PipelineEngine
+from benchmarks.graphs import node, chain
+
+SLOW = "import time\ntime.sleep(0.2)"
+
+@pytest.fixture
+def sources(workdir):
+    for name in ('a', 'b'):
+        pd.DataFrame({'id': range(10), 'val': range(10)}).to_csv(workdir / 'uploads' / f'{name}.csv', index=False)
+
+@pytest.fixture
+def intervals(monkeypatch):
+    """(start, end) of every node the engine processes, by node id."""
+    spans = {}
+    process_node = PipelineEngine.process_node
+    def timed(engine, node_id, node):
+        start = time.perf_counter()
+        try:
+            return process_node(engine, node_id, node)
+        finally:
+            spans[node_id] = (start, time.perf_counter())
+    monkeypatch.setattr(PipelineEngine, 'process_node', timed)
+    return spans
+
+def branches(script_b=SLOW):
+    a = [node('sa', 'source_csv', filename='a.csv'), node('pa', 'trans_python', code=SLOW), node('da', 'dest_csv', outputName='out_a')]
+    b = [node('sb', 'source_csv', filename='b.csv'), node('pb', 'trans_python', code=script_b), node('db', 'dest_csv', outputName='out_b')]
+    return a + b, chain(*a) + chain(*b)
+
+@pytest.mark.parametrize('max_workers, overlap', [(1, False), (4, True)])
+def test_independent_branches_run_side_by_side(sources, run_pipeline, intervals, max_workers, overlap):
+    nodes, edges = branches()
+    run_pipeline(nodes, edges, max_workers=max_workers)
+    (start_a, end_a), (start_b, end_b) = intervals['pa'], intervals['pb']
+    assert (start_a < end_b and start_b < end_a) == overlap
+
+def test_failure_stops_new_nodes_and_lets_running_ones_finish(workdir, sources, run_pipeline, intervals):
+    nodes, edges = branches(script_b="raise ValueError('bad row')")
+    with pytest.raises(Exception, match="ERROR in pb: Python Script Execution Error: bad row"):
+        run_pipeline(nodes, edges, max_workers=4)
+    # Whatever of the other branch was already running finished, but nothing was started after the failure
+    assert 'da' not in intervals and 'db' not in intervals
+    assert not (workdir / 'processed' / 'out_a.csv').exists()
+
+def test_diamond_gives_the_same_result_on_any_number_of_threads(workdir, sources, run_pipeline):
+    source = node('s', 'source_csv', filename='a.csv')
+    low, high = node('lo', 'filterNode', column='id', condition='<', value='7'), node('hi', 'filterNode', column='id', condition='>', value='3')
+    join, out = node('j', 'trans_join', key='id', how='inner'), node('d', 'dest_csv', outputName='out')
+    edges = chain(source, low, join, out) + chain(source, high, join)
+    results = []
+    for max_workers in (1, 4):
+        run_pipeline([source, low, high, join, out], edges, max_workers=max_workers)
+        results.append(pd.read_csv(workdir / 'processed' / 'out.csv'))
+    pd.testing.assert_frame_equal(results[0], results[1])
+    assert results[0]['id'].tolist() == [4, 5, 6]
@@ -0,0 +1,17 @@
+import logging
+import pandas as pd
+
+from app import pipeline_engine
+from benchmarks.graphs import node, chain
+
+def test_failed_schema_lookup_is_reported(workdir, run_pipeline, monkeypatch, caplog):
+    pd.DataFrame({'id': [1, 2, 3]}).to_csv(workdir / 'uploads' / 'ids.csv', index=False)
+    def broken(path): raise RuntimeError("no such table: dataset_schema")
+    monkeypatch.setattr(pipeline_engine, 'lookup_schema', broken)
+    nodes = [node('s', 'source_csv', filename='ids.csv'), node('d', 'dest_csv', outputName='out')]
+    with caplog.at_level(logging.WARNING, logger='app.pipeline_engine'):
+        engine = run_pipeline(nodes, chain(*nodes))
+    assert "Schema lookup failed for ids.csv, reading it with inferred types: no such table: dataset_schema" in engine.logs
+    [record] = caplog.records
+    assert record.levelname == 'WARNING' and record.getMessage().endswith('ids.csv') and record.exc_info
+    assert pd.read_csv(workdir / 'processed' / 'out.csv')['id'].tolist() == [1, 2, 3]
@@ -0,0 +1,46 @@
+import os
+import pandas as pd
+import pytest
+
+from app.readers import write_sidecar, fresh_sidecar, sidecar_path
+from benchmarks.graphs import node, chain
+
+@pytest.fixture
+def orders(workdir):
+    path = workdir / 'uploads' / 'orders.csv'
+    pd.DataFrame({'id': range(30), 'code': [f'{i:04d}' for i in range(30)], 'amount': [i * 1.5 for i in range(30)]}).to_csv(path, index=False)
+    return str(path)
+
+def graph():
+    nodes = [node('s', 'source_csv', filename='orders.csv'), node('d', 'dest_csv', outputName='out')]
+    return nodes, chain(*nodes)
+
+def output(workdir):
+    return pd.read_csv(workdir / 'processed' / 'out.csv', dtype=str)
+
+@pytest.mark.parametrize('streaming', [True, False])
+def test_fresh_sidecar_is_read_instead_of_the_text_file(workdir, run_pipeline, orders, streaming):
+    run_pipeline(*graph(), streaming=streaming)
+    expected = output(workdir)
+    assert write_sidecar(orders) == fresh_sidecar(orders) == sidecar_path(orders)
+    engine = run_pipeline(*graph(), streaming=streaming)
+    pd.testing.assert_frame_equal(output(workdir), expected)
+    assert engine.metrics['s']['bytes_read'] == os.path.getsize(sidecar_path(orders))
+    if not streaming: assert "Loaded orders.csv: 30 rows (columnar cache)" in engine.logs
+
+def test_stale_sidecar_is_ignored_and_refreshed(workdir, run_pipeline, orders):
+    write_sidecar(orders)
+    pd.DataFrame({'id': [7], 'code': ['0007'], 'amount': [2.0]}).to_csv(orders, index=False)
+    stamp = os.stat(sidecar_path(orders)).st_mtime_ns + 1_000_000
+    os.utime(orders, ns=(stamp, stamp))
+    assert fresh_sidecar(orders) is None
+    engine = run_pipeline(*graph(), streaming=False)
+    assert output(workdir)['id'].tolist() == ['7']
+    assert "Loaded orders.csv: 1 rows " in engine.logs
+    assert fresh_sidecar(orders) == sidecar_path(orders)
+    assert pd.read_parquet(sidecar_path(orders))['id'].tolist() == [7]
+
+def test_mixed_columns_skip_the_sidecar(workdir, orders):
+    df = pd.DataFrame({'mixed': [1, 'a']})
+    assert write_sidecar(orders, df) is None
+    assert not os.path.exists(sidecar_path(orders)) and not os.path.exists(sidecar_path(orders) + '.tmp')
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.graphs import node, chain
+
+def write_source(workdir, rows=2000):
+    rng = np.random.default_rng(7)
+    df = pd.DataFrame({'id': np.arange(rows), 'val': rng.integers(0, 20, rows), 'name': rng.choice(['a', 'b', 'c'], rows)})
+    df.to_csv(workdir / 'uploads' / 'sorted.csv', index=False)
+    return df
+
+def sort_graph(column, ascending=True, limit=None, filter_value=None, filename='sorted.csv'):
+    nodes = [node('s', 'source_csv', filename=filename)]
+    if filter_value is not None:
+        # Folded into the sort's chunked read, so the empty result has to carry the calculated column too
+        nodes += [node('c', 'trans_calc', colA='id', colB='id', op='+', newCol='twice'), node('f', 'filterNode', column='twice', condition='>', value=str(filter_value))]
+    nodes.append(node('o', 'trans_sort', column=column, order='true' if ascending else 'false'))
+    if limit is not None: nodes.append(node('l', 'trans_limit', limit=str(limit)))
+    nodes.append(node('d', 'dest_csv', outputName='out'))
+    return nodes, chain(*nodes)
+
+@pytest.mark.parametrize('limit', [None, 5])
+@pytest.mark.parametrize('column', ['id', 'val'])
+def test_empty_sort_keeps_columns(workdir, run_pipeline, column, limit):
+    write_source(workdir)
+    nodes, edges = sort_graph(column, limit=limit, filter_value=10**9)
+    engine = run_pipeline(nodes, edges, memory_budget=20_000)
+    assert engine.sort_plans
+    out = pd.read_csv(workdir / 'processed' / 'out.csv')
+    assert out.empty and list(out.columns) == ['id', 'val', 'name', 'twice']
+
+@pytest.mark.parametrize('fmt', ['csv', 'parquet'])
+@pytest.mark.parametrize('limit', [None, 5])
+def test_sort_of_empty_file_keeps_columns(workdir, run_pipeline, limit, fmt):
+    empty = pd.DataFrame({'id': pd.Series(dtype='int64'), 'val': pd.Series(dtype='int64'), 'name': pd.Series(dtype=object)})
+    if fmt == 'csv': empty.to_csv(workdir / 'uploads' / 'sorted.csv', index=False)
+    else: empty.to_parquet(workdir / 'uploads' / 'sorted.parquet', index=False)
+    nodes, edges = sort_graph('val', limit=limit, filename=f'sorted.{fmt}')
+    engine = run_pipeline(nodes, edges, memory_budget=0)
+    assert engine.sort_plans
+    assert list(pd.read_csv(workdir / 'processed' / 'out.csv').columns) == ['id', 'val', 'name']
+
+@pytest.mark.parametrize('limit, kind', [(None, 'external sort'), (5, 'chunked top-k sort')])
+def test_folded_nodes_name_the_sort(workdir, run_pipeline, limit, kind):
+    write_source(workdir)
+    nodes, edges = sort_graph('val', limit=limit, filter_value=100)
+    engine = run_pipeline(nodes, edges, memory_budget=20_000)
+    assert f"s folded into the {kind} of o" in engine.logs
+    assert f"f folded into the {kind} of o" in engine.logs
+
+def write_ties(workdir, rows=3000):
+    # Few distinct keys, many of them null: ties everywhere, in every run and block
+    rng = np.random.default_rng(11)
+    val = rng.integers(0, 6, rows).astype(float)
+    val[rng.random(rows) < 0.1] = np.nan
+    pd.DataFrame({'id': np.arange(rows), 'val': val, 'name': rng.choice(['x', 'y', 'z'], rows)}).to_csv(workdir / 'uploads' / 'sorted.csv', index=False)
+
+@pytest.mark.parametrize('ascending', [True, False])
+@pytest.mark.parametrize('column', ['val', 'name'])
+@pytest.mark.parametrize('limit', [None, 50])
+def test_planned_sorts_order_ties_like_in_memory(workdir, run_pipeline, monkeypatch, column, ascending, limit):
+    from app import spill
+    monkeypatch.setattr(spill, 'MERGE_BLOCK_ROWS', 37)
+    write_ties(workdir)
+    nodes, edges = sort_graph(column, ascending, limit)
+    outputs, logs = [], []
+    for budget in (20_000, 10**9):
+        engine = run_pipeline(nodes, edges, memory_budget=budget, chunk_size=250)
+        outputs.append(pd.read_csv(workdir / 'processed' / 'out.csv'))
+        logs.append(engine.logs)
+    planned, in_memory = outputs
+    merges = [line for line in logs[0] if line.startswith('External sort: merging')]
+    assert bool(merges) == (limit is None) and 'merging 1 ' not in ''.join(merges)
+    assert not any(line.startswith('External sort') for line in logs[1])
+    expected = pd.read_csv(workdir / 'uploads' / 'sorted.csv').sort_values(column, ascending=ascending, kind='stable')
+    if limit is not None: expected = expected.head(limit)
+    pd.testing.assert_frame_equal(in_memory, expected.reset_index(drop=True))
+    pd.testing.assert_frame_equal(planned, in_memory)
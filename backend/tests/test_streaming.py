@@ -0,0 +1,41 @@
+import json
+import pytest
+
+from app.models import DatasetSchema
+from benchmarks.graphs import node, chain
+
+def constant_graph(filename, dest):
+    nodes = [
+        node('s', 'source_csv' if filename.endswith('.csv') else 'source_jsonl', filename=filename),
+        node('k', 'trans_constant', colName='tag', value='x'),
+        node('d', dest, outputName='out'),
+    ]
+    return nodes, chain(*nodes)
+
+def outputs(workdir, run_pipeline, nodes, edges, name):
+    """Text of the output written by a streamed and by an in-memory run of the graph."""
+    texts = []
+    for streaming in (True, False):
+        engine = run_pipeline(nodes, edges, streaming=streaming, chunk_size=4)
+        assert any(line.startswith('Streaming mode') for line in engine.logs) == streaming
+        texts.append((workdir / 'processed' / name).read_text())
+    return texts
+
+def test_csv_column_typed_by_later_chunk(workdir, run_pipeline):
+    # The only blank is in the third chunk: on its own the first chunk reads as integers
+    (workdir / 'uploads' / 'counts.csv').write_text('id,n\n' + ''.join(f'{i},{"" if i == 9 else i}\n' for i in range(12)))
+    nodes, edges = constant_graph('counts.csv', 'dest_csv')
+    streamed, in_memory = outputs(workdir, run_pipeline, nodes, edges, 'out.csv')
+    assert streamed.splitlines()[1] == '0,0.0,x'
+    assert streamed == in_memory
+    assert DatasetSchema.query.count() == 1
+
+@pytest.mark.parametrize('dest, name', [('dest_csv', 'out.csv'), ('dest_jsonl', 'out.jsonl')])
+def test_json_lines_keys_and_types_across_chunks(workdir, run_pipeline, dest, name):
+    records = [{'id': i, 'n': None if i == 9 else i} for i in range(12)]
+    # A key only the second chunk's records have
+    records[6]['late'] = 'only here'
+    (workdir / 'uploads' / 'counts.jsonl').write_text(''.join(json.dumps(r) + '\n' for r in records))
+    nodes, edges = constant_graph('counts.jsonl', dest)
+    streamed, in_memory = outputs(workdir, run_pipeline, nodes, edges, name)
+    assert streamed == in_memory
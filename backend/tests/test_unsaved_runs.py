@@ -0,0 +1,32 @@
+from concurrent.futures import Future
+
+from app import workers
+
+def test_ticket_follows_the_run():
+    future = Future()
+    ticket = workers.track_unsaved_run(1, future)
+    assert workers.unsaved_run_status(ticket, 1)['status'] == 'Queued'
+    future.set_running_or_notify_cancel()
+    assert workers.unsaved_run_status(ticket, 1)['status'] == 'Running'
+    future.set_result({"status": "Success", "logs": ["a", "b"], "error": None})
+    assert workers.unsaved_run_status(ticket, 1) == {"status": "Success", "logs": ["a", "b"], "error": None}
+
+def test_ticket_belongs_to_its_user():
+    ticket = workers.track_unsaved_run(1, Future())
+    assert workers.unsaved_run_status(ticket, 2) is None
+    assert workers.unsaved_run_status('unknown', 1) is None
+
+def test_crashed_worker_fails_the_run():
+    future = Future()
+    ticket = workers.track_unsaved_run(1, future)
+    future.set_exception(RuntimeError('worker died'))
+    run = workers.unsaved_run_status(ticket, 1)
+    assert run['status'] == 'Failed' and 'worker died' in run['error']
+
+def test_finished_runs_expire(monkeypatch):
+    done, pending = Future(), Future()
+    done.set_result({"status": "Success", "logs": [], "error": None})
+    finished, running = workers.track_unsaved_run(1, done), workers.track_unsaved_run(1, pending)
+    monkeypatch.setattr(workers, 'UNSAVED_RUN_TTL', -1)
+    assert workers.unsaved_run_status(finished, 1) is None
+    assert workers.unsaved_run_status(running, 1)['status'] == 'Queued'
@@ -0,0 +1,50 @@
+import gzip
+import hashlib
+import pytest
+
+from app.schemas import scan_file
+from app.uploads import UploadScanner, append_chunk, record_end
+
+CSV = b'id,note,price\n' + b''.join(b'%d,"line one\nline, two",%d.5\n' % (i, i) for i in range(40)) + b'40,plain,\n'
+
+def feed_in_pieces(filename, data, size):
+    scanner = UploadScanner(filename)
+    for start in range(0, len(data), size): scanner.feed(data[start:start + size])
+    return scanner
+
+@pytest.mark.parametrize('size', [1, 7, 64, len(CSV)])
+def test_scan_while_receiving_matches_a_scan_of_the_file(workdir, size):
+    path = workdir / 'uploads' / 'notes.csv'
+    path.write_bytes(CSV)
+    digest, rows, dtypes, _ = feed_in_pieces('notes.csv', CSV, size).finish()
+    assert digest == hashlib.sha256(CSV).hexdigest()
+    whole = scan_file(str(path))
+    assert (rows, dtypes) == (whole.rows, whole.result())
+    assert rows == 41 and dtypes == {'id': 'int64', 'note': 'object', 'price': 'float64'}
+
+def test_compressed_upload_is_scanned_after_decompression():
+    data = gzip.compress(CSV)
+    digest, rows, dtypes, _ = feed_in_pieces('notes.csv.gz', data, 10).finish()
+    assert digest == hashlib.sha256(data).hexdigest() and rows == 41 and dtypes['price'] == 'float64'
+
+def test_replayed_scanner_resumes_where_the_bytes_on_disk_end(workdir):
+    path = workdir / 'uploads' / 'partial'
+    cut = 100
+    path.write_bytes(CSV[:cut])
+    scanner = UploadScanner.replay('notes.csv', str(path), cut)
+    assert scanner.position == cut
+    scanner.feed(CSV[cut:])
+    assert scanner.finish() == feed_in_pieces('notes.csv', CSV, len(CSV)).finish()
+
+def test_resent_chunk_replaces_what_a_dropped_request_left(workdir):
+    path = str(workdir / 'uploads' / 'partial')
+    append_chunk(path, 0, b'abcdef')
+    append_chunk(path, 6, b'gh-partial')
+    append_chunk(path, 6, b'ghij')
+    assert open(path, 'rb').read() == b'abcdefghij'
+
+def test_quoted_newlines_do_not_end_a_record():
+    data = b'1,"a\nb"\n2,c\n3,"d'
+    assert record_end(data, 'csv') == data.index(b'3')
+    assert record_end(data, 'csv', first=True) == data.index(b'2')
+    assert record_end(b'{"a": 1}', 'jsonl') == 0
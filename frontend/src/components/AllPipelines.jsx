@@ -7,6 +7,7 @@ import {
     Zap, Workflow, Activity 
 } from 'lucide-react';
 import AppLayout from './layout/AppLayout';
+import { nextCursor } from '../pagination';
 import '../App.css';
 
 const AllPipelines = () => {
@@ -15,26 +16,33 @@ const AllPipelines = () => {
     const [filteredPipelines, setFilteredPipelines] = useState([]);
     const [loading, setLoading] = useState(true);
     const [searchTerm, setSearchTerm] = useState('');
+    // Pipelines come a page at a time, newest first
+    const [cursor, setCursor] = useState(null);
+    const [loadingMore, setLoadingMore] = useState(false);
 
     // --- State for Custom Delete Modal ---
     const [isDeleteModalOpen, setIsDeleteModalOpen] = useState(false);
     const [pipelineToDelete, setPipelineToDelete] = useState(null);
 
+    const fetchPipelines = async (after = null) => {
+        const token = localStorage.getItem('token');
+        if (after) setLoadingMore(true);
+        try {
+            const res = await axios.get('http://127.0.0.1:5000/pipelines', {
+                headers: { Authorization: `Bearer ${token}` },
+                params: after ? { cursor: after } : {}
+            });
+            setPipelines(prev => after ? [...prev, ...res.data] : res.data);
+            setCursor(nextCursor(res));
+        } catch (err) {
+            console.error("Error fetching pipelines:", err);
+        } finally {
+            setLoading(false);
+            setLoadingMore(false);
+        }
+    };
+
     useEffect(() => {
-        const fetchPipelines = async () => {
-            const token = localStorage.getItem('token');
-            try {
-                const res = await axios.get('http://127.0.0.1:5000/pipelines', {
-                    headers: { Authorization: `Bearer ${token}` }
-                });
-                setPipelines(res.data);
-                setFilteredPipelines(res.data);
-            } catch (err) {
-                console.error("Error fetching pipelines:", err);
-            } finally {
-                setLoading(false);
-            }
-        };
         fetchPipelines();
     }, []);
 
@@ -108,7 +116,7 @@ const AllPipelines = () => {
                                 Pipeline Registry
                             </h1>
                             <span style={{ fontSize: '12px', padding: '4px 10px', background: 'rgba(99, 102, 241, 0.15)', color: '#818cf8', borderRadius: '20px', border: '1px solid rgba(99, 102, 241, 0.2)', fontWeight: '600' }}>
-                                {pipelines.length} Total
+                                {pipelines.length}{cursor ? '+' : ''} Total
                             </span>
                         </div>
                         <p style={{ color: '#a1a1aa', fontSize: '15px', maxWidth: '600px', lineHeight: '1.5' }}>
@@ -316,6 +324,18 @@ const AllPipelines = () => {
                     </motion.div>
                 )}
 
+                {!loading && cursor && (
+                    <div style={{ display: 'flex', justifyContent: 'center', marginTop: '24px' }}>
+                        <button
+                            onClick={() => fetchPipelines(cursor)}
+                            disabled={loadingMore}
+                            style={{ padding: '10px 24px', background: 'rgba(255,255,255,0.05)', border: '1px solid rgba(255,255,255,0.1)', borderRadius: '8px', color: '#e4e4e7', fontSize: '13px', cursor: loadingMore ? 'default' : 'pointer' }}
+                        >
+                            {loadingMore ? 'Loading...' : 'Load more pipelines'}
+                        </button>
+                    </div>
+                )}
+
                 {/* --- Custom Delete Confirmation Modal --- */}
                 <AnimatePresence>
                     {isDeleteModalOpen && (
@@ -8,6 +8,7 @@ import {
     Activity, Lock, ArrowRight, Zap, Globe, LayoutGrid
 } from 'lucide-react';
 import AppLayout from './layout/AppLayout';
+import { fetchAllPages } from '../pagination';
 import '../App.css';
 
 const CollaborationPage = () => {
@@ -32,17 +33,17 @@ const CollaborationPage = () => {
         const token = localStorage.getItem('token');
         const headers = { Authorization: `Bearer ${token}` };
         try {
-            const [statsRes, withMeRes, byMeRes, pipesRes] = await Promise.all([
+            const [statsRes, withMe, byMe, pipelines] = await Promise.all([
                 axios.get('http://127.0.0.1:5000/collaboration/stats', { headers }),
-                axios.get('http://127.0.0.1:5000/collaboration/shared-with-me', { headers }), 
-                axios.get('http://127.0.0.1:5000/collaboration/shared-by-me', { headers }),   
-                axios.get('http://127.0.0.1:5000/pipelines', { headers })
+                fetchAllPages('http://127.0.0.1:5000/collaboration/shared-with-me', { headers }), 
+                fetchAllPages('http://127.0.0.1:5000/collaboration/shared-by-me', { headers }),   
+                fetchAllPages('http://127.0.0.1:5000/pipelines', { headers })
             ]);
 
             setStats(statsRes.data);
-            setSharedWithMe(withMeRes.data);
-            setSharedByMe(byMeRes.data);
-            setMyPipelines(pipesRes.data.filter(p => !p.is_shared)); 
+            setSharedWithMe(withMe);
+            setSharedByMe(byMe);
+            setMyPipelines(pipelines.filter(p => !p.is_shared)); 
         } catch (err) {
             console.error("Error loading data:", err);
             showToast('Failed to sync collaboration data', 'error');
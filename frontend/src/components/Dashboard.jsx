@@ -22,7 +22,7 @@ const Dashboard = () => {
   const navigate = useNavigate();
   
   // Core Data State
-  const [pipelines, setPipelines] = useState([]);
+  const [pipelineCount, setPipelineCount] = useState(0);
   const [recentPipelines, setRecentPipelines] = useState([]);
   const [totalDataSize, setTotalDataSize] = useState('0 B'); 
   const [activeRuns, setActiveRuns] = useState(0);
@@ -39,39 +39,36 @@ const Dashboard = () => {
         setLoading(true);
         const headers = { Authorization: `Bearer ${token}` };
 
-        // 1. Fetch Pipelines & User Stats
-        const reqPipelines = axios.get('http://127.0.0.1:5000/pipelines', { headers });
+        // 1. Fetch the newest Pipelines & User Stats (counts for every card are computed by the server)
+        const reqPipelines = axios.get('http://127.0.0.1:5000/pipelines', { headers, params: { limit: 6 } });
         const reqUserStats = axios.get('http://127.0.0.1:5000/user-stats', { headers });
         
-        // 2. Fetch Data Sources for Catalog Card
-        const reqDataSources = axios.get('http://127.0.0.1:5000/datasources', { headers });
+        // 2. Fetch the newest scheduled pipeline
+        const reqScheduled = axios.get('http://127.0.0.1:5000/pipelines', { headers, params: { scheduled: 1, limit: 1 } });
 
         // 3. Fetch Collaboration Stats
         const reqCollab = axios.get('http://127.0.0.1:5000/collaboration/stats', { headers });
 
-        Promise.all([reqPipelines, reqUserStats, reqDataSources, reqCollab])
-        .then(([resPipelines, resStats, resData, resCollab]) => {
-            const allPipelines = resPipelines.data;
+        Promise.all([reqPipelines, reqUserStats, reqScheduled, reqCollab])
+        .then(([resPipelines, resStats, resScheduled, resCollab]) => {
+            const stats = resStats.data;
             
             // Pipelines Logic
-            setPipelines(allPipelines);
-            setRecentPipelines(allPipelines.slice(0, 6));
-            setActiveRuns(allPipelines.filter(p => p.status === 'Active').length);
+            setPipelineCount(stats.pipelines);
+            setRecentPipelines(resPipelines.data);
+            setActiveRuns(stats.active_pipelines);
             
             // Scheduling Logic
-            const scheduled = allPipelines.filter(p => p.schedule);
             setScheduledStats({
-                count: scheduled.length,
-                next: scheduled.length > 0 ? scheduled[0].name : null
+                count: stats.scheduled_pipelines,
+                next: resScheduled.data.length > 0 ? resScheduled.data[0].name : null
             });
 
             // User Stats Logic
-            setTotalDataSize(formatBytes(resStats.data.total_processed_bytes));
+            setTotalDataSize(formatBytes(stats.total_processed_bytes));
 
             // Catalog Logic
-            const sources = resData.data.filter(d => d.category === 'upload').length;
-            const processed = resData.data.filter(d => d.category === 'processed').length;
-            setCatalogStats({ sources, processed });
+            setCatalogStats({ sources: stats.sources, processed: stats.processed });
 
             // Collaboration Logic
             setCollabStats({
@@ -154,9 +151,9 @@ const Dashboard = () => {
                     {/* STAT CARDS ROW */}
                     <div style={{ gridColumn: 'span 3' }}>
                         <StatCard 
-                            label="Total Pipelines" value={pipelines.length} 
+                            label="Total Pipelines" value={pipelineCount} 
                             icon={<Network size={22} />} color="#3b82f6" 
-                            trend={pipelines.length > 0 ? "Active" : "No pipelines"} 
+                            trend={pipelineCount > 0 ? "Active" : "No pipelines"} 
                             chartData={[30, 40, 35, 50, 49, 60, 70]} 
                         />
                     </div>
@@ -16,6 +16,10 @@ const DataCatalog = () => {
     const [selectedAsset, setSelectedAsset] = useState(null);
     const [lineage, setLineage] = useState(null);
     const [loading, setLoading] = useState(false);
+    // Search results come a page at a time: the query they're for and the cursor of the next page
+    const [searchedQuery, setSearchedQuery] = useState('');
+    const [nextCursor, setNextCursor] = useState(null);
+    const [loadingMore, setLoadingMore] = useState(false);
     
     // UI State
     const [filterType, setFilterType] = useState('ALL'); // 'ALL', 'Source', 'Pipeline'
@@ -25,18 +29,21 @@ const DataCatalog = () => {
         searchCatalog('');
     }, []);
 
-    const searchCatalog = async (q) => {
-        setLoading(true);
+    const searchCatalog = async (q, cursor = null) => {
+        cursor ? setLoadingMore(true) : setLoading(true);
         try {
             const token = localStorage.getItem('token');
-            const res = await axios.get(`http://127.0.0.1:5000/api/catalog/search?q=${q}`, {
+            const res = await axios.get('http://127.0.0.1:5000/api/catalog/search', {
+                params: cursor ? { q, cursor } : { q },
                 headers: { Authorization: `Bearer ${token}` }
             });
-            setResults(res.data);
+            setResults(prev => cursor ? [...prev, ...res.data] : res.data);
+            setSearchedQuery(q);
+            setNextCursor(res.headers['x-next-cursor'] || null);
         } catch (err) {
             console.error(err);
         }
-        setLoading(false);
+        cursor ? setLoadingMore(false) : setLoading(false);
     };
 
     const fetchLineage = async (asset) => {
@@ -163,7 +170,7 @@ const DataCatalog = () => {
                         <div style={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center', marginBottom: '12px' }}>
                             <SectionLabel label={`Results (${filteredResults.length})`} noMargin />
                             <div style={{ fontSize: '11px', color: '#a1a1aa', display: 'flex', gap: '4px', alignItems: 'center', cursor: 'pointer' }}>
-                                <Filter size={12} /> Sort by: Newest
+                                <Filter size={12} /> Sort by: {searchedQuery ? 'Best match' : 'Newest'}
                             </div>
                         </div>
 
@@ -182,6 +189,18 @@ const DataCatalog = () => {
                                     />
                                 ))
                             )}
+                            {!loading && nextCursor && (
+                                <button
+                                    onClick={() => searchCatalog(searchedQuery, nextCursor)}
+                                    disabled={loadingMore}
+                                    style={{
+                                        padding: '8px', background: 'rgba(255,255,255,0.03)', border: '1px solid rgba(255,255,255,0.05)',
+                                        borderRadius: '8px', color: '#a1a1aa', fontSize: '12px', cursor: loadingMore ? 'default' : 'pointer'
+                                    }}
+                                >
+                                    {loadingMore ? 'Loading...' : 'Load more'}
+                                </button>
+                            )}
                         </div>
                     </div>
 
@@ -275,6 +294,12 @@ const DataCatalog = () => {
                                                         )}
                                                     </div>
                                                 )}
+                                                {lineage && (lineage.upstream?.length > 0 || lineage.downstream?.length > 0) && (
+                                                    <div style={{ marginTop: '16px', display: 'flex', flexDirection: 'column', gap: '12px' }}>
+                                                        <LineageHops title="Upstream" hops={lineage.upstream} />
+                                                        <LineageHops title="Downstream impact" hops={lineage.downstream} />
+                                                    </div>
+                                                )}
                                             </div>
                                         </div>
 
@@ -306,6 +331,9 @@ const DataCatalog = () => {
                                                         <tr style={{ background: 'rgba(255,255,255,0.02)', borderBottom: '1px solid rgba(255,255,255,0.05)' }}>
                                                             <th style={{ padding: '12px 20px', fontSize: '11px', color: '#71717a', textTransform: 'uppercase', fontWeight: '700' }}>Column Name</th>
                                                             <th style={{ padding: '12px 20px', fontSize: '11px', color: '#71717a', textTransform: 'uppercase', fontWeight: '700' }}>Data Type</th>
+                                                            <th style={{ padding: '12px 20px', fontSize: '11px', color: '#71717a', textTransform: 'uppercase', fontWeight: '700' }}>Nulls</th>
+                                                            <th style={{ padding: '12px 20px', fontSize: '11px', color: '#71717a', textTransform: 'uppercase', fontWeight: '700' }}>Distinct</th>
+                                                            <th style={{ padding: '12px 20px', fontSize: '11px', color: '#71717a', textTransform: 'uppercase', fontWeight: '700' }}>Range</th>
                                                         </tr>
                                                     </thead>
                                                     <tbody>
@@ -316,11 +344,12 @@ const DataCatalog = () => {
                                                                     <td style={{ padding: '10px 20px' }}>
                                                                         <TypeBadge type={type} />
                                                                     </td>
+                                                                    <ColumnStats stats={selectedAsset.profile?.columns?.[col]} rows={selectedAsset.rows} />
                                                                 </tr>
                                                             ))
                                                         ) : (
                                                             <tr>
-                                                                <td colSpan={2} style={{ padding: '30px', textAlign: 'center', color: '#71717a', fontSize: '13px', fontStyle: 'italic' }}>
+                                                                <td colSpan={5} style={{ padding: '30px', textAlign: 'center', color: '#71717a', fontSize: '13px', fontStyle: 'italic' }}>
                                                                     No columns found matching "{schemaSearch}"
                                                                 </td>
                                                             </tr>
@@ -443,6 +472,55 @@ const TypeBadge = ({ type }) => {
     );
 };
 
+// Every hop of the transitive lineage graph, nearest first: source dataset -> pipeline -> target dataset
+const LineageHops = ({ title, hops }) => {
+    if (!hops?.length) return null;
+    const datasets = new Set(hops.map(h => title === 'Upstream' ? h.source : h.target));
+    const pipelines = new Set(hops.map(h => h.pipeline.id));
+    return (
+        <div>
+            <div style={{ fontSize: '11px', color: '#71717a', textTransform: 'uppercase', fontWeight: '700', marginBottom: '6px' }}>
+                {title}: {datasets.size} dataset{datasets.size === 1 ? '' : 's'} via {pipelines.size} pipeline{pipelines.size === 1 ? '' : 's'}
+            </div>
+            <div style={{ display: 'flex', flexDirection: 'column', gap: '4px' }}>
+                {hops.map((h, i) => (
+                    <div key={i} style={{ display: 'flex', alignItems: 'center', gap: '8px', fontSize: '12px', color: '#a1a1aa', paddingLeft: `${(h.depth - 1) * 12}px` }}>
+                        <span style={{ color: '#e4e4e7' }}>{h.source}</span>
+                        <ArrowRight size={12} color="#52525b" />
+                        <span style={{ color: '#7dd3fc', display: 'flex', alignItems: 'center', gap: '4px' }}><GitCommit size={12} />{h.pipeline.name}</span>
+                        <ArrowRight size={12} color="#52525b" />
+                        <span style={{ color: '#e4e4e7' }}>{h.target}</span>
+                    </div>
+                ))}
+            </div>
+        </div>
+    );
+};
+
+const formatStat = (value) => {
+    if (value === null || value === undefined) return '-';
+    if (typeof value === 'number') return Number.isInteger(value) ? value.toLocaleString() : value.toLocaleString(undefined, { maximumFractionDigits: 3 });
+    return String(value).replace('T00:00:00', '');
+};
+
+// Profile cells of one schema row: null share, approximate distinct count and min/mean/max (quantiles on hover)
+const ColumnStats = ({ stats, rows }) => {
+    const cell = { padding: '10px 20px', color: '#a1a1aa', fontSize: '12px', fontFamily: 'JetBrains Mono, monospace' };
+    if (!stats) return <td colSpan={3} style={{ ...cell, color: '#52525b' }}>-</td>;
+    const nullShare = rows ? ` (${(100 * stats.nulls / rows).toFixed(1)}%)` : '';
+    const quantiles = stats.quantiles ? Object.entries(stats.quantiles).map(([q, v]) => `${q}: ${formatStat(v)}`).join('  ') : undefined;
+    return (
+        <>
+            <td style={{ ...cell, color: stats.nulls ? '#f59e0b' : '#a1a1aa' }}>{formatStat(stats.nulls)}{stats.nulls ? nullShare : ''}</td>
+            <td style={cell}>~{formatStat(stats.distinct)}</td>
+            <td style={cell} title={quantiles}>
+                {stats.min !== undefined ? `${formatStat(stats.min)} .. ${formatStat(stats.max)}` : '-'}
+                {stats.mean !== undefined && <span style={{ color: '#71717a' }}> (mean {formatStat(stats.mean)})</span>}
+            </td>
+        </>
+    );
+};
+
 const StatBox = ({ label, value, icon }) => (
     <div style={{ textAlign: 'right' }}>
         <div style={{ fontSize: '11px', color: '#71717a', textTransform: 'uppercase', marginBottom: '4px', display: 'flex', alignItems: 'center', justifyContent: 'flex-end', gap: '6px' }}>
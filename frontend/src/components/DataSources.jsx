@@ -7,52 +7,99 @@ import {
     Filter, Plus, AlertCircle, ArrowUpRight
 } from 'lucide-react';
 import AppLayout from './layout/AppLayout';
+import { nextCursor } from '../pagination';
 import '../App.css';
 
+const API = 'http://127.0.0.1:5000';
+// Attempts per chunk before an upload is reported as failed (it can still be resumed later)
+const CHUNK_RETRIES = 3;
+
 const DataSources = () => {
     // --- State ---
     const [files, setFiles] = useState([]);
     const [loading, setLoading] = useState(true);
     const [uploading, setUploading] = useState(false);
+    const [uploadProgress, setUploadProgress] = useState(0);
     const [searchQuery, setSearchQuery] = useState('');
     const [activeFilter, setActiveFilter] = useState('All');
     const fileInputRef = useRef(null);
     const [toast, setToast] = useState(null);
+    const [cursor, setCursor] = useState(null);
+    const [loadingMore, setLoadingMore] = useState(false);
 
     useEffect(() => {
         fetchData();
     }, []);
 
-    const fetchData = async () => {
+    // Newest first, a page at a time; after is the cursor of the page to append
+    const fetchData = async (after = null) => {
         const token = localStorage.getItem('token');
+        if (after) setLoadingMore(true);
         try {
             const res = await axios.get('http://127.0.0.1:5000/datasources', {
-                headers: { Authorization: `Bearer ${token}` }
+                headers: { Authorization: `Bearer ${token}` },
+                params: after ? { cursor: after } : {}
             });
-            // Sort by ID descending (newest first)
-            const sorted = Array.isArray(res.data) ? res.data.sort((a, b) => b.id - a.id) : [];
-            setFiles(sorted);
+            setFiles(prev => after ? [...prev, ...res.data] : res.data);
+            setCursor(nextCursor(res));
         } catch (err) {
             console.error(err);
             showToast('Failed to load data sources', 'error');
         } finally {
             setLoading(false);
+            setLoadingMore(false);
         }
     };
 
+    // Files are sent in chunks to a resumable upload session; a dropped upload picks up from the last stored chunk
+    const uploadInChunks = async (file, headers) => {
+        const resumeKey = `upload:${file.name}:${file.size}:${file.lastModified}`;
+        let uploadId = localStorage.getItem(resumeKey);
+        let session = null;
+        if (uploadId) {
+            try {
+                session = (await axios.get(`${API}/uploads/${uploadId}`, { headers })).data;
+            } catch (err) {
+                localStorage.removeItem(resumeKey);
+            }
+        }
+        if (!session) {
+            session = (await axios.post(`${API}/uploads`, { filename: file.name, size: file.size }, { headers })).data;
+            localStorage.setItem(resumeKey, session.upload_id);
+        }
+        uploadId = session.upload_id;
+
+        let received = session.received;
+        let failures = 0;
+        while (received < file.size) {
+            const chunk = file.slice(received, received + session.chunk_size);
+            try {
+                const res = await axios.put(`${API}/uploads/${uploadId}?offset=${received}`, chunk, {
+                    headers: { ...headers, 'Content-Type': 'application/octet-stream' }
+                });
+                received = res.data.received;
+                failures = 0;
+                setUploadProgress(Math.floor((received / file.size) * 100));
+            } catch (err) {
+                // The server tells us where it actually is; anything else is retried a few times
+                if (err.response && err.response.status === 409) received = err.response.data.received;
+                else if (++failures > CHUNK_RETRIES) throw err;
+            }
+        }
+        await axios.post(`${API}/uploads/${uploadId}/complete`, {}, { headers });
+        localStorage.removeItem(resumeKey);
+    };
+
     const handleUpload = async (e) => {
         const file = e.target.files[0];
         if (!file) return;
 
-        const formData = new FormData();
-        formData.append('file', file);
         setUploading(true);
+        setUploadProgress(0);
 
         const token = localStorage.getItem('token');
         try {
-            await axios.post('http://127.0.0.1:5000/upload', formData, {
-                headers: { 'Content-Type': 'multipart/form-data', Authorization: `Bearer ${token}` }
-            });
+            await uploadInChunks(file, { Authorization: `Bearer ${token}` });
             showToast('File uploaded successfully');
             fetchData();
         } catch (err) {
@@ -209,7 +256,7 @@ const DataSources = () => {
                             {uploading ? (
                                 <motion.div initial={{ opacity: 0 }} animate={{ opacity: 1 }} style={{ textAlign: 'center' }}>
                                     <div style={{ width: '30px', height: '30px', border: '3px solid rgba(255,255,255,0.1)', borderTopColor: '#8b5cf6', borderRadius: '50%', margin: '0 auto 12px' }} className="spinner" />
-                                    <p style={{ color: '#a1a1aa', fontSize: '13px' }}>Uploading...</p>
+                                    <p style={{ color: '#a1a1aa', fontSize: '13px' }}>Uploading... {uploadProgress}%</p>
                                 </motion.div>
                             ) : (
                                 <div style={{ display: 'flex', alignItems: 'center', gap: '20px' }}>
@@ -305,6 +352,18 @@ const DataSources = () => {
                                 </AnimatePresence>
                             </div>
 
+                            {!loading && cursor && (
+                                <div style={{ display: 'flex', justifyContent: 'center', padding: '0 20px 20px' }}>
+                                    <button
+                                        onClick={() => fetchData(cursor)}
+                                        disabled={loadingMore}
+                                        style={{ padding: '10px 24px', background: 'rgba(255,255,255,0.05)', border: '1px solid rgba(255,255,255,0.1)', borderRadius: '8px', color: '#e4e4e7', fontSize: '13px', cursor: loadingMore ? 'default' : 'pointer' }}
+                                    >
+                                        {loadingMore ? 'Loading...' : 'Load more files'}
+                                    </button>
+                                </div>
+                            )}
+
                             {filteredFiles.length === 0 && (
                                 <motion.div initial={{ opacity: 0 }} animate={{ opacity: 1 }} style={{ height: '300px', display: 'flex', flexDirection: 'column', alignItems: 'center', justifyContent: 'center', border: '2px dashed rgba(255,255,255,0.05)', borderRadius: '24px', color: '#52525b' }}>
                                     <div style={{ padding: '20px', background: 'rgba(255,255,255,0.02)', borderRadius: '50%', marginBottom: '16px' }}>
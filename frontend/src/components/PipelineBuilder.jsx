@@ -331,8 +331,8 @@ const PipelineBuilderContent = () => {
     const nodeTypes = useMemo(() => ({ 
         filterNode: FilterNode,
         source_unified: SourceNode,
-        source_csv: SourceNode, source_json: SourceNode, source_excel: SourceNode, sourceNode: SourceNode, 
-        dest_db: DestinationNode, dest_csv: DestinationNode, dest_json: DestinationNode, dest_excel: DestinationNode, destinationNode: DestinationNode,
+        source_csv: SourceNode, source_json: SourceNode, source_excel: SourceNode, source_parquet: SourceNode, source_feather: SourceNode, sourceNode: SourceNode, 
+        dest_db: DestinationNode, dest_csv: DestinationNode, dest_json: DestinationNode, dest_jsonl: DestinationNode, dest_excel: DestinationNode, dest_parquet: DestinationNode, dest_feather: DestinationNode, destinationNode: DestinationNode,
         trans_sort: SortNode, trans_select: SelectNode, trans_rename: RenameNode, trans_dedupe: DedupeNode,
         trans_fillna: FillNaNode, trans_group: GroupByNode, trans_join: JoinNode,
         trans_cast: CastNode, trans_string: StringNode, trans_calc: CalcNode, trans_limit: LimitNode,
@@ -788,10 +788,24 @@ const PipelineBuilderContent = () => {
                 pipelineId: id 
             };
             const token = localStorage.getItem('token');
-            const res = await axios.post('http://127.0.0.1:5000/run-pipeline', payload, {
-                headers: token ? { Authorization: `Bearer ${token}` } : {}
-            });
-            console.log(res.data.logs); 
+            const headers = token ? { Authorization: `Bearer ${token}` } : {};
+            const res = await axios.post('http://127.0.0.1:5000/run-pipeline', payload, { headers });
+
+            // Runs are queued on the worker pool: poll the run (or an unsaved canvas' ticket) until it settles
+            let run = res.data;
+            const pollUrl = run.run_id !== undefined ? `http://127.0.0.1:5000/runs/${run.run_id}` : `http://127.0.0.1:5000/runs/unsaved/${run.ticket}`;
+            while (run.status === 'Queued' || run.status === 'Running') {
+                await new Promise(resolve => setTimeout(resolve, 1000));
+                const poll = await axios.get(pollUrl, { headers });
+                run = poll.data;
+            }
+            const logs = run.log_tail || run.logs;
+            console.log(logs);
+            if (run.status === 'Failed') {
+                const lastLine = logs?.[logs.length - 1] || 'Unknown error';
+                showToast(`Execution Failed: ${lastLine.replace('CRITICAL ERROR: ', '')}`, 'error');
+                return;
+            }
             showToast("Pipeline executed successfully!", 'success');
         } catch (error) {
             let errMsg = error.response?.data?.error || error.message;
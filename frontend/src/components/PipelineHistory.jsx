@@ -8,6 +8,10 @@ import {
     Activity
 } from 'lucide-react';
 import AppLayout from './layout/AppLayout';
+import { nextCursor } from '../pagination';
+
+// Log lines fetched when a run is opened, and per "Show earlier lines"
+const LOG_PAGE = 200;
 import '../App.css';
 
 const PipelineHistory = () => {
@@ -17,9 +21,32 @@ const PipelineHistory = () => {
     const [loading, setLoading] = useState(true);
     const [expandedRun, setExpandedRun] = useState(null);
     const [pipelineName, setPipelineName] = useState('Pipeline');
+    const [cursor, setCursor] = useState(null);
+    const [loadingMore, setLoadingMore] = useState(false);
+    // runId -> { lines, offset, total }: logs are loaded when a run is first opened, newest lines first
+    const [runLogs, setRunLogs] = useState({});
+
+    // Runs come newest first, a page at a time; `after` is the cursor of the page to append
+    const fetchHistory = async (after = null) => {
+        const token = localStorage.getItem('token');
+        if (after) setLoadingMore(true);
+        try {
+            const hRes = await axios.get(`http://127.0.0.1:5000/pipelines/${id}/history`, {
+                headers: { Authorization: `Bearer ${token}` },
+                params: after ? { cursor: after } : {}
+            });
+            setHistory(prev => after ? [...prev, ...hRes.data] : hRes.data);
+            setCursor(nextCursor(hRes));
+        } catch (err) {
+            console.error("Error fetching history:", err);
+        } finally {
+            setLoading(false);
+            setLoadingMore(false);
+        }
+    };
 
     useEffect(() => {
-        const fetchHistory = async () => {
+        const fetchPipeline = async () => {
             const token = localStorage.getItem('token');
             try {
                 // Fetch pipeline details for the name
@@ -27,23 +54,49 @@ const PipelineHistory = () => {
                     headers: { Authorization: `Bearer ${token}` }
                 });
                 setPipelineName(pRes.data.name);
-
-                // Fetch history
-                const hRes = await axios.get(`http://127.0.0.1:5000/pipelines/${id}/history`, {
-                    headers: { Authorization: `Bearer ${token}` }
-                });
-                setHistory(hRes.data);
             } catch (err) {
-                console.error("Error fetching history:", err);
-            } finally {
-                setLoading(false);
+                console.error("Error fetching pipeline:", err);
             }
         };
+        fetchPipeline();
         fetchHistory();
     }, [id]);
 
+    const formatBytes = (bytes) => {
+        if (!bytes) return '0 B';
+        const units = ['B', 'KB', 'MB', 'GB'];
+        let value = Math.abs(bytes), unit = 0;
+        while (value >= 1024 && unit < units.length - 1) { value /= 1024; unit++; }
+        return `${bytes < 0 ? '-' : ''}${value.toFixed(unit ? 1 : 0)} ${units[unit]}`;
+    };
+
+    // Without `before`, the last lines of the log; with it, the page of lines just before that offset
+    const fetchRunLogs = async (runId, before) => {
+        const token = localStorage.getItem('token');
+        const offset = before === undefined ? null : Math.max(0, before - LOG_PAGE);
+        const params = offset === null ? { tail: LOG_PAGE } : { offset, limit: before - offset };
+        try {
+            const res = await axios.get(`http://127.0.0.1:5000/runs/${runId}/logs`, {
+                headers: { Authorization: `Bearer ${token}` },
+                params
+            });
+            setRunLogs(prev => ({
+                ...prev,
+                [runId]: {
+                    lines: offset === null ? res.data.lines : [...res.data.lines, ...(prev[runId]?.lines || [])],
+                    offset: res.data.offset,
+                    total: res.data.total
+                }
+            }));
+        } catch (err) {
+            console.error("Error fetching run logs:", err);
+            setRunLogs(prev => ({ ...prev, [runId]: prev[runId] || { lines: [], offset: 0, total: 0, failed: true } }));
+        }
+    };
+
     const toggleExpand = (runId) => {
         setExpandedRun(expandedRun === runId ? null : runId);
+        if (expandedRun !== runId && !runLogs[runId]) fetchRunLogs(runId);
     };
 
     const getStatusColor = (status) => {
@@ -233,6 +286,7 @@ const PipelineHistory = () => {
                                                         <h4 style={{ margin: 0, color: '#e4e4e7', fontSize: '14px', display: 'flex', alignItems: 'center', gap: '8px' }}>
                                                             <Terminal size={14} color="#a1a1aa" /> Execution Logs
                                                         </h4>
+                                                        <span style={{ color: '#71717a', fontSize: '12px' }}>{run.log_lines} lines</span>
                                                     </div>
                                                     
                                                     <div style={{ 
@@ -240,28 +294,68 @@ const PipelineHistory = () => {
                                                         lineHeight: '1.6', background: 'rgba(255,255,255,0.02)', 
                                                         padding: '16px', borderRadius: '8px', maxHeight: '300px', overflowY: 'auto'
                                                     }}>
-                                                        {run.logs && typeof run.logs === 'string' ? (
-                                                            run.logs.split('\n').map((line, i) => (
-                                                                <div key={i} style={{ marginBottom: '4px' }}>
-                                                                    <span style={{ color: '#52525b', marginRight: '8px' }}>
-                                                                        {safeTime(run.start_time)}
-                                                                    </span>
-                                                                    {line}
-                                                                </div>
-                                                            ))
+                                                        {!runLogs[run.id] ? (
+                                                            <div>Loading logs...</div>
+                                                        ) : runLogs[run.id].failed ? (
+                                                            <div style={{ color: '#ef4444' }}>Could not load the logs of this run.</div>
+                                                        ) : runLogs[run.id].lines.length === 0 ? (
+                                                            <div>No log lines recorded.</div>
                                                         ) : (
                                                             <>
-                                                                {/* Mock / Fallback logs */}
-                                                                <div><span style={{color: '#10b981'}}>[INFO]</span> Pipeline initialized successfully.</div>
-                                                                <div><span style={{color: '#10b981'}}>[INFO]</span> Loading source data...</div>
-                                                                {run.status === 'Failed' ? (
-                                                                    <div><span style={{color: '#ef4444'}}>[ERROR]</span> Process terminated unexpectedly.</div>
-                                                                ) : (
-                                                                    <div><span style={{color: '#10b981'}}>[SUCCESS]</span> Process completed.</div>
+                                                                {runLogs[run.id].offset > 0 && (
+                                                                    <button
+                                                                        onClick={() => fetchRunLogs(run.id, runLogs[run.id].offset)}
+                                                                        style={{ background: 'none', border: 'none', color: '#8b5cf6', cursor: 'pointer', padding: 0, marginBottom: '8px', fontFamily: 'inherit', fontSize: '12px' }}
+                                                                    >
+                                                                        Show earlier lines ({runLogs[run.id].offset} more)
+                                                                    </button>
                                                                 )}
+                                                                {runLogs[run.id].lines.map((line) => (
+                                                                    <div key={line.seq} style={{ marginBottom: '4px' }}>
+                                                                        <span style={{ color: '#52525b', marginRight: '8px' }}>
+                                                                            {line.time || safeTime(run.start_time)}
+                                                                        </span>
+                                                                        {line.text}
+                                                                    </div>
+                                                                ))}
                                                             </>
                                                         )}
                                                     </div>
+
+                                                    {run.nodes && run.nodes.length > 0 && (
+                                                        <>
+                                                            <h4 style={{ margin: '20px 0 12px', color: '#e4e4e7', fontSize: '14px', display: 'flex', alignItems: 'center', gap: '8px' }}>
+                                                                <Activity size={14} color="#a1a1aa" /> Node Breakdown
+                                                            </h4>
+                                                            <table style={{ width: '100%', borderCollapse: 'collapse', fontSize: '12px', color: '#a1a1aa' }}>
+                                                                <thead>
+                                                                    <tr style={{ color: '#71717a', textAlign: 'left' }}>
+                                                                        <th style={{ padding: '6px 8px' }}>Node</th>
+                                                                        <th style={{ padding: '6px 8px' }}>Wall</th>
+                                                                        <th style={{ padding: '6px 8px' }}>CPU</th>
+                                                                        <th style={{ padding: '6px 8px' }}>Rows In / Out</th>
+                                                                        <th style={{ padding: '6px 8px' }}>Read / Written</th>
+                                                                        <th style={{ padding: '6px 8px' }}>Mem Δ</th>
+                                                                    </tr>
+                                                                </thead>
+                                                                <tbody>
+                                                                    {run.nodes.map((n) => {
+                                                                        const share = run.nodes[0].wall_time > 0 ? n.wall_time / run.nodes[0].wall_time : 0;
+                                                                        return (
+                                                                            <tr key={n.node_id} style={{ borderTop: '1px solid rgba(255,255,255,0.05)' }}>
+                                                                                <td style={{ padding: '6px 8px', color: '#e4e4e7' }}>{n.label}</td>
+                                                                                <td style={{ padding: '6px 8px', color: share > 0.5 ? '#f59e0b' : '#a1a1aa' }}>{n.wall_time.toFixed(3)}s</td>
+                                                                                <td style={{ padding: '6px 8px' }}>{n.cpu_time.toFixed(3)}s</td>
+                                                                                <td style={{ padding: '6px 8px' }}>{n.rows_in.toLocaleString()} / {n.rows_out.toLocaleString()}</td>
+                                                                                <td style={{ padding: '6px 8px' }}>{formatBytes(n.bytes_read)} / {formatBytes(n.bytes_written)}</td>
+                                                                                <td style={{ padding: '6px 8px' }}>{n.rss_delta != null ? formatBytes(n.rss_delta) : '—'}</td>
+                                                                            </tr>
+                                                                        );
+                                                                    })}
+                                                                </tbody>
+                                                            </table>
+                                                        </>
+                                                    )}
                                                 </div>
                                             </motion.div>
                                         )}
@@ -271,6 +365,17 @@ const PipelineHistory = () => {
                         })
                     )}
                 </div>
+                {!loading && cursor && (
+                    <div style={{ display: 'flex', justifyContent: 'center', paddingTop: '20px' }}>
+                        <button
+                            onClick={() => fetchHistory(cursor)}
+                            disabled={loadingMore}
+                            style={{ padding: '10px 24px', background: 'rgba(255,255,255,0.05)', border: '1px solid rgba(255,255,255,0.1)', borderRadius: '8px', color: '#e4e4e7', fontSize: '13px', cursor: loadingMore ? 'default' : 'pointer' }}
+                        >
+                            {loadingMore ? 'Loading...' : 'Load older runs'}
+                        </button>
+                    </div>
+                )}
             </div>
         </AppLayout>
     );
@@ -8,6 +8,7 @@ import {
 } from 'lucide-react';
 import AppLayout from './layout/AppLayout';
 import DataPreviewPanel from './DataPreviewPanel'; 
+import { nextCursor } from '../pagination';
 import '../App.css'; 
 
 const ProcessedData = () => {
@@ -16,6 +17,9 @@ const ProcessedData = () => {
   const [searchQuery, setSearchQuery] = useState('');
   const [selectedType, setSelectedType] = useState('All');
   const [isFetching, setIsFetching] = useState(true); // Added loading state
+  // Files come a page at a time, newest first
+  const [cursor, setCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   const [notification, setNotification] = useState(null);
   const [deleteModal, setDeleteModal] = useState({ isOpen: false, id: null, fileName: '' });
@@ -40,25 +44,27 @@ const ProcessedData = () => {
           result = result.filter(f => f.name.toLowerCase().includes(searchQuery.toLowerCase()));
       }
       if (selectedType !== 'All') {
-          result = result.filter(f => f.type === selectedType);
+          result = result.filter(f => f.type === selectedType || (selectedType === 'JSON' && f.type === 'JSONL'));
       }
       setFilteredFiles(result);
   }, [processedFiles, searchQuery, selectedType]);
 
-  const fetchProcessedFiles = async () => {
-        setIsFetching(true);
+  const fetchProcessedFiles = async (after = null) => {
+        after ? setLoadingMore(true) : setIsFetching(true);
         try {
             const token = localStorage.getItem('token');
             const res = await axios.get('http://127.0.0.1:5000/processed-files', {
-                headers: { Authorization: `Bearer ${token}` }
+                headers: { Authorization: `Bearer ${token}` },
+                params: after ? { cursor: after } : {}
             });
-            setProcessedFiles(res.data.reverse());
-            setFilteredFiles(res.data);
+            setProcessedFiles(prev => after ? [...prev, ...res.data] : res.data);
+            setCursor(nextCursor(res));
         } catch (err) {
             console.error("Error fetching processed files:", err);
             showToast("Failed to load files", "error");
         } finally {
             setIsFetching(false);
+            setLoadingMore(false);
         }
     };
 
@@ -112,7 +118,7 @@ const ProcessedData = () => {
 
   const getFileIcon = (type) => {
       if (type === 'Excel' || type === 'XLS') return { icon: <FileSpreadsheet size={20} />, color: '#10b981', bg: 'rgba(16, 185, 129, 0.1)' };
-      if (type === 'JSON') return { icon: <FileJson size={20} />, color: '#f59e0b', bg: 'rgba(245, 158, 11, 0.1)' };
+      if (type === 'JSON' || type === 'JSONL') return { icon: <FileJson size={20} />, color: '#f59e0b', bg: 'rgba(245, 158, 11, 0.1)' };
       if (type === 'Database' || type === 'SQL') return { icon: <Database size={20} />, color: '#8b5cf6', bg: 'rgba(139, 92, 246, 0.1)' };
       if (type === 'Image') return { icon: <ImageIcon size={20} />, color: '#ec4899', bg: 'rgba(236, 72, 153, 0.1)' };
       return { icon: <FileText size={20} />, color: '#3b82f6', bg: 'rgba(59, 130, 246, 0.1)' };
@@ -311,7 +317,7 @@ const ProcessedData = () => {
 
                                                     {/* Right: Actions */}
                                                     <div style={{ display: 'flex', gap: '8px', justifyContent: 'flex-end' }}>
-                                                        {(file.type === 'CSV' || file.type === 'JSON' || file.type === 'Excel' || file.type === 'Image') && (
+                                                        {(file.type === 'CSV' || file.type === 'JSON' || file.type === 'JSONL' || file.type === 'Excel' || file.type === 'Image') && (
                                                             <ActionButton onClick={() => handleView(file)} icon={<Eye size={16} />} color="#e4e4e7" label="Preview" />
                                                         )}
                                                         <ActionButton onClick={() => handleDownload(file.name)} icon={<Download size={16} />} color="#3b82f6" label="Download" />
@@ -323,6 +329,17 @@ const ProcessedData = () => {
                                     )}
                                 </AnimatePresence>
                             </div>
+                            {!isFetching && cursor && (
+                                <div style={{ display: 'flex', justifyContent: 'center', padding: '0 20px 20px' }}>
+                                    <button
+                                        onClick={() => fetchProcessedFiles(cursor)}
+                                        disabled={loadingMore}
+                                        style={{ padding: '10px 24px', background: 'rgba(255,255,255,0.05)', border: '1px solid rgba(255,255,255,0.1)', borderRadius: '8px', color: '#e4e4e7', fontSize: '13px', cursor: loadingMore ? 'default' : 'pointer' }}
+                                    >
+                                        {loadingMore ? 'Loading...' : 'Load more files'}
+                                    </button>
+                                </div>
+                            )}
                         </LayoutGroup>
                     )}
                 </div>
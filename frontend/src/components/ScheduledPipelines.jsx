@@ -2,6 +2,7 @@ import React, { useState, useEffect } from 'react';
 import axios from 'axios';
 import { useNavigate } from 'react-router-dom';
 import AppLayout from './layout/AppLayout';
+import { fetchAllPages } from '../pagination';
 import { Calendar, Clock, Trash2, Play, Search, AlertCircle } from 'lucide-react';
 
 const ScheduledPipelines = () => {
@@ -14,11 +15,12 @@ const ScheduledPipelines = () => {
     setLoading(true);
     try {
       const token = localStorage.getItem('token');
-      const res = await axios.get('http://127.0.0.1:5000/pipelines', {
-        headers: { Authorization: `Bearer ${token}` }
+      // The server returns ONLY scheduled pipelines (every page of them)
+      const pipelines = await fetchAllPages('http://127.0.0.1:5000/pipelines', {
+        headers: { Authorization: `Bearer ${token}` },
+        params: { scheduled: 1 }
       });
-      // Filter ONLY scheduled pipelines
-      const scheduled = res.data.filter(p => p.schedule && p.schedule !== 'null');
+      const scheduled = pipelines.filter(p => p.schedule && p.schedule !== 'null');
       setPipelines(scheduled);
     } catch (err) {
       console.error("Failed to fetch schedules", err);
@@ -87,7 +87,10 @@ export default () => {
         <ToolItem type="dest_db" label="Save to DB" icon={<Database size={16} />} color="#a855f7" onDragStart={onDragStart} />
         <ToolItem type="dest_csv" label="Save as CSV" icon={<FileText size={16} />} color="#94a3b8" onDragStart={onDragStart} />
         <ToolItem type="dest_json" label="Save as JSON" icon={<FileJson size={16} />} color="#94a3b8" onDragStart={onDragStart} />
+        <ToolItem type="dest_jsonl" label="Save as JSON Lines" icon={<FileJson size={16} />} color="#94a3b8" onDragStart={onDragStart} />
         <ToolItem type="dest_excel" label="Save as Excel" icon={<FileSpreadsheet size={16} />} color="#94a3b8" onDragStart={onDragStart} />
+        <ToolItem type="dest_parquet" label="Save as Parquet" icon={<FileType size={16} />} color="#94a3b8" onDragStart={onDragStart} />
+        <ToolItem type="dest_feather" label="Save as Feather" icon={<FileType size={16} />} color="#94a3b8" onDragStart={onDragStart} />
       </div>
 
     </aside>
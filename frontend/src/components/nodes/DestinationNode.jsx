@@ -2,17 +2,19 @@ import React, { memo, useCallback } from 'react';
 import { Handle, Position, useReactFlow } from 'reactflow';
 import '../../App.css';
 
-export default memo(({ id, data, isConnectable }) => {
+// Text outputs the engine can write compressed
+const COMPRESSIBLE_TYPES = ['dest_csv', 'dest_json', 'dest_jsonl'];
+
+export default memo(({ id, type, data, isConnectable }) => {
   const { setNodes, deleteElements } = useReactFlow();
 
-  const onChange = (evt) => {
-    const newVal = evt.target.value;
+  const update = (field, value) => {
     setNodes((nodes) =>
       nodes.map((node) => {
         if (node.id === id) {
           return { 
             ...node, 
-            data: { ...node.data, outputName: newVal } 
+            data: { ...node.data, [field]: value } 
           };
         }
         return node;
@@ -20,6 +22,8 @@ export default memo(({ id, data, isConnectable }) => {
     );
   };
 
+  const onChange = (evt) => update('outputName', evt.target.value);
+
   // Delete Handler
   const onDelete = useCallback((evt) => {
     evt.stopPropagation();
@@ -52,6 +56,17 @@ export default memo(({ id, data, isConnectable }) => {
             value={data.outputName || ''}
             onChange={onChange}
         />
+        {COMPRESSIBLE_TYPES.includes(type) && (
+          <>
+            <label className="node-label" style={{ marginTop: '8px' }}>COMPRESSION</label>
+            <select className="input-field" value={data.compression || 'none'} onChange={(e) => update('compression', e.target.value)}>
+                <option value="none">None</option>
+                <option value="gzip">gzip (.gz)</option>
+                <option value="zstd">Zstandard (.zst)</option>
+                <option value="bz2">bzip2 (.bz2)</option>
+            </select>
+          </>
+        )}
         <p style={{ fontSize: '10px', color: '#9ca3af', marginTop: '5px', marginBottom: 0 }}>
             Will save to /processed folder
         </p>
@@ -1,7 +1,7 @@
 import React, { memo, useEffect, useState, useCallback, useMemo } from 'react';
 import { Handle, Position, useReactFlow } from 'reactflow';
 import { FileText, FileJson, FileSpreadsheet, File, ChevronDown, Check, Loader, FileOutput, Database } from 'lucide-react';
-import axios from 'axios';
+import { fetchAllPages } from '../../pagination';
 import '../../App.css'; 
 
 export default memo(({ id, data, isConnectable }) => {
@@ -16,10 +16,10 @@ export default memo(({ id, data, isConnectable }) => {
         setLoading(true);
         try {
             const token = localStorage.getItem('token');
-            const res = await axios.get('http://127.0.0.1:5000/datasources', {
+            // The picker lists every file, so it follows the list's pages to the end
+            setFiles(await fetchAllPages('http://127.0.0.1:5000/datasources', {
                 headers: { Authorization: `Bearer ${token}` }
-            });
-            setFiles(res.data);
+            }));
         } catch (err) {
             console.error("Failed to load files", err);
         } finally {
@@ -32,16 +32,27 @@ export default memo(({ id, data, isConnectable }) => {
   // 2. Determine Styling based on Filename Extension
   const nodeStyle = useMemo(() => {
     const filename = data.filename || '';
-    const ext = filename.split('.').pop().toLowerCase();
+    const parts = filename.toLowerCase().split('.');
+    let ext = parts.pop();
+    // Compressed files (data.csv.gz) are styled after the file inside
+    if (['gz', 'zst', 'bz2'].includes(ext) && parts.length > 1) ext = parts.pop();
 
     switch (ext) {
         case 'csv': 
             return { color: '#10b981', icon: <FileText size={16} />, typeLabel: 'CSV' };
         case 'json': 
             return { color: '#fbbf24', icon: <FileJson size={16} />, typeLabel: 'JSON' };
+        case 'jsonl':
+        case 'ndjson':
+            return { color: '#fbbf24', icon: <FileJson size={16} />, typeLabel: 'JSON Lines' };
         case 'xlsx': 
         case 'xls': 
             return { color: '#16a34a', icon: <FileSpreadsheet size={16} />, typeLabel: 'Excel' };
+        case 'parquet':
+            return { color: '#0ea5e9', icon: <Database size={16} />, typeLabel: 'Parquet' };
+        case 'feather':
+        case 'arrow':
+            return { color: '#0ea5e9', icon: <Database size={16} />, typeLabel: 'Feather' };
         default: 
             return { color: '#64748b', icon: <Database size={16} />, typeLabel: 'Data' }; 
     }
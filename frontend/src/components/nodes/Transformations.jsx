@@ -127,8 +127,8 @@ export const JoinNode = memo(({ id, data, isConnectable }) => {
                 <span style={{ marginRight: '5px' }}>🔗</span> Join
             </div>
             <div className="node-body nodrag">
-                <label className="node-label">JOIN KEY (Column)</label>
-                <input className="input-field" type="text" value={data.key || ''} onChange={(e) => update('key', e.target.value)} placeholder="e.g. ID" />
+                <label className="node-label">JOIN KEY (Columns)</label>
+                <input className="input-field" type="text" value={data.key || ''} onChange={(e) => update('key', e.target.value)} placeholder="e.g. ID or region, year" />
                 <label className="node-label" style={{ marginTop: '5px' }}>TYPE</label>
                 <select className="input-field" value={data.how || 'inner'} onChange={(e) => update('how', e.target.value)}>
                     <option value="inner">Inner</option>
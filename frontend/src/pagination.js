@@ -0,0 +1,16 @@
+import axios from 'axios';
+
+// List endpoints return one page at a time; the cursor of the next page comes in the X-Next-Cursor header
+export const nextCursor = (res) => res.headers['x-next-cursor'] || null;
+
+// Every page of a list, for views that need all of it (pickers, sharing lists)
+export const fetchAllPages = async (url, config = {}) => {
+    const items = [];
+    let cursor = null;
+    do {
+        const res = await axios.get(url, { ...config, params: { ...config.params, limit: 500, ...(cursor ? { cursor } : {}) } });
+        items.push(...res.data);
+        cursor = nextCursor(res);
+    } while (cursor);
+    return items;
+};